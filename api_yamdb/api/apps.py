@@ -6,3 +6,6 @@ class ApiConfig(AppConfig):
     name = 'api'
     verbose_name = 'Апи'
     verbose_name_plural = 'Апи'
+
+    def ready(self):
+        from . import signals  # noqa: F401
@@ -0,0 +1,91 @@
+from django.db import transaction
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
+
+from .v1.cache import bump_versions
+from .v1.slugs import category_slugs, genre_slugs
+from reviews.models import Category, Comment, Genre, Review, Title
+from reviews.signals import (
+    catalog_loaded,
+    ratings_recalculated,
+    titles_bulk_created
+)
+
+TitleGenre = Title.genre.through
+
+
+def invalidate(*names):
+    transaction.on_commit(lambda: bump_versions(*names))
+
+
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+def category_changed(sender, instance, **kwargs):
+    category_slugs.clear()
+    invalidate('categories', 'titles', 'titles:detail')
+
+
+@receiver(post_save, sender=Genre)
+@receiver(post_delete, sender=Genre)
+def genre_changed(sender, instance, **kwargs):
+    genre_slugs.clear()
+    invalidate('genres', 'titles', 'titles:detail')
+
+
+@receiver(post_save, sender=Title)
+@receiver(post_delete, sender=Title)
+def title_changed(sender, instance, **kwargs):
+    invalidate('titles', f'titles:{instance.pk}')
+
+
+@receiver(post_save, sender=Review)
+@receiver(post_delete, sender=Review)
+def review_changed(sender, instance, **kwargs):
+    invalidate('titles', f'titles:{instance.title_id}')
+
+
+@receiver(post_save, sender=Comment)
+@receiver(post_delete, sender=Comment)
+def comment_changed(sender, instance, created=True, **kwargs):
+    # Правка текста комментария статистику не меняет.
+    if created:
+        invalidate('titles:stats')
+
+
+@receiver(ratings_recalculated)
+def ratings_changed(sender, **kwargs):
+    invalidate('titles', 'titles:detail')
+
+
+@receiver(catalog_loaded)
+def catalog_changed(sender, **kwargs):
+    category_slugs.clear()
+    genre_slugs.clear()
+    invalidate('categories', 'genres', 'titles', 'titles:detail')
+
+
+@receiver(titles_bulk_created)
+def titles_created(sender, **kwargs):
+    invalidate('titles')
+
+
+@receiver(post_save, sender=TitleGenre)
+@receiver(post_delete, sender=TitleGenre)
+def title_genre_changed(sender, instance, **kwargs):
+    invalidate('titles', f'titles:{instance.title_id}')
+
+
+@receiver(m2m_changed, sender=TitleGenre)
+def title_genres_changed(sender, instance, action, reverse, pk_set,
+                         **kwargs):
+    if not action.startswith('post_'):
+        return
+    if not reverse:
+        title_ids = (instance.pk,)
+    elif pk_set:
+        title_ids = pk_set
+    else:
+        # post_clear со стороны жанра: затронутые произведения неизвестны.
+        invalidate('titles', 'titles:detail')
+        return
+    invalidate('titles', *(f'titles:{pk}' for pk in title_ids))
@@ -0,0 +1,98 @@
+from django.db import transaction
+from rest_framework.exceptions import ValidationError
+
+from .serializers import TitleBulkItemSerializer
+from .slugs import category_slugs, genre_slugs
+from core.constants import IMPORT_BATCH_SIZE
+from core.db import bulk_insert
+from reviews.models import Title
+from reviews.signals import titles_bulk_created
+
+TitleGenre = Title.genre.through
+
+
+def validate_titles(items):
+    """
+    Проверяет элементы по правилам TitleSerializer.
+
+    Один экземпляр сериализатора на все элементы: поля строятся один раз.
+    Возвращает пары (номер, данные) и ошибки по номерам.
+    """
+    serializer = TitleBulkItemSerializer()
+    valid, errors = [], {}
+    for index, item in enumerate(items):
+        try:
+            valid.append((index, serializer.run_validation(item)))
+        except ValidationError as error:
+            errors[index] = error.detail
+    return valid, errors
+
+
+def build_titles(valid, errors):
+    """Переводит slug в id: по одному запросу на категории и жанры."""
+    categories = category_slugs.resolve(
+        {data['category'] for _, data in valid}
+    )
+    genres = genre_slugs.resolve(
+        {slug for _, data in valid for slug in data.get('genre', ())}
+    )
+    titles = []
+    for index, data in valid:
+        item_errors = {}
+        category = categories.get(data['category'])
+        if category is None:
+            item_errors['category'] = [
+                f'Категория {data["category"]} не найдена.'
+            ]
+        missing = [
+            slug for slug in data.get('genre', ()) if slug not in genres
+        ]
+        if missing:
+            item_errors['genre'] = [
+                f'Жанр {slug} не найден.' for slug in missing
+            ]
+        if item_errors:
+            errors[index] = item_errors
+            continue
+        title = Title(
+            name=data['name'],
+            year=data['year'],
+            description=data.get('description', ''),
+            category=category,
+        )
+        genre_ids = {genres[slug].pk for slug in data.get('genre', ())}
+        titles.append((index, title, genre_ids))
+    return titles
+
+
+def create_titles(items, batch_size=IMPORT_BATCH_SIZE):
+    """
+    Массово создаёт произведения и их связи с жанрами.
+
+    Ошибочные элементы пропускаются, остальные вставляются через
+    bulk_create в одной транзакции. Результат — по элементу на входной:
+    id созданного произведения или ошибки.
+    """
+    valid, errors = validate_titles(items)
+    titles = build_titles(valid, errors)
+    with transaction.atomic():
+        ids = bulk_insert(
+            Title, [title for _, title, _ in titles], batch_size
+        )
+        for (_, title, _), pk in zip(titles, ids):
+            title.pk = pk
+        TitleGenre.objects.bulk_create(
+            [
+                TitleGenre(title_id=title.pk, genre_id=genre_id)
+                for _, title, genre_ids in titles
+                for genre_id in genre_ids
+            ],
+            batch_size=batch_size
+        )
+        titles_bulk_created.send(
+            sender=Title,
+            titles=[title for _, title, _ in titles]
+        )
+    results = [{'index': index, 'errors': errors[index]} for index in errors]
+    results += [{'index': index, 'id': title.pk} for index, title, _ in titles]
+    return sorted(results, key=lambda result: result['index'])
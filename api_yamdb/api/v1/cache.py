@@ -0,0 +1,79 @@
+import threading
+import time
+from collections import Counter
+from hashlib import md5
+from urllib.parse import urlencode
+
+from django.core.cache import caches
+
+from core.constants import RESPONSE_CACHE_ALIAS
+
+VERSION_KEY_TEMPLATE = 'api:v1:version:{name}'
+RESPONSE_KEY_TEMPLATE = 'api:v1:response:{group}:{versions}:{request}'
+
+_stats = Counter()
+_stats_lock = threading.Lock()
+
+
+def get_cache():
+    return caches[RESPONSE_CACHE_ALIAS]
+
+
+def get_versions(*names):
+    """
+    Текущие версии групп кэша.
+
+    Версия — метка времени последнего изменения, а не счётчик: если ключ
+    версии вытеснен из кэша, новая версия не совпадёт ни с одной старой.
+    """
+    cache = get_cache()
+    keys = [VERSION_KEY_TEMPLATE.format(name=name) for name in names]
+    versions = cache.get_many(keys)
+    for key in keys:
+        if key not in versions:
+            cache.add(key, time.time_ns())
+            versions[key] = cache.get(key)
+    return [str(versions[key]) for key in keys]
+
+
+def bump_versions(*names):
+    """Инвалидирует все ответы, закэшированные с этими версиями."""
+    version = time.time_ns()
+    get_cache().set_many({
+        VERSION_KEY_TEMPLATE.format(name=name): version for name in names
+    }, timeout=None)
+
+
+def make_response_key(group, request, version_names):
+    query = urlencode(sorted(request.query_params.lists()), doseq=True)
+    request_key = md5(
+        '|'.join((
+            request.get_host(),
+            request.path,
+            query,
+            request.accepted_media_type or '',
+        )).encode()
+    ).hexdigest()
+    return RESPONSE_KEY_TEMPLATE.format(
+        group=group,
+        versions='.'.join(get_versions(*version_names)),
+        request=request_key,
+    )
+
+
+def record(group, hit):
+    with _stats_lock:
+        _stats[(group, 'hits' if hit else 'misses')] += 1
+
+
+def get_stats():
+    with _stats_lock:
+        stats = dict(_stats)
+    groups = {group for group, _ in stats}
+    return {
+        group: {
+            'hits': stats.get((group, 'hits'), 0),
+            'misses': stats.get((group, 'misses'), 0),
+        }
+        for group in sorted(groups)
+    }
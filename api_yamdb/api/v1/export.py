@@ -0,0 +1,181 @@
+import csv
+from itertools import islice
+
+from django.core.serializers.json import DjangoJSONEncoder
+from rest_framework.negotiation import BaseContentNegotiation
+from rest_framework.serializers import DateTimeField
+
+from core.constants import EXPORT_CHUNK_SIZE
+from reviews.models import Comment, Review, Title
+
+TitleGenre = Title.genre.through
+
+# Даты в том же виде, что и в ответах API (ISO 8601 с микросекундами),
+# а не как у DjangoJSONEncoder (миллисекунды) или str() в CSV.
+format_datetime = DateTimeField().to_representation
+
+
+def chunked(iterable, size=EXPORT_CHUNK_SIZE):
+    iterator = iter(iterable)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def title_chunks():
+    """
+    Произведения с категорией, жанрами и рейтингом пачками.
+
+    prefetch_related не работает вместе с iterator(), поэтому жанры
+    каждой пачки выбираются одним запросом по id произведений.
+    """
+    titles = Title.objects.order_by('id').values(
+        'id',
+        'name',
+        'year',
+        'description',
+        'rating',
+        'category__name',
+        'category__slug',
+    ).iterator(chunk_size=EXPORT_CHUNK_SIZE)
+    for chunk in chunked(titles):
+        genres = {}
+        for title_id, name, slug in TitleGenre.objects.filter(
+            title_id__in=[title['id'] for title in chunk]
+        ).order_by('genre__name').values_list(
+            'title_id', 'genre__name', 'genre__slug'
+        ):
+            genres.setdefault(title_id, []).append(
+                {'name': name, 'slug': slug}
+            )
+        yield [
+            {
+                'id': title['id'],
+                'name': title['name'],
+                'year': title['year'],
+                'description': title['description'],
+                'genre': genres.get(title['id'], []),
+                'category': title['category__slug'] and {
+                    'name': title['category__name'],
+                    'slug': title['category__slug'],
+                },
+                'rating': title['rating'],
+            }
+            for title in chunk
+        ]
+
+
+def review_chunks():
+    reviews = Review.objects.order_by('id').values(
+        'id',
+        'title_id',
+        'author__username',
+        'text',
+        'score',
+        'pub_date',
+    ).iterator(chunk_size=EXPORT_CHUNK_SIZE)
+    for chunk in chunked(reviews):
+        yield [
+            {
+                'id': review['id'],
+                'title_id': review['title_id'],
+                'author': review['author__username'],
+                'text': review['text'],
+                'score': review['score'],
+                'pub_date': format_datetime(review['pub_date']),
+            }
+            for review in chunk
+        ]
+
+
+def comment_chunks():
+    comments = Comment.objects.order_by('id').values(
+        'id',
+        'review_id',
+        'review__title_id',
+        'author__username',
+        'text',
+        'pub_date',
+    ).iterator(chunk_size=EXPORT_CHUNK_SIZE)
+    for chunk in chunked(comments):
+        yield [
+            {
+                'id': comment['id'],
+                'title_id': comment['review__title_id'],
+                'review_id': comment['review_id'],
+                'author': comment['author__username'],
+                'text': comment['text'],
+                'pub_date': format_datetime(comment['pub_date']),
+            }
+            for comment in chunk
+        ]
+
+
+def title_csv_row(title):
+    return {
+        **title,
+        'genre': ','.join(genre['slug'] for genre in title['genre']),
+        'category': title['category'] and title['category']['slug'],
+    }
+
+
+EXPORTS = {
+    'titles': (
+        title_chunks,
+        (
+            'id', 'name', 'year', 'description', 'genre', 'category',
+            'rating',
+        ),
+        title_csv_row,
+    ),
+    'reviews': (
+        review_chunks,
+        ('id', 'title_id', 'author', 'text', 'score', 'pub_date'),
+        dict,
+    ),
+    'comments': (
+        comment_chunks,
+        ('id', 'title_id', 'review_id', 'author', 'text', 'pub_date'),
+        dict,
+    ),
+}
+
+
+class Echo:
+    """Псевдо-файл для csv.writer: возвращает строку вместо записи."""
+
+    def write(self, value):
+        return value
+
+
+def render_ndjson(resource):
+    chunks, _, _ = EXPORTS[resource]
+    encoder = DjangoJSONEncoder(ensure_ascii=False)
+    for chunk in chunks():
+        yield ''.join(encoder.encode(row) + '\n' for row in chunk)
+
+
+def render_csv(resource):
+    chunks, fields, to_csv_row = EXPORTS[resource]
+    writer = csv.DictWriter(Echo(), fieldnames=fields)
+    yield writer.writeheader()
+    for chunk in chunks():
+        yield ''.join(writer.writerow(to_csv_row(row)) for row in chunk)
+
+
+RENDERERS = {
+    'ndjson': (render_ndjson, 'application/x-ndjson'),
+    'csv': (render_csv, 'text/csv'),
+}
+
+
+class ExportContentNegotiation(BaseContentNegotiation):
+    """Формат выгрузки задаётся адресом, заголовок Accept не учитывается."""
+
+    def select_parser(self, request, parsers):
+        return parsers[0]
+
+    def select_renderer(self, request, renderers, format_suffix=None):
+        return renderers[0], renderers[0].media_type
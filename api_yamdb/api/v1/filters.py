@@ -1,16 +1,23 @@
 from django_filters.rest_framework import CharFilter, FilterSet
 
+from .slugs import category_slugs, genre_slugs
 from reviews.models import Title
 
 
 class TitleFilter(FilterSet):
-    """Филтрация для произведений."""
+    """
+    Филтрация для произведений.
+
+    Slug жанра и категории переводятся в id заранее (через кэш в памяти
+    процесса, если он включён, см. api.v1.slugs), поэтому фильтр
+    обходится без JOIN с таблицами жанров и категорий.
+    """
 
     genre = CharFilter(
-        field_name='genre__slug'
+        method='filter_genre'
     )
     category = CharFilter(
-        field_name='category__slug'
+        method='filter_category'
     )
 
     class Meta:
@@ -21,3 +28,15 @@ class TitleFilter(FilterSet):
             'category',
             'year'
         )
+
+    def filter_genre(self, queryset, name, value):
+        genre = genre_slugs.get(value)
+        if genre is None:
+            return queryset.none()
+        return queryset.filter(genre=genre.pk)
+
+    def filter_category(self, queryset, name, value):
+        category = category_slugs.get(value)
+        if category is None:
+            return queryset.none()
+        return queryset.filter(category=category.pk)
@@ -1,7 +1,17 @@
+from hashlib import md5
+
+from django.core.exceptions import FieldDoesNotExist
 from django.db.models import prefetch_related_objects
-from rest_framework import mixins, serializers, viewsets
+from django.shortcuts import get_object_or_404
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, quote_etag
+from rest_framework import mixins, permissions, serializers, status, viewsets
 from rest_framework.response import Response
 
+from . import cache
+from .values import get_values_serializer
+from core.constants import RESPONSE_CACHE_TIMEOUT
+
 
 class ListCreateDestroyViewSet(
     mixins.ListModelMixin,
@@ -35,6 +45,339 @@ class PatchModelMixin:
         serializer.save()
 
 
+class BaseCachedResponseMixin:
+    """
+    Кэширование успешных ответов на чтение.
+
+    Ключ ответа строится по адресу запроса и версиям групп кэша,
+    которые сбрасываются сигналами при изменении данных (api.signals).
+    """
+
+    cache_group = None
+
+    def get_cache_versions(self):
+        return (self.cache_group,)
+
+    def cached_response(self, handler, request, *args, **kwargs):
+        key = cache.make_response_key(
+            self.cache_group,
+            request,
+            self.get_cache_versions()
+        )
+        data = cache.get_cache().get(key)
+        if data is not None:
+            cache.record(self.cache_group, hit=True)
+            return Response(data, headers={'X-Cache': 'HIT'})
+        cache.record(self.cache_group, hit=False)
+        response = handler(request, *args, **kwargs)
+        if response.status_code == status.HTTP_200_OK:
+            cache.get_cache().set(key, response.data, RESPONSE_CACHE_TIMEOUT)
+        response['X-Cache'] = 'MISS'
+        return response
+
+
+class CachedListMixin(BaseCachedResponseMixin):
+    def list(self, request, *args, **kwargs):
+        return self.cached_response(super().list, request, *args, **kwargs)
+
+
+class CachedRetrieveMixin(BaseCachedResponseMixin):
+    def get_cache_versions(self):
+        if self.action != 'retrieve':
+            return super().get_cache_versions()
+        lookup = self.kwargs[self.lookup_url_kwarg or self.lookup_field]
+        return (
+            f'{self.cache_group}:detail',
+            f'{self.cache_group}:{lookup}',
+        )
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.cached_response(
+            super().retrieve, request, *args, **kwargs
+        )
+
+
+class ConditionalGetMixin:
+    """
+    Условные GET-запросы (If-None-Match/If-Modified-Since) для list/retrieve.
+
+    Вьюсет возвращает из get_modification_state() сохранённую дату
+    изменения и версию данных; ETag строится по ним и параметрам запроса,
+    поэтому ответ 304 отдаётся без выборки объектов и сериализации.
+    """
+
+    def get_modification_state(self):
+        """
+        Кортеж (дата изменения, версия) или None: тогда запрос
+        обслуживается без условного GET.
+        """
+        return None
+
+    def conditional_response(self, handler, request, *args, **kwargs):
+        state = self.get_modification_state()
+        if state is None or state[0] is None:
+            return handler(request, *args, **kwargs)
+        last_modified, version = state
+        etag = quote_etag(md5('|'.join((
+            str(version),
+            request.get_host(),
+            request.get_full_path(),
+            request.accepted_media_type or '',
+        )).encode()).hexdigest())
+        timestamp = int(last_modified.timestamp())
+        response = get_conditional_response(
+            request,
+            etag=etag,
+            last_modified=timestamp
+        )
+        if response is None:
+            response = handler(request, *args, **kwargs)
+        if response.status_code in (
+            status.HTTP_200_OK,
+            status.HTTP_304_NOT_MODIFIED
+        ):
+            response['ETag'] = etag
+            response['Last-Modified'] = http_date(timestamp)
+        return response
+
+    def list(self, request, *args, **kwargs):
+        return self.conditional_response(
+            super().list, request, *args, **kwargs
+        )
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.conditional_response(
+            super().retrieve, request, *args, **kwargs
+        )
+
+
+class NestedResourceMixin:
+    """
+    Вложенный ресурс: отзывы произведения, комментарии к отзыву.
+
+    Объекты фильтруются по всем родительским id из URL одним запросом,
+    без отдельной выборки родителя. Сам родитель загружается не больше
+    раза за запрос и только когда нужен: при создании объекта или когда
+    выборка пуста и надо отличить «нет объектов» от «нет родителя».
+    """
+
+    parent_model = None
+    parent_field = None
+    parent_lookups = {}
+
+    def get_parent_filter(self, prefix=''):
+        return {
+            f'{prefix}{lookup}': self.kwargs.get(url_kwarg)
+            for lookup, url_kwarg in self.parent_lookups.items()
+        }
+
+    def get_parent(self):
+        if getattr(self, '_parent', None) is None:
+            self._parent = get_object_or_404(
+                self.parent_model,
+                **self.get_parent_filter()
+            )
+            self.parent_exists = True
+        return self._parent
+
+    def get_queryset(self):
+        return super().get_queryset().filter(
+            **self.get_parent_filter(f'{self.parent_field}__')
+        )
+
+    def paginate_queryset(self, queryset):
+        page = super().paginate_queryset(queryset)
+        if page is not None and not page and not getattr(
+            self, 'parent_exists', False
+        ):
+            self.get_parent()
+        return page
+
+    def perform_create(self, serializer):
+        serializer.save(
+            author=self.request.user,
+            **{self.parent_field: self.get_parent()}
+        )
+
+
+class SelectAuthorMixin:
+    """Автор загружается тем же запросом через JOIN."""
+
+    def get_queryset(self):
+        return super().get_queryset().select_related('author')
+
+
+def get_sparse_fields(request):
+    """
+    Поля из параметров запроса fields и omit (через запятую).
+
+    Возвращает пару: запрошенные поля (None — все) и исключённые поля.
+    """
+    def parse(name):
+        return {
+            field.strip()
+            for field in request.query_params.get(name, '').split(',')
+            if field.strip()
+        }
+    return parse('fields') or None, parse('omit')
+
+
+def get_query_plan(model, fields):
+    """
+    Что выбрать из БД для полей сериалайзера.
+
+    Возвращает поля для only(), связи для select_related() и
+    prefetch_related() или None, если какое-то поле берёт данные не из
+    поля модели (SerializerMethodField, source='*', свойство) и сузить
+    выборку нельзя.
+    """
+    only, select_related, prefetch_related = set(), set(), set()
+    for field in fields.values():
+        if field.source == '*' or isinstance(
+            field, serializers.SerializerMethodField
+        ):
+            return None
+        path = '__'.join(field.source_attrs)
+        try:
+            model_field = model._meta.get_field(field.source_attrs[0])
+        except FieldDoesNotExist:
+            return None
+        if isinstance(field, (
+            serializers.ListSerializer,
+            serializers.ManyRelatedField
+        )):
+            prefetch_related.add(path)
+        elif isinstance(field, serializers.BaseSerializer):
+            related_model = model_field.related_model
+            plan = get_query_plan(related_model, field.fields)
+            if plan is None:
+                related_only = [
+                    related_field.name
+                    for related_field in related_model._meta.concrete_fields
+                ]
+            else:
+                related_only = plan[0]
+                select_related.update(
+                    f'{path}__{related}' for related in plan[1]
+                )
+            select_related.add(path)
+            only.update(f'{path}__{name}' for name in related_only)
+        elif isinstance(field, serializers.SlugRelatedField):
+            select_related.add(path)
+            only.add(f'{path}__{field.slug_field}')
+        else:
+            only.add(path)
+    return only, select_related, prefetch_related
+
+
+class SparseFieldsMixin:
+    """
+    Параметры запроса fields и omit для ответов на чтение.
+
+    Применяется только к корневому сериалайзеру ответа (или к элементу
+    списка); вложенные сериалайзеры и запросы на запись не затрагиваются.
+    Неизвестное поле — ошибка 400, а не молча пустой ответ.
+    """
+
+    def get_fields(self):
+        fields = self.get_available_fields()
+        request = self.context.get('request')
+        if (
+            request is None
+            or request.method not in permissions.SAFE_METHODS
+            or not self.is_response_root()
+        ):
+            return fields
+        requested, omitted = get_sparse_fields(request)
+        unknown = ((requested or set()) | omitted) - set(fields)
+        if unknown:
+            raise serializers.ValidationError({
+                'fields': [
+                    'Неизвестные поля: ' + ', '.join(sorted(unknown))
+                ]
+            })
+        return {
+            name: field for name, field in fields.items()
+            if (requested is None or name in requested)
+            and name not in omitted
+        }
+
+    def get_available_fields(self):
+        return super().get_fields()
+
+    def is_response_root(self):
+        parent = self.parent
+        if isinstance(parent, serializers.ListSerializer):
+            parent = parent.parent
+        return parent is None
+
+
+class SparseQuerysetMixin:
+    """
+    Выборка на чтение сужается до полей, которые попадут в ответ.
+
+    Поля сериалайзера (с учётом fields/omit) переводятся в only(),
+    select_related() и prefetch_related(): связи, которых нет в ответе,
+    не подключаются, а колонки не выбираются. Запросы на запись
+    получают объекты целиком, иначе save() обновит только загруженные
+    поля и пропустит auto_now.
+    """
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        if self.request.method not in permissions.SAFE_METHODS:
+            return queryset
+        plan = get_query_plan(queryset.model, self.get_serializer().fields)
+        if plan is None:
+            return queryset
+        only, select_related, prefetch_related = plan
+        # Поля курсора читаются у объектов страницы при построении ссылок.
+        only.update(
+            field.lstrip('-')
+            for field in getattr(self, 'cursor_ordering', ())
+        )
+        queryset = queryset.select_related(None).prefetch_related(
+            None
+        ).prefetch_related(*prefetch_related).only(*only)
+        if select_related:
+            # select_related() без аргументов подключил бы все связи.
+            queryset = queryset.select_related(*select_related)
+        return queryset
+
+
+class ValuesListMixin:
+    """
+    list() собирает ответ из строк values() через ValuesSerializer.
+
+    Ответ побайтно совпадает с обычным, но без создания объектов моделей
+    и поштучной сериализации полей. Если поля сериалайзера так собрать
+    нельзя (например, статистика в ?expand=stats), используется обычный
+    list().
+    """
+
+    use_values_serializer = True
+
+    def list(self, request, *args, **kwargs):
+        values_serializer = None
+        if self.use_values_serializer:
+            queryset = self.filter_queryset(self.get_queryset())
+            values_serializer = get_values_serializer(
+                queryset.model, self.get_serializer().fields
+            )
+        if values_serializer is None:
+            return super().list(request, *args, **kwargs)
+        rows = values_serializer.get_values(queryset, (
+            field.lstrip('-')
+            for field in getattr(self, 'cursor_ordering', ())
+        ))
+        page = self.paginate_queryset(rows)
+        if page is None:
+            return Response(values_serializer.to_representation(list(rows)))
+        return self.get_paginated_response(
+            values_serializer.to_representation(page)
+        )
+
+
 class ValidateUsernameMixin:
     def validate_username(self, username):
         if username and username.lower() == 'me':
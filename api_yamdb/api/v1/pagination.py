@@ -0,0 +1,73 @@
+from rest_framework.pagination import (
+    BasePagination,
+    CursorPagination,
+    PageNumberPagination
+)
+
+
+def get_media_type_params(media_type):
+    """Параметры медиатипа: `a/b; x=1; y="2"` -> {'x': '1', 'y': '2'}."""
+    params = {}
+    for param in media_type.split(';')[1:]:
+        key, _, value = param.partition('=')
+        params[key.strip()] = value.strip().strip('"')
+    return params
+
+
+class ViewCursorPagination(CursorPagination):
+    """Курсорная пагинация по полям из атрибута вьюсета `cursor_ordering`."""
+
+    def get_ordering(self, request, queryset, view):
+        return view.cursor_ordering
+
+
+class PageNumberOrCursorPagination(BasePagination):
+    """
+    Постраничная пагинация с курсорным режимом по запросу клиента.
+
+    По умолчанию ответ совпадает с PageNumberPagination. Курсорный режим
+    включается параметром `?pagination=cursor`, заголовком
+    `Accept: application/json; pagination=cursor` или наличием параметра
+    `cursor` из ссылок `next`/`previous`. В курсорном режиме нет COUNT(*)
+    и OFFSET, поэтому любая страница стоит столько же, сколько первая.
+    """
+
+    mode_param = 'pagination'
+    cursor_mode = 'cursor'
+    page_number_class = PageNumberPagination
+    cursor_class = ViewCursorPagination
+
+    def __init__(self):
+        self.paginator = self.page_number_class()
+
+    def is_cursor_mode(self, request):
+        if self.cursor_class.cursor_query_param in request.query_params:
+            return True
+        if request.query_params.get(self.mode_param) == self.cursor_mode:
+            return True
+        params = get_media_type_params(request.accepted_media_type or '')
+        return params.get(self.mode_param) == self.cursor_mode
+
+    def paginate_queryset(self, queryset, request, view=None):
+        if self.is_cursor_mode(request):
+            self.paginator = self.cursor_class()
+        return self.paginator.paginate_queryset(queryset, request, view)
+
+    def get_paginated_response(self, data):
+        return self.paginator.get_paginated_response(data)
+
+    def get_paginated_response_schema(self, schema):
+        return self.paginator.get_paginated_response_schema(schema)
+
+    def to_html(self):
+        return self.paginator.to_html()
+
+    @property
+    def display_page_controls(self):
+        return getattr(self.paginator, 'display_page_controls', False)
+
+    def get_schema_fields(self, view):
+        return self.paginator.get_schema_fields(view)
+
+    def get_schema_operation_parameters(self, view):
+        return self.paginator.get_schema_operation_parameters(view)
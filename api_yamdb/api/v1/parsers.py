@@ -0,0 +1,31 @@
+import codecs
+import json
+
+from django.conf import settings
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import BaseParser
+
+
+class NDJSONParser(BaseParser):
+    """
+    JSON-объекты, по одному на строку; пустые строки пропускаются.
+
+    Парсер буферизующий: тело читается построчно, без копии в памяти,
+    но результат — готовый список, как и request.data у JSONParser.
+    """
+
+    media_type = 'application/x-ndjson'
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        parser_context = parser_context or {}
+        encoding = parser_context.get('encoding', settings.DEFAULT_CHARSET)
+        items = []
+        lines = codecs.getreader(encoding)(stream)
+        for number, line in enumerate(lines, start=1):
+            if not line.strip():
+                continue
+            try:
+                items.append(json.loads(line))
+            except ValueError as error:
+                raise ParseError(f'Строка {number}: {error}')
+        return items
@@ -1,16 +1,35 @@
 from django.contrib.auth import get_user_model
 from django.contrib.auth.tokens import default_token_generator
+from django.db import IntegrityError, transaction
 from rest_framework import serializers
 
-from .mixins import ValidateUsernameMixin
+from .mixins import SparseFieldsMixin, ValidateUsernameMixin
 from .utils import send_confirmation_code
 from .validators import username_and_email_are_unique
-from core.constants import MAX_EMAIL_LENGTH, MAX_USER_NAME_LENGTH
-from reviews.models import Category, Comment, Genre, Review, Title
+from core.constants import (
+    MAX_EMAIL_LENGTH,
+    MAX_LENGTH_SLUG,
+    MAX_USER_NAME_LENGTH
+)
+from reviews.models import (
+    Category,
+    Comment,
+    Genre,
+    Review,
+    Title,
+    TitleStats
+)
 
 User = get_user_model()
 
 
+def get_expanded(request):
+    """Связанные данные, запрошенные параметром expand через запятую."""
+    if request is None:
+        return set()
+    return set(request.query_params.get('expand', '').split(','))
+
+
 class CategorySerializer(serializers.ModelSerializer):
     """Сериалайзер категорий."""
 
@@ -33,8 +52,30 @@ class GenreSerializer(serializers.ModelSerializer):
         )
 
 
-class TitleSerializer(serializers.ModelSerializer):
-    """Сериалайзер произведений."""
+class TitleStatsSerializer(serializers.ModelSerializer):
+    """Сериалайзер статистики отзывов произведения."""
+
+    scores = serializers.SerializerMethodField()
+
+    class Meta:
+        model = TitleStats
+        fields = (
+            'reviews_count',
+            'comments_count',
+            'last_review_at',
+            'scores',
+        )
+
+    def get_scores(self, stats):
+        return {str(score): count for score, count in stats.scores.items()}
+
+
+class TitleSerializer(SparseFieldsMixin, serializers.ModelSerializer):
+    """
+    Сериалайзер произведений.
+
+    С параметром запроса expand=stats добавляет статистику отзывов.
+    """
 
     category = CategorySerializer(read_only=True)
     genre = GenreSerializer(many=True, read_only=True)
@@ -52,6 +93,22 @@ class TitleSerializer(serializers.ModelSerializer):
             'rating',
         )
 
+    def get_available_fields(self):
+        fields = super().get_available_fields()
+        if 'stats' in get_expanded(self.context.get('request')):
+            fields['stats'] = TitleStatsSerializer(read_only=True)
+        return fields
+
+
+class TitleBulkItemSerializer(TitleSerializer):
+    """Произведение для массовой загрузки: категория и жанры — slug."""
+
+    category = serializers.SlugField(max_length=MAX_LENGTH_SLUG)
+    genre = serializers.ListField(
+        child=serializers.SlugField(max_length=MAX_LENGTH_SLUG),
+        required=False
+    )
+
 
 class UserCreateSerializer(ValidateUsernameMixin, serializers.Serializer):
     """Сериалайзер для создания новых пользователей."""
@@ -67,16 +124,32 @@ class UserCreateSerializer(ValidateUsernameMixin, serializers.Serializer):
     def validate(self, attrs):
         username = attrs.get('username')
         email = attrs.get('email')
-        username_and_email_are_unique(username, email)
+        self.existing_user = username_and_email_are_unique(username, email)
         return attrs
 
     def save(self, **kwargs):
         username = self.validated_data.get('username')
         email = self.validated_data.get('email')
-        user, _ = User.objects.get_or_create(
-            username=username,
-            email=email
-        )
+        user = self.existing_user
+        if user is None:
+            try:
+                with transaction.atomic():
+                    user = User.objects.create(
+                        username=username,
+                        email=email
+                    )
+            except IntegrityError:
+                # Параллельный запрос успел создать пользователя после
+                # проверки: повторяем её, уникальность гарантирует база.
+                try:
+                    user = username_and_email_are_unique(username, email)
+                except serializers.ValidationError as error:
+                    # Ошибка в том же виде, что и из validate().
+                    raise serializers.ValidationError(
+                        serializers.as_serializer_error(error)
+                    )
+                if user is None:
+                    raise
         confirmation_code = default_token_generator.make_token(user)
         send_confirmation_code(
             email=user.email,
@@ -95,7 +168,11 @@ class UserRecieveTokenSerializer(serializers.Serializer):
     confirmation_code = serializers.CharField()
 
 
-class UserSerializer(ValidateUsernameMixin, serializers.ModelSerializer):
+class UserSerializer(
+    SparseFieldsMixin,
+    ValidateUsernameMixin,
+    serializers.ModelSerializer
+):
     """Сериалайзер пользователя."""
 
     class Meta():
@@ -110,7 +187,7 @@ class UserSerializer(ValidateUsernameMixin, serializers.ModelSerializer):
         )
 
 
-class CommentSerializer(serializers.ModelSerializer):
+class CommentSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     """Сериалайзер комментариев."""
 
     author = serializers.SlugRelatedField(
@@ -128,7 +205,7 @@ class CommentSerializer(serializers.ModelSerializer):
         )
 
 
-class ReviewSerializer(serializers.ModelSerializer):
+class ReviewSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     """Сериалайзер отзывов."""
 
     author = serializers.SlugRelatedField(
@@ -0,0 +1,103 @@
+import threading
+from collections import OrderedDict
+
+from django.conf import settings
+
+from . import cache
+from core.constants import (
+    LOCAL_CACHE_BACKENDS,
+    RESPONSE_CACHE_ALIAS,
+    SLUG_CACHE_SIZE
+)
+from reviews.models import Category, Genre
+
+
+def slug_cache_enabled():
+    """
+    Кэшировать ли slug в памяти процесса.
+
+    Изменения в других воркерах замечаются только по версии в кэше
+    ответов, а она общая лишь в Redis или Memcached. С LocMemCache
+    воркер продолжал бы подставлять id удалённой категории, поэтому там
+    slug всегда читаются из базы. SLUG_CACHE_ENABLED задаёт явно.
+    """
+    enabled = getattr(settings, 'SLUG_CACHE_ENABLED', None)
+    if enabled is not None:
+        return enabled
+    backend = settings.CACHES[RESPONSE_CACHE_ALIAS]['BACKEND']
+    return backend not in LOCAL_CACHE_BACKENDS
+
+
+class SlugCache:
+    """
+    Кэш slug → (id, name) в памяти процесса с вытеснением LRU.
+
+    Категории и жанры почти не меняются, поэтому запись произведения и
+    фильтры по slug обходятся без обращения к базе. Локальный кэш
+    сбрасывается сигналами (api.signals), а изменения в других процессах
+    замечаются по версии группы в общем кэше: она же сбрасывает кэш
+    ответов. Отсутствующие slug не кэшируются. Без общего кэша (см.
+    slug_cache_enabled) каждый вызов читает slug из базы.
+    """
+
+    def __init__(self, model, group, maxsize=SLUG_CACHE_SIZE):
+        self.model = model
+        self.group = group
+        self.maxsize = maxsize
+        self.version = None
+        self.items = OrderedDict()
+        self.lock = threading.Lock()
+
+    def clear(self):
+        with self.lock:
+            self.items.clear()
+
+    def resolve(self, slugs):
+        """Объекты модели по slug; ненайденные slug в ответ не попадают."""
+        if not slug_cache_enabled():
+            return self.build(self.load(slugs))
+        version = cache.get_versions(self.group)[0]
+        found = {}
+        with self.lock:
+            if version != self.version:
+                self.items.clear()
+                self.version = version
+            for slug in slugs:
+                if slug in self.items:
+                    self.items.move_to_end(slug)
+                    found[slug] = self.items[slug]
+        missing = set(slugs) - set(found)
+        if missing:
+            loaded = self.load(missing)
+            with self.lock:
+                if version == self.version:
+                    self.items.update(loaded)
+                    while len(self.items) > self.maxsize:
+                        self.items.popitem(last=False)
+            found.update(loaded)
+        return self.build(found)
+
+    def load(self, slugs):
+        return {
+            slug: (pk, name)
+            for pk, slug, name in self.model.objects.filter(
+                slug__in=set(slugs)
+            ).values_list('pk', 'slug', 'name')
+        }
+
+    def build(self, found):
+        return {
+            slug: self.model.from_db(
+                self.model.objects.db,
+                ('id', 'name', 'slug'),
+                (pk, name, slug)
+            )
+            for slug, (pk, name) in found.items()
+        }
+
+    def get(self, slug):
+        return self.resolve([slug]).get(slug)
+
+
+category_slugs = SlugCache(Category, 'categories')
+genre_slugs = SlugCache(Genre, 'genres')
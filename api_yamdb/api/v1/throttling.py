@@ -0,0 +1,194 @@
+from collections.abc import Mapping
+from functools import lru_cache
+from hashlib import md5
+from itertools import count
+
+from django.conf import settings
+from django.core.cache import caches
+from django.utils.module_loading import import_string
+from rest_framework.settings import api_settings
+from rest_framework.throttling import SimpleRateThrottle
+
+from core.constants import (
+    THROTTLE_CACHE_ALIAS,
+    THROTTLE_LOCAL_MAX_ENTRIES
+)
+
+THROTTLE_KEY_TEMPLATE = 'api:v1:throttle:{scope}:{ident}'
+WINDOW_KEY_TEMPLATE = '{key}:{window}'
+
+
+class CacheWindowStore:
+    """
+    Счётчики окон в кэше Django.
+
+    incr атомарен в Redis, Memcached и LocMemCache, поэтому параллельные
+    запросы не теряют попадания.
+    """
+
+    def __init__(self):
+        self.cache = caches[THROTTLE_CACHE_ALIAS]
+
+    def hit(self, key, window, duration):
+        """Засчитывает запрос в окно; счётчики прошлого и текущего окна."""
+        current_key = WINDOW_KEY_TEMPLATE.format(key=key, window=window)
+        self.cache.add(current_key, 0, timeout=duration * 2)
+        try:
+            current = self.cache.incr(current_key)
+        except ValueError:
+            # Ключ истёк или вытеснен между add и incr: окно начинается
+            # заново с этого запроса.
+            self.cache.set(current_key, 1, timeout=duration * 2)
+            current = 1
+        previous = self.cache.get(
+            WINDOW_KEY_TEMPLATE.format(key=key, window=window - 1), 0
+        )
+        return previous, current
+
+
+class LocalWindowStore:
+    """
+    Счётчики окон в памяти процесса, без блокировок: next() у
+    itertools.count атомарен. Для тестов и одного процесса: у каждого
+    воркера свои счётчики.
+
+    С началом нового окна удаляются окна старше прошлого для всех ключей
+    с той же длительностью; при THROTTLE_LOCAL_MAX_ENTRIES записях
+    счётчики сбрасываются целиком, как при переполнении LocMemCache.
+    """
+
+    def __init__(self):
+        self.counters = {}
+        self.totals = {}
+        self.windows = {}
+
+    def hit(self, key, window, duration):
+        if self.windows.setdefault(duration, window) < window:
+            self.windows[duration] = window
+            self.expire(window, duration)
+        if len(self.counters) >= THROTTLE_LOCAL_MAX_ENTRIES:
+            self.counters.clear()
+            self.totals.clear()
+        entry = (key, duration, window)
+        current = next(self.counters.setdefault(entry, count(1)))
+        # Параллельный запрос может записать меньшее значение: оценка
+        # прошлого окна лишь чуть занижается.
+        self.totals[entry] = current
+        return self.totals.get((key, duration, window - 1), 0), current
+
+    def expire(self, window, duration):
+        """Удаляет окна старше прошлого с длительностью duration."""
+        # list() копирует ключи за один вызов, без гонки с hit().
+        for entry in list(self.counters):
+            if entry[1] == duration and entry[2] < window - 1:
+                self.counters.pop(entry, None)
+                self.totals.pop(entry, None)
+
+
+@lru_cache(maxsize=None)
+def _get_store(path):
+    return import_string(path)()
+
+
+def get_store():
+    return _get_store(settings.THROTTLE_STORE)
+
+
+def reset_stores():
+    """Забывает созданные хранилища вместе со счётчиками в памяти."""
+    _get_store.cache_clear()
+
+
+class SlidingWindowThrottle(SimpleRateThrottle):
+    """
+    Ограничение частоты по скользящему окну.
+
+    Вместо списка меток времени на каждого клиента (как у
+    SimpleRateThrottle) хранятся два счётчика: текущего и прошлого окна.
+    Прошлое окно учитывается пропорционально тому, какая его часть ещё
+    попадает в последние `duration` секунд. Отклонённые запросы тоже
+    засчитываются: клиент, который не прекращает попыток, остаётся
+    заблокированным.
+
+    DRF проверяет частоту после аутентификации, поэтому лишний запрос
+    отклоняется без обращения к базе, только если аутентификация
+    отключена, как у signup и token: иначе токен из заголовка успеет
+    загрузить пользователя.
+    """
+
+    def get_rate(self):
+        # Ставки читаются при каждом запросе, а не при импорте, чтобы
+        # переопределение настроек работало.
+        return api_settings.DEFAULT_THROTTLE_RATES[self.scope]
+
+    def format_key(self, ident):
+        """Ключ счётчика; ident хэшируется, чтобы не хранить email."""
+        return THROTTLE_KEY_TEMPLATE.format(
+            scope=self.scope, ident=md5(ident.encode()).hexdigest()
+        )
+
+    def allow_request(self, request, view):
+        if self.rate is None:
+            return True
+        key = self.get_cache_key(request, view)
+        if key is None:
+            return True
+        now = self.timer()
+        window, elapsed = divmod(now, self.duration)
+        previous, current = get_store().hit(
+            key, int(window), self.duration
+        )
+        weight = 1 - elapsed / self.duration
+        if previous * weight + current <= self.num_requests:
+            return True
+        self.wait_seconds = self.duration - elapsed
+        return False
+
+    def wait(self):
+        return self.wait_seconds
+
+
+class IPThrottle(SlidingWindowThrottle):
+    """Ограничение по IP-адресу клиента."""
+
+    def get_cache_key(self, request, view):
+        return self.format_key(self.get_ident(request))
+
+
+class FieldThrottle(SlidingWindowThrottle):
+    """Ограничение по значению поля запроса (username, email)."""
+
+    field = None
+
+    def get_cache_key(self, request, view):
+        # Тело может быть JSON-массивом или строкой: такие запросы
+        # ограничиваются только по IP, а ошибку вернёт сериализатор.
+        if not isinstance(request.data, Mapping):
+            return None
+        value = request.data.get(self.field)
+        if not isinstance(value, str) or not value.strip():
+            return None
+        return self.format_key(value.strip().lower())
+
+
+class SignupThrottle(IPThrottle):
+    scope = 'signup'
+
+
+class SignupUsernameThrottle(FieldThrottle):
+    scope = 'signup_username'
+    field = 'username'
+
+
+class SignupEmailThrottle(FieldThrottle):
+    scope = 'signup_email'
+    field = 'email'
+
+
+class TokenThrottle(IPThrottle):
+    scope = 'token'
+
+
+class TokenUsernameThrottle(FieldThrottle):
+    scope = 'token_username'
+    field = 'username'
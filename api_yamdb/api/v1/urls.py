@@ -1,15 +1,18 @@
 from django.conf import settings
-from django.urls import include, path
+from django.urls import include, path, re_path
 
 from .views import (
     CategoryViewSet,
     CommentViewSet,
+    ExportView,
     GenreViewSet,
     ReviewViewSet,
     TitleViewSet,
     UserViewSet,
+    cache_stats,
     create_user,
-    get_token
+    get_token,
+    request_stats
 )
 
 if settings.DEBUG:
@@ -67,5 +70,21 @@ auth_urls = [
 
 urlpatterns = [
     path('', include(router_v1.urls)),
-    path('auth/', include(auth_urls))
+    path('auth/', include(auth_urls)),
+    path(
+        'cache/stats/',
+        cache_stats,
+        name='cache-stats'
+    ),
+    path(
+        'stats/',
+        request_stats,
+        name='request-stats'
+    ),
+    re_path(
+        r'^export/(?P<resource>titles|reviews|comments)'
+        r'\.(?P<file_format>ndjson|csv)$',
+        ExportView.as_view(),
+        name='export'
+    )
 ]
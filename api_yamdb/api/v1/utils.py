@@ -1,13 +1,11 @@
-from django.core.mail import send_mail
-
 from core.constants import ADMIN_EMAIL
+from core.outbox import enqueue_email
 
 
 def send_confirmation_code(email, code):
-    send_mail(
+    enqueue_email(
         subject='Код подтверждения',
         message=f'Ваш код подтверждения {code}',
         from_email=ADMIN_EMAIL,
         recipient_list=(email,),
-        fail_silently=False,
     )
@@ -1,4 +1,5 @@
 from django.contrib.auth import get_user_model
+from django.db.models import Q
 from rest_framework import serializers
 
 User = get_user_model()
@@ -10,16 +11,25 @@ def username_and_email_are_unique(username, email):
 
     Если юзер с таким именем и почтой существует,
     то ошибки нет(необходимо для повторной отправки кода подтверждения)
+    и он возвращается. Все случаи разбираются одним запросом по
+    уникальным индексам username и email.
     """
 
-    user_by_username = User.objects.filter(username=username).first()
-    user_by_email = User.objects.filter(email=email).first()
+    user_by_username = user_by_email = None
+    for user in User.objects.filter(Q(username=username) | Q(email=email)):
+        if user.username == username:
+            user_by_username = user
+        if user.email == email:
+            user_by_email = user
 
-    if user_by_username and not user_by_email:
+    if user_by_username and user_by_username == user_by_email:
+        return user_by_username
+    if user_by_username:
         raise serializers.ValidationError(
             'Пользователь с таким именем уже существует'
         )
-    if user_by_email and not user_by_username:
+    if user_by_email:
         raise serializers.ValidationError(
             'Пользователь с таким email уже существует'
         )
+    return None
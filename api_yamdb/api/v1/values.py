@@ -0,0 +1,160 @@
+from django.core.exceptions import FieldDoesNotExist
+from rest_framework import serializers
+
+# Поля, у которых to_representation для значения из БД ничего не меняет.
+IDENTITY_FIELDS = (
+    serializers.IntegerField,
+    serializers.CharField,
+    serializers.SlugField,
+    serializers.EmailField,
+    serializers.SlugRelatedField,
+)
+
+
+def _value_getter(path, field):
+    if type(field) in IDENTITY_FIELDS:
+        return lambda row, related: row[path]
+    convert = field.to_representation
+
+    def getter(row, related):
+        value = row[path]
+        return None if value is None else convert(value)
+    return getter
+
+
+def _nested_getter(pk_path, getters):
+    def getter(row, related):
+        if row[pk_path] is None:
+            return None
+        return {name: get(row, related) for name, get in getters}
+    return getter
+
+
+def _compile_field(model, field, prefix, paths):
+    """Функция, достающая значение поля из строки values(), или None."""
+    if field.source == '*' or isinstance(field, (
+        serializers.SerializerMethodField,
+        serializers.ListSerializer,
+        serializers.ManyRelatedField,
+    )):
+        return None
+    try:
+        model_field = model._meta.get_field(field.source_attrs[0])
+    except FieldDoesNotExist:
+        return None
+    if len(field.source_attrs) > 1 or model_field.many_to_many:
+        return None
+    path = f'{prefix}{field.source}'
+    if isinstance(field, serializers.BaseSerializer):
+        pk_path = f'{path}__pk'
+        paths.append(pk_path)
+        nested = _compile_fields(
+            model_field.related_model, field.fields, f'{path}__', paths
+        )
+        if nested is None:
+            return None
+        return _nested_getter(pk_path, nested)
+    if isinstance(field, serializers.SlugRelatedField):
+        path = f'{path}__{field.slug_field}'
+    elif isinstance(field, serializers.RelatedField):
+        return None
+    paths.append(path)
+    return _value_getter(path, field)
+
+
+def _compile_fields(model, fields, prefix, paths):
+    """
+    Функции, достающие значения полей из строки values().
+
+    Пути, которые нужно выбрать, добавляются в `paths`. Возвращает None,
+    если какое-то поле нельзя получить из values() без объекта модели.
+    """
+    getters = []
+    for name, field in fields.items():
+        if field.write_only:
+            continue
+        getter = _compile_field(model, field, prefix, paths)
+        if getter is None:
+            return None
+        getters.append((name, getter))
+    return getters
+
+
+class ValuesSerializer:
+    """
+    Read-only сериализация списков прямо из строк values().
+
+    Собирается один раз по полям обычного сериалайзера (уже с учётом
+    fields/omit и expand) и даёт тот же JSON, но без объектов моделей и
+    вызова to_representation каждого поля. Связи many-to-many
+    (жанры произведения) выбираются одним запросом на страницу.
+    Используйте get_values_serializer(): для полей, которые так собрать
+    нельзя, он вернёт None.
+    """
+
+    def __init__(self, getters, paths, many_relations):
+        self.getters = getters
+        self.paths = paths
+        self.many_relations = many_relations
+
+    def get_values(self, queryset, extra=()):
+        """Строки для пагинации; `extra` — нужные ей поля (курсор)."""
+        paths = dict.fromkeys(('pk', *self.paths, *extra))
+        return queryset.prefetch_related(None).values(*paths)
+
+    def to_representation(self, rows):
+        related = {}
+        if self.many_relations and rows:
+            ids = [row['pk'] for row in rows]
+            for name, query_name, queryset, child in self.many_relations:
+                groups = {pk: [] for pk in ids}
+                for row in child.get_values(
+                    queryset.filter(**{f'{query_name}__in': ids}),
+                    (query_name,)
+                ):
+                    groups[row[query_name]].append(
+                        child.build(row, related)
+                    )
+                related[name] = groups
+        return [self.build(row, related) for row in rows]
+
+    def build(self, row, related):
+        return {name: get(row, related) for name, get in self.getters}
+
+
+def _many_getter(name):
+    return lambda row, related: related[name][row['pk']]
+
+
+def get_values_serializer(model, fields):
+    """ValuesSerializer для полей сериалайзера или None."""
+    getters = []
+    paths = []
+    many_relations = []
+    for name, field in fields.items():
+        if isinstance(field, serializers.ListSerializer) and not (
+            field.write_only
+        ):
+            try:
+                model_field = model._meta.get_field(field.source)
+            except FieldDoesNotExist:
+                return None
+            if not model_field.many_to_many or model_field.auto_created:
+                return None
+            related_model = model_field.related_model
+            child = get_values_serializer(related_model, field.child.fields)
+            if child is None or child.many_relations:
+                return None
+            many_relations.append((
+                name,
+                model_field.related_query_name(),
+                related_model._default_manager.all(),
+                child,
+            ))
+            getters.append((name, _many_getter(name)))
+            continue
+        compiled = _compile_fields(model, {name: field}, '', paths)
+        if compiled is None:
+            return None
+        getters.extend(compiled)
+    return ValuesSerializer(getters, paths, many_relations)
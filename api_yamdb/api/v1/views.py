@@ -1,17 +1,43 @@
 from django.contrib.auth import get_user_model
 from django.contrib.auth.tokens import default_token_generator
-from django.db.models import Avg
+from django.db import IntegrityError, transaction
+from django.http import Http404, StreamingHttpResponse
 from django.shortcuts import get_object_or_404
 from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework import filters, mixins, status, viewsets
-from rest_framework.decorators import action, api_view, permission_classes
+from rest_framework.decorators import (
+    action,
+    api_view,
+    authentication_classes,
+    permission_classes,
+    throttle_classes
+)
+from rest_framework.exceptions import ValidationError
 from rest_framework.pagination import PageNumberPagination
+from rest_framework.parsers import JSONParser
 from rest_framework.permissions import AllowAny, IsAuthenticated
 from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.views import APIView
 from rest_framework_simplejwt.tokens import AccessToken
 
+from .bulk import create_titles
+from .cache import get_stats
+from .export import RENDERERS, ExportContentNegotiation
 from .filters import TitleFilter
-from .mixins import ListCreateDestroyViewSet, PatchModelMixin
+from .mixins import (
+    CachedListMixin,
+    CachedRetrieveMixin,
+    ConditionalGetMixin,
+    ListCreateDestroyViewSet,
+    NestedResourceMixin,
+    PatchModelMixin,
+    SelectAuthorMixin,
+    SparseQuerysetMixin,
+    ValuesListMixin
+)
+from .pagination import PageNumberOrCursorPagination
+from .parsers import NDJSONParser
 from .permissions import (
     IsSuperUser,
     IsSuperUserOrReadOnly,
@@ -23,18 +49,43 @@ from .serializers import (
     GenreSerializer,
     ReviewSerializer,
     TitleSerializer,
+    TitleStatsSerializer,
     UserCreateSerializer,
     UserRecieveTokenSerializer,
-    UserSerializer
+    UserSerializer,
+    get_expanded
+)
+from .slugs import category_slugs, genre_slugs
+from .throttling import (
+    SignupEmailThrottle,
+    SignupThrottle,
+    SignupUsernameThrottle,
+    TokenThrottle,
+    TokenUsernameThrottle
+)
+from core.constants import SEARCH_MAX_RESULTS, TITLES_BULK_MAX_ITEMS
+from core.metrics import get_request_stats
+from reviews.models import (
+    Category,
+    Comment,
+    Genre,
+    Review,
+    Title,
+    TitleStats
 )
-from reviews.models import Category, Genre, Review, Title
+from reviews.search import get_search_backend, search_tokens
 
 User = get_user_model()
 
 
-class CategoryViewSet(ListCreateDestroyViewSet):
+class CategoryViewSet(
+    CachedListMixin,
+    ValuesListMixin,
+    ListCreateDestroyViewSet
+):
     """Вьюсет получения, добавления и удаления категорий."""
 
+    cache_group = 'categories'
     queryset = Category.objects.all()
     serializer_class = CategorySerializer
     permission_classes = (
@@ -49,9 +100,14 @@ class CategoryViewSet(ListCreateDestroyViewSet):
     lookup_field = 'slug'
 
 
-class GenreViewSet(ListCreateDestroyViewSet):
+class GenreViewSet(
+    CachedListMixin,
+    ValuesListMixin,
+    ListCreateDestroyViewSet
+):
     """Вьюсет получения, добавления и удаления жанров."""
 
+    cache_group = 'genres'
     queryset = Genre.objects.all()
     serializer_class = GenreSerializer
     permission_classes = (
@@ -67,41 +123,173 @@ class GenreViewSet(ListCreateDestroyViewSet):
 
 
 class TitleViewSet(
+    SparseQuerysetMixin,
+    ConditionalGetMixin,
+    CachedListMixin,
+    CachedRetrieveMixin,
+    ValuesListMixin,
     ListCreateDestroyViewSet,
     mixins.RetrieveModelMixin,
     PatchModelMixin
 ):
     """Вьюсет получения, добавления и удаления произведений."""
 
-    queryset = Title.objects.annotate(
-        rating=Avg('reviews__score')
+    cache_group = 'titles'
+    queryset = Title.objects.select_related(
+        'category'
+    ).prefetch_related(
+        'genre'
     ).order_by('rating')
     serializer_class = TitleSerializer
     permission_classes = (
         IsSuperUserOrReadOnly,
     )
+    pagination_class = PageNumberOrCursorPagination
+    cursor_ordering = ('id',)
     filter_backends = (
         DjangoFilterBackend,
     )
     filterset_class = TitleFilter
 
+    def get_cache_versions(self):
+        versions = super().get_cache_versions()
+        if 'stats' in get_expanded(self.request):
+            versions += ('titles:stats',)
+        return versions
+
+    def get_modification_state(self):
+        if self.action == 'stats':
+            updated_at = TitleStats.objects.filter(
+                pk=self.kwargs.get('pk')
+            ).values_list('updated_at', flat=True).first()
+            return updated_at, updated_at
+        if self.action != 'retrieve':
+            # Версия списка потребовала бы агрегата по всем произведениям;
+            # список обслуживается кэшем ответов.
+            return None
+        fields = ['updated_at']
+        if 'stats' in get_expanded(self.request):
+            fields.append('stats__updated_at')
+        dates = Title.objects.filter(
+            pk=self.kwargs.get('pk')
+        ).values_list(*fields).first()
+        if dates is None:
+            return None
+        updated_at = max(date for date in dates if date is not None)
+        return updated_at, updated_at
+
+    @action(detail=True, serializer_class=TitleStatsSerializer)
+    def stats(self, request, pk):
+        """
+        Распределение оценок и счётчики отзывов и комментариев.
+
+        Читается одна заранее посчитанная строка; ETag и Last-Modified
+        строятся по дате её изменения.
+        """
+        return self.conditional_response(self.title_stats, request, pk)
+
+    def title_stats(self, request, pk):
+        stats = TitleStats.objects.filter(pk=pk).first()
+        if stats is None:
+            # Произведение загружено в обход save(): считаем статистику
+            # один раз и сохраняем.
+            titles = Title.objects.filter(pk=pk)
+            if not titles.exists():
+                raise Http404
+            TitleStats.objects.recalculate(titles)
+            stats = TitleStats.objects.get(pk=pk)
+        return Response(self.get_serializer(stats).data)
+
+    @action(detail=False, pagination_class=PageNumberPagination)
+    def search(self, request):
+        """
+        Полнотекстовый поиск по названиям, описаниям и отзывам.
+
+        Каждое слово запроса `q` ищется по префиксу в названии, описании
+        или любом отзыве произведения; результаты упорядочены по
+        релевантности и кэшируются вместе со списком произведений.
+        Выдача ограничена SEARCH_MAX_RESULTS произведениями, поэтому и
+        `count` в ответе не больше этого числа.
+        """
+        return self.cached_response(self.search_titles, request)
+
+    def search_titles(self, request):
+        tokens = search_tokens(request.query_params.get('q', ''))
+        if not tokens:
+            message = {'q': ['Укажите слова для поиска.']}
+            return Response(message, status=status.HTTP_400_BAD_REQUEST)
+        title_ids = self.paginate_queryset(
+            get_search_backend().search(tokens, SEARCH_MAX_RESULTS)
+        )
+        titles = self.get_queryset().in_bulk(title_ids)
+        serializer = self.get_serializer(
+            [titles[pk] for pk in title_ids if pk in titles],
+            many=True
+        )
+        return self.get_paginated_response(serializer.data)
+
+    @action(
+        detail=False,
+        methods=['post'],
+        permission_classes=(IsSuperUser,),
+        parser_classes=(JSONParser, NDJSONParser)
+    )
+    def bulk(self, request):
+        """Массовое создание произведений из JSON-массива или NDJSON."""
+        items = request.data
+        if not isinstance(items, list):
+            message = {'detail': 'Ожидается массив произведений.'}
+            return Response(message, status=status.HTTP_400_BAD_REQUEST)
+        if len(items) > TITLES_BULK_MAX_ITEMS:
+            message = {
+                'detail': f'Не больше {TITLES_BULK_MAX_ITEMS} произведений '
+                          'за запрос.'
+            }
+            return Response(message, status=status.HTTP_400_BAD_REQUEST)
+        results = create_titles(items)
+        created = sum('id' in result for result in results)
+        if created == len(results):
+            response_status = status.HTTP_201_CREATED
+        elif created:
+            response_status = status.HTTP_207_MULTI_STATUS
+        else:
+            response_status = status.HTTP_400_BAD_REQUEST
+        return Response({
+            'created': created,
+            'failed': len(results) - created,
+            'results': results,
+        }, status=response_status)
+
     def perform_update(self, serializer):
         self.perform_create(serializer)
 
     def perform_create(self, serializer):
-        serializer.save(
-            category=get_object_or_404(
-                Category,
-                slug=self.request.data.get('category')
-            ),
-            genre=Genre.objects.filter(
-                slug__in=self.request.data.getlist('genre')
-            ),
-        )
+        category = category_slugs.get(self.request.data.get('category'))
+        if category is None:
+            raise Http404
+        genres = genre_slugs.resolve(self.request.data.getlist('genre'))
+        try:
+            with transaction.atomic():
+                serializer.save(
+                    category=category, genre=list(genres.values())
+                )
+        except IntegrityError:
+            # Категорию или жанр удалили после того, как slug был найден.
+            category_slugs.clear()
+            genre_slugs.clear()
+            raise ValidationError({
+                api_settings.NON_FIELD_ERRORS_KEY: [
+                    'Категория или жанр были удалены, повторите запрос.'
+                ]
+            })
 
 
 @api_view(['POST'])
+@authentication_classes([])
 @permission_classes([AllowAny])
+@throttle_classes([
+    SignupThrottle, SignupUsernameThrottle, SignupEmailThrottle
+])
 def create_user(request):
     """Функция для создания новых пользователей."""
     serializer = UserCreateSerializer(data=request.data)
@@ -112,7 +300,9 @@ def create_user(request):
 
 
 @api_view(['POST'])
+@authentication_classes([])
 @permission_classes([AllowAny])
+@throttle_classes([TokenThrottle, TokenUsernameThrottle])
 def get_token(request):
     """Функция для получения токена."""
     serializer = UserRecieveTokenSerializer(data=request.data)
@@ -129,7 +319,39 @@ def get_token(request):
     return Response(message, status=status.HTTP_200_OK)
 
 
-class UserViewSet(viewsets.ModelViewSet):
+@api_view(['GET'])
+@permission_classes([IsSuperUser])
+def cache_stats(request):
+    """Счётчики попаданий и промахов кэша ответов."""
+    return Response(get_stats(), status=status.HTTP_200_OK)
+
+
+@api_view(['GET'])
+@permission_classes([IsSuperUser])
+def request_stats(request):
+    """Время ответа и запросы к БД по каждому эндпоинту."""
+    return Response(get_request_stats(), status=status.HTTP_200_OK)
+
+
+class ExportView(APIView):
+    """Потоковая выгрузка произведений, отзывов и комментариев."""
+
+    permission_classes = (IsSuperUser,)
+    content_negotiation_class = ExportContentNegotiation
+
+    def get(self, request, resource, file_format):
+        render, content_type = RENDERERS[file_format]
+        response = StreamingHttpResponse(
+            render(resource),
+            content_type=content_type
+        )
+        response['Content-Disposition'] = (
+            f'attachment; filename="{resource}.{file_format}"'
+        )
+        return response
+
+
+class UserViewSet(SparseQuerysetMixin, viewsets.ModelViewSet):
     """Вьюсет получения/создания/обновления/удаления пользователей."""
 
     queryset = User.objects.all()
@@ -167,6 +389,15 @@ class UserViewSet(viewsets.ModelViewSet):
         user.delete()
         return Response(status=status.HTTP_204_NO_CONTENT)
 
+    def get_current_user(self):
+        """
+        Полная запись текущего пользователя.
+
+        request.user после аутентификации содержит только поля,
+        нужные для проверки прав.
+        """
+        return self.get_queryset().get(pk=self.request.user.pk)
+
     @action(
         detail=False,
         url_path='me',
@@ -174,14 +405,14 @@ class UserViewSet(viewsets.ModelViewSet):
     )
     def myself(self, request):
         """Позволяет пользователю получить информацию о себе."""
-        serializer = self.get_serializer(request.user)
+        serializer = self.get_serializer(self.get_current_user())
         return Response(serializer.data, status=status.HTTP_200_OK)
 
     @myself.mapping.patch
     def update_myself(self, request):
         """Позволяет пользователю обновить информацию о себе."""
         serializer = self.get_serializer(
-            request.user,
+            self.get_current_user(),
             data=request.data,
             partial=True,
             context={'request': request}
@@ -192,52 +423,72 @@ class UserViewSet(viewsets.ModelViewSet):
 
 
 class CommentViewSet(
+    SparseQuerysetMixin,
+    ConditionalGetMixin,
+    SelectAuthorMixin,
+    NestedResourceMixin,
+    ValuesListMixin,
     ListCreateDestroyViewSet,
     mixins.RetrieveModelMixin,
     PatchModelMixin
 ):
     """Вьюсет получения/создания/обновления/удаления комментариев."""
 
+    queryset = Comment.objects.all()
     serializer_class = CommentSerializer
     permission_classes = (ReadOrAuthenticatedOrInAuthorModerAdmin,)
-
-    def get_queryset(self):
-        return get_object_or_404(
-            Review,
-            id=self.kwargs.get('review_id')
-        ).comments.all()
-
-    def perform_create(self, serializer):
-        serializer.save(
-            author=self.request.user,
-            review=get_object_or_404(
-                Review,
-                id=self.kwargs.get('review_id')
-            )
-        )
+    pagination_class = PageNumberOrCursorPagination
+    cursor_ordering = ('created_at', 'id')
+    parent_model = Review
+    parent_field = 'review'
+    parent_lookups = {'pk': 'review_id', 'title_id': 'title_id'}
+
+    def get_modification_state(self):
+        if self.action == 'retrieve':
+            updated_at = self.get_queryset().filter(
+                pk=self.kwargs.get('pk')
+            ).values_list('updated_at', flat=True).first()
+        else:
+            updated_at = Review.objects.filter(
+                **self.get_parent_filter()
+            ).values_list('comments_updated_at', flat=True).first()
+            if updated_at is None:
+                raise Http404
+            self.parent_exists = True
+        return updated_at, updated_at
 
 
 class ReviewViewSet(
+    SparseQuerysetMixin,
+    ConditionalGetMixin,
+    SelectAuthorMixin,
+    NestedResourceMixin,
+    ValuesListMixin,
     ListCreateDestroyViewSet,
     mixins.RetrieveModelMixin,
     PatchModelMixin
 ):
     """Вьюсет получения/создания/обновления/удаления ревью."""
 
+    queryset = Review.objects.all()
     serializer_class = ReviewSerializer
     permission_classes = (ReadOrAuthenticatedOrInAuthorModerAdmin,)
-
-    def get_queryset(self):
-        return get_object_or_404(
-            Title,
-            id=self.kwargs.get('title_id')
-        ).reviews.all()
-
-    def perform_create(self, serializer):
-        serializer.save(
-            author=self.request.user,
-            title=get_object_or_404(
-                Title,
-                id=self.kwargs.get('title_id')
-            )
-        )
+    pagination_class = PageNumberOrCursorPagination
+    cursor_ordering = ('pub_date', 'id')
+    parent_model = Title
+    parent_field = 'title'
+    parent_lookups = {'pk': 'title_id'}
+
+    def get_modification_state(self):
+        if self.action == 'retrieve':
+            updated_at = self.get_queryset().filter(
+                pk=self.kwargs.get('pk')
+            ).values_list('updated_at', flat=True).first()
+        else:
+            updated_at = Title.objects.filter(
+                **self.get_parent_filter()
+            ).values_list('reviews_updated_at', flat=True).first()
+            if updated_at is None:
+                raise Http404
+            self.parent_exists = True
+        return updated_at, updated_at
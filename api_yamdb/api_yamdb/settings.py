@@ -4,7 +4,15 @@ import os
 import sys
 
 from dotenv import load_dotenv
-from core.constants import PAGES_PER_PAGINATION
+from core.constants import (
+    DB_CONN_MAX_AGE,
+    DB_CONNECT_TIMEOUT,
+    PAGES_PER_PAGINATION,
+    THROTTLE_SIGNUP_FIELD_RATE,
+    THROTTLE_SIGNUP_RATE,
+    THROTTLE_TOKEN_RATE,
+    THROTTLE_TOKEN_USERNAME_RATE
+)
 
 
 load_dotenv()
@@ -16,7 +24,7 @@ SECRET_KEY = os.getenv('SECRET_KEY')
 if SECRET_KEY is None:
     sys.exit('Ошибка: SECRET_KEY не найден среди переменных окружения.')
 
-DEBUG = True
+DEBUG = os.getenv('DEBUG', 'true').lower() == 'true'
 
 ALLOWED_HOSTS = os.getenv('ALLOWED_HOSTS')
 
@@ -40,6 +48,8 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'core.middleware.RequestStatsMiddleware',
+    'core.middleware.CompressionMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -78,13 +88,80 @@ TEMPLATES = [
 WSGI_APPLICATION = 'api_yamdb.wsgi.application'
 
 
+# sqlite, postgresql или полный путь к бэкенду, например пулящему.
+DB_ENGINE = os.getenv('DB_ENGINE', 'sqlite')
+
+DB_ENGINES = {
+    'sqlite': 'django.db.backends.sqlite3',
+    'postgresql': 'django.db.backends.postgresql',
+}
+
 DATABASES = {
     'default': {
-        'ENGINE': 'django.db.backends.sqlite3',
-        'NAME': BASE_DIR / 'db.sqlite3',
+        'ENGINE': DB_ENGINES.get(DB_ENGINE, DB_ENGINE),
+        'NAME': os.getenv('DB_NAME', BASE_DIR / 'db.sqlite3'),
+        'CONN_MAX_AGE': int(os.getenv('DB_CONN_MAX_AGE', DB_CONN_MAX_AGE)),
+        # В Django 3.2 ключ не поддерживается: его читает core.db.
+        'CONN_HEALTH_CHECKS': (
+            os.getenv('DB_CONN_HEALTH_CHECKS', 'true').lower() == 'true'
+        ),
+    }
+}
+
+if DATABASES['default']['ENGINE'] != DB_ENGINES['sqlite']:
+    DATABASES['default'].update({
+        'NAME': os.getenv('DB_NAME', 'api_yamdb'),
+        'USER': os.getenv('DB_USER', 'postgres'),
+        'PASSWORD': os.getenv('DB_PASSWORD', ''),
+        'HOST': os.getenv('DB_HOST', 'localhost'),
+        'PORT': os.getenv('DB_PORT', '5432'),
+        'OPTIONS': {
+            'connect_timeout': int(
+                os.getenv('DB_CONNECT_TIMEOUT', DB_CONNECT_TIMEOUT)
+            ),
+        },
+        # PgBouncer в режиме transaction не держит серверные курсоры
+        # между транзакциями.
+        'DISABLE_SERVER_SIDE_CURSORS': (
+            os.getenv('DB_POOLER', '').lower() == 'pgbouncer'
+        ),
+    })
+else:
+    # Тестовая база в файле, а не в общей памяти: так параллельные
+    # соединения из потоков пишут по очереди (WAL, busy_timeout), а не
+    # падают с «database table is locked».
+    DATABASES['default']['TEST'] = {
+        'NAME': os.getenv('DB_TEST_NAME', BASE_DIR / 'test_db.sqlite3'),
+    }
+
+CACHES = {
+    'default': {
+        'BACKEND': os.getenv(
+            'CACHE_BACKEND',
+            'django.core.cache.backends.locmem.LocMemCache'
+        ),
+        'LOCATION': os.getenv('CACHE_LOCATION', 'api_yamdb'),
     }
 }
 
+# Кэш пользователей для JWT: true/false; по умолчанию включён, если кэш
+# общий для воркеров или DEBUG (см. users.authentication).
+AUTH_CACHE_ENABLED = {'true': True, 'false': False}.get(
+    os.getenv('AUTH_CACHE_ENABLED', '').lower()
+)
+
+# Кэш slug категорий и жанров в памяти процесса: true/false; по умолчанию
+# включён, только если кэш общий для воркеров (см. api.v1.slugs).
+SLUG_CACHE_ENABLED = {'true': True, 'false': False}.get(
+    os.getenv('SLUG_CACHE_ENABLED', '').lower()
+)
+
+# Хранилище счётчиков ограничения частоты: кэш или память процесса
+# (api.v1.throttling.LocalWindowStore).
+THROTTLE_STORE = os.getenv(
+    'THROTTLE_STORE', 'api.v1.throttling.CacheWindowStore'
+)
+
 
 AUTH_PASSWORD_VALIDATORS = [
     {
@@ -124,15 +201,41 @@ EMAIL_BACKEND = 'django.core.mail.backends.filebased.EmailBackend'
 
 EMAIL_FILE_PATH = BASE_DIR / 'sent_emails'
 
+# Отправлять письма из очереди сразу после коммита, без `send_emails`.
+EMAIL_OUTBOX_EAGER = os.getenv('EMAIL_OUTBOX_EAGER', 'false').lower() == 'true'
+
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': (
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'users.authentication.CachedJWTAuthentication',
+    ),
+    'DEFAULT_RENDERER_CLASSES': (
+        'core.renderers.FastJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
     ),
     'DEFAULT_PERMISSION_CLASSES': (
         'rest_framework.permissions.IsAuthenticatedOrReadOnly',
     ),
     'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
-    'PAGE_SIZE': PAGES_PER_PAGINATION
+    'PAGE_SIZE': PAGES_PER_PAGINATION,
+    'DEFAULT_THROTTLE_RATES': {
+        'signup': os.getenv('THROTTLE_SIGNUP_RATE', THROTTLE_SIGNUP_RATE),
+        'signup_username': os.getenv(
+            'THROTTLE_SIGNUP_FIELD_RATE', THROTTLE_SIGNUP_FIELD_RATE
+        ),
+        'signup_email': os.getenv(
+            'THROTTLE_SIGNUP_FIELD_RATE', THROTTLE_SIGNUP_FIELD_RATE
+        ),
+        'token': os.getenv('THROTTLE_TOKEN_RATE', THROTTLE_TOKEN_RATE),
+        'token_username': os.getenv(
+            'THROTTLE_TOKEN_USERNAME_RATE', THROTTLE_TOKEN_USERNAME_RATE
+        ),
+    },
+    # Число прокси перед приложением: IP клиента берётся из
+    # X-Forwarded-For.
+    'NUM_PROXIES': (
+        int(os.environ['NUM_PROXIES']) if 'NUM_PROXIES' in os.environ
+        else None
+    ),
 }
 
 
@@ -6,3 +6,6 @@ class CoreConfig(AppConfig):
     name = 'core'
     verbose_name = 'Ядро'
     verbose_name = 'Ядра'
+
+    def ready(self):
+        from . import db  # noqa: F401
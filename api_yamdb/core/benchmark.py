@@ -0,0 +1,58 @@
+import math
+from contextlib import contextmanager
+
+from django.db import connection
+from django.test.utils import (
+    setup_test_environment,
+    teardown_test_environment
+)
+
+PERCENTILES = (50, 95, 99)
+
+
+@contextmanager
+def benchmark_database(current_db=False):
+    """
+    Окружение для замеров: тестовые настройки и временная база.
+
+    С `current_db` замеры идут в текущей базе, созданные данные в ней
+    остаются.
+    """
+    try:
+        setup_test_environment()
+    except RuntimeError:
+        own_environment = False
+    else:
+        own_environment = True
+    old_name = None
+    if not current_db:
+        old_name = connection.settings_dict['NAME']
+        connection.creation.create_test_db(verbosity=0, autoclobber=True)
+    try:
+        yield
+    finally:
+        if old_name is not None:
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+        if own_environment:
+            teardown_test_environment()
+
+
+def percentile(sorted_values, percent):
+    """Перцентиль по методу ближайшего ранга."""
+    rank = math.ceil(percent / 100 * len(sorted_values))
+    return sorted_values[max(rank, 1) - 1]
+
+
+def summarize(timings):
+    """Перцентили, среднее и пропускная способность по длительностям, с."""
+    timings = sorted(timing * 1000 for timing in timings)
+    result = {
+        f'p{percent}_ms': round(percentile(timings, percent), 3)
+        for percent in PERCENTILES
+    }
+    result.update({
+        'mean_ms': round(sum(timings) / len(timings), 3),
+        'max_ms': round(timings[-1], 3),
+        'throughput_rps': round(len(timings) / sum(timings) * 1000, 1),
+    })
+    return result
@@ -0,0 +1,82 @@
+import gzip
+
+from .constants import (
+    COMPRESSION_BROTLI_QUALITY,
+    COMPRESSION_GZIP_LEVEL,
+    COMPRESSION_ZSTD_LEVEL
+)
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+
+def compress_gzip(data):
+    return gzip.compress(data, compresslevel=COMPRESSION_GZIP_LEVEL, mtime=0)
+
+
+def compress_brotli(data):
+    return brotli.compress(data, quality=COMPRESSION_BROTLI_QUALITY)
+
+
+def compress_zstd(data):
+    return zstandard.ZstdCompressor(level=COMPRESSION_ZSTD_LEVEL).compress(
+        data
+    )
+
+
+def get_codecs():
+    """Доступные кодировки в порядке предпочтения сервера."""
+    codecs = {}
+    if zstandard is not None:
+        codecs['zstd'] = compress_zstd
+    if brotli is not None:
+        codecs['br'] = compress_brotli
+    codecs['gzip'] = compress_gzip
+    return codecs
+
+
+CODECS = get_codecs()
+
+
+def parse_accept_encoding(header):
+    """Кодировки из заголовка Accept-Encoding с весами q."""
+    weights = {}
+    for item in header.split(','):
+        name, *params = item.split(';')
+        name = name.strip().lower()
+        if not name:
+            continue
+        weight = 1.0
+        for param in params:
+            key, _, value = param.partition('=')
+            if key.strip().lower() == 'q':
+                try:
+                    weight = float(value)
+                except ValueError:
+                    weight = 0.0
+        weights[name] = weight
+    return weights
+
+
+def choose_encoding(header, codecs=CODECS):
+    """
+    Кодировка для ответа или None, если клиент не принимает ни одной.
+
+    Выбирается кодировка с наибольшим q; при равных весах — первая
+    в порядке предпочтения сервера.
+    """
+    weights = parse_accept_encoding(header)
+    default = weights.get('*', 0.0)
+    best, best_weight = None, 0.0
+    for name in codecs:
+        weight = weights.get(name, default)
+        if weight > best_weight:
+            best, best_weight = name, weight
+    return best
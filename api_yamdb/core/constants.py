@@ -10,3 +10,70 @@ PAGES_PER_PAGINATION = 10
 COMMENT_LENGHT = 15
 
 ADMIN_EMAIL = 'noreply@yamdb.com'
+
+RESPONSE_CACHE_ALIAS = 'default'
+RESPONSE_CACHE_TIMEOUT = 60 * 15
+
+MAX_EMAIL_SUBJECT_LENGTH = 255
+MAX_EMAIL_STATUS_LENGTH = 10
+EMAIL_OUTBOX_BATCH_SIZE = 100
+EMAIL_OUTBOX_MAX_ATTEMPTS = 5
+EMAIL_OUTBOX_RETRY_DELAY = 30
+EMAIL_OUTBOX_LEASE = 300
+EMAIL_OUTBOX_POLL_INTERVAL = 5
+
+IMPORT_BATCH_SIZE = 5000
+IMPORT_ERRORS_TO_SHOW = 10
+
+EXPORT_CHUNK_SIZE = 2000
+
+# Границы корзин гистограмм статистики запросов: миллисекунды и штуки.
+REQUEST_STATS_DURATION_BUCKETS = (
+    5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000
+)
+REQUEST_STATS_QUERY_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+
+SYNTHETIC_PREFIX = 'synthetic'
+SYNTHETIC_ZIPF_EXPONENT = 1.1
+
+BENCH_REQUESTS = 200
+BENCH_WARMUP = 10
+BENCH_TARGETS = 100
+BENCH_SEARCH_PREFIX = 4
+BENCH_SEARCH_QUERIES = 50
+
+SEARCH_MAX_TOKENS = 10
+SEARCH_MAX_RESULTS = 1000
+SEARCH_REVIEW_WEIGHT = 0.5
+SEARCH_POSTGRES_CONFIG = 'russian'
+
+SLUG_CACHE_SIZE = 1024
+
+TITLES_BULK_MAX_ITEMS = 100000
+
+# Кэши в памяти процесса: у каждого воркера свой.
+LOCAL_CACHE_BACKENDS = ('django.core.cache.backends.locmem.LocMemCache',)
+AUTH_CACHE_ALIAS = 'default'
+AUTH_CACHE_TIMEOUT = 60 * 5
+
+DB_CONN_MAX_AGE = 60
+DB_CONNECT_TIMEOUT = 5
+SQLITE_BUSY_TIMEOUT = 5000
+SQLITE_MMAP_SIZE = 256 * 1024 * 1024
+
+MIN_SCORE = 1
+MAX_SCORE = 10
+
+COMPRESSION_MIN_SIZE = 1024
+COMPRESSION_GZIP_LEVEL = 6
+COMPRESSION_BROTLI_QUALITY = 4
+COMPRESSION_ZSTD_LEVEL = 3
+BENCH_RENDER_PAGE_SIZE = 1000
+BENCH_RENDER_REPEAT = 50
+
+THROTTLE_CACHE_ALIAS = 'default'
+THROTTLE_SIGNUP_RATE = '20/hour'
+THROTTLE_SIGNUP_FIELD_RATE = '10/hour'
+THROTTLE_TOKEN_RATE = '60/hour'
+THROTTLE_TOKEN_USERNAME_RATE = '10/hour'
+THROTTLE_LOCAL_MAX_ENTRIES = 10000
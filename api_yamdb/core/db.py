@@ -0,0 +1,120 @@
+from itertools import islice
+
+import django
+from django.core.signals import request_started
+from django.db import NotSupportedError, connections, router, transaction
+from django.db.backends.base.base import BaseDatabaseWrapper
+from django.db.backends.signals import connection_created
+from django.dispatch import receiver
+
+from .constants import SQLITE_BUSY_TIMEOUT, SQLITE_MMAP_SIZE
+
+SQLITE_PRAGMAS = (
+    # Читатели не блокируют писателя и друг друга.
+    ('journal_mode', 'WAL'),
+    # В режиме WAL fsync на каждый коммит не нужен для целостности.
+    ('synchronous', 'NORMAL'),
+    ('mmap_size', SQLITE_MMAP_SIZE),
+    ('busy_timeout', SQLITE_BUSY_TIMEOUT),
+)
+
+
+def lock_for_insert(connection, model):
+    """
+    Блокирует вставку в таблицу модели до конца транзакции.
+
+    В SQLite любая запись берёт блокировку всей базы на запись, поэтому
+    хватает UPDATE, не меняющего ни одной строки.
+    """
+    if connection.vendor != 'sqlite':
+        raise NotSupportedError(
+            f'Блокировка для вставки не реализована для {connection.vendor}.'
+        )
+    table = connection.ops.quote_name(model._meta.db_table)
+    column = connection.ops.quote_name(model._meta.pk.column)
+    with connection.cursor() as cursor:
+        cursor.execute(f'UPDATE {table} SET {column} = {column} WHERE 0')
+
+
+def bulk_insert(model, objects, batch_size):
+    """
+    Вставляет объекты пачками через bulk_create и возвращает их id.
+
+    Id идут в порядке объектов; `objects` может быть генератором. Если
+    СУБД возвращает id из INSERT (PostgreSQL), они берутся оттуда.
+    Иначе (SQLite) таблица блокируется на запись до конца транзакции:
+    чужих вставок быть не может, автоинкремент монотонен, и наши строки —
+    последние вставленные.
+    """
+    using = router.db_for_write(model)
+    connection = connections[using]
+    returns_ids = connection.features.can_return_rows_from_bulk_insert
+    objects = iter(objects)
+    ids = []
+    inserted = 0
+    with transaction.atomic(using=using):
+        if not returns_ids:
+            lock_for_insert(connection, model)
+        while True:
+            batch = list(islice(objects, batch_size))
+            if not batch:
+                break
+            model.objects.bulk_create(batch, batch_size=batch_size)
+            inserted += len(batch)
+            if returns_ids:
+                ids += [obj.pk for obj in batch]
+        if not returns_ids and inserted:
+            ids = list(
+                model.objects.order_by('-pk')
+                .values_list('pk', flat=True)[:inserted]
+            )[::-1]
+    return ids
+
+
+@receiver(connection_created)
+def configure_sqlite(sender, connection, **kwargs):
+    """Настраивает каждое новое соединение с SQLite."""
+    if connection.vendor != 'sqlite':
+        return
+    with connection.cursor() as cursor:
+        for name, value in SQLITE_PRAGMAS:
+            cursor.execute(f'PRAGMA {name} = {value}')
+
+
+def close_if_unhealthy(connection):
+    """
+    Закрывает постоянное соединение, если оно перестало отвечать.
+
+    Иначе запрос, доставшийся разорванному соединению (перезапуск БД,
+    таймаут на стороне пулера), упадёт с ошибкой вместо переподключения.
+    """
+    if (
+        connection.settings_dict.get('CONN_HEALTH_CHECKS')
+        and connection.connection is not None
+        and not connection.in_atomic_block
+        and not connection.is_usable()
+    ):
+        connection.close()
+
+
+# Начиная с Django 4.1 CONN_HEALTH_CHECKS поддерживается штатно. Как и
+# там, соединение проверяется не в начале запроса, а при первом
+# обращении к базе: запросы без БД (ответ из кэша, 304) обходятся без
+# лишнего SELECT 1.
+if django.VERSION < (4, 1):
+    # Проверка — при создании курсора, как в Django 4.1: ensure_connection
+    # вызывает и close_old_connections в конце запроса.
+    _cursor = BaseDatabaseWrapper._cursor
+
+    def cursor_after_health_check(self, name=None):
+        if getattr(self, 'health_check_pending', False):
+            self.health_check_pending = False
+            close_if_unhealthy(self)
+        return _cursor(self, name)
+
+    BaseDatabaseWrapper._cursor = cursor_after_health_check
+
+    @receiver(request_started)
+    def check_connections(sender, **kwargs):
+        for connection in connections.all():
+            connection.health_check_pending = True
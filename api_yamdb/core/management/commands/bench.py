@@ -0,0 +1,396 @@
+import json
+import platform
+import random
+import time
+from collections import Counter
+from contextlib import contextmanager
+from time import perf_counter
+
+import django
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.contrib.auth.tokens import default_token_generator
+from django.core.cache import cache
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test.utils import override_settings
+from django.urls import reverse
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+
+from api.v1.throttling import reset_stores
+from api.v1.urls import router_v1
+from core.benchmark import benchmark_database, summarize
+from core.constants import (
+    BENCH_REQUESTS,
+    BENCH_SEARCH_PREFIX,
+    BENCH_TARGETS,
+    BENCH_WARMUP,
+    IMPORT_BATCH_SIZE,
+    SYNTHETIC_ZIPF_EXPONENT
+)
+from core.metrics import get_request_stats, reset_request_stats
+from reviews.dataset import seed_dataset
+from reviews.models import Comment, Review, Title
+from reviews.search import search_tokens
+
+User = get_user_model()
+
+URL_NAMESPACE = 'api:api'
+
+
+class Command(BaseCommand):
+    help = (
+        'Нагрузочный прогон эндпоинтов API на синтетических данных: '
+        'p50/p95/p99 и пропускная способность по каждому маршруту '
+        'router_v1, auth/signup/ и auth/token/ в формате JSON.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--titles',
+            type=int,
+            default=1000,
+            help='Количество произведений в синтетических данных.'
+        )
+        parser.add_argument(
+            '--reviews',
+            type=int,
+            default=20000,
+            help='Количество отзывов.'
+        )
+        parser.add_argument(
+            '--comments',
+            type=int,
+            default=50000,
+            help='Количество комментариев.'
+        )
+        parser.add_argument(
+            '--users',
+            type=int,
+            default=0,
+            help=(
+                'Количество пользователей (не меньше, чем нужно для '
+                'уникальных отзывов).'
+            )
+        )
+        parser.add_argument(
+            '--seed',
+            type=int,
+            default=0,
+            help='Зерно генератора данных и выбора объектов.'
+        )
+        parser.add_argument(
+            '--zipf',
+            type=float,
+            default=SYNTHETIC_ZIPF_EXPONENT,
+            help='Показатель Ципфа для распределения отзывов по произведениям.'
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=IMPORT_BATCH_SIZE,
+            help='Строк в одном INSERT при заполнении базы.'
+        )
+        parser.add_argument(
+            '--requests',
+            type=int,
+            default=BENCH_REQUESTS,
+            help='Замеряемых запросов на маршрут.'
+        )
+        parser.add_argument(
+            '--warmup',
+            type=int,
+            default=BENCH_WARMUP,
+            help='Незамеряемых запросов на маршрут перед прогоном.'
+        )
+        parser.add_argument(
+            '--cold-cache',
+            action='store_true',
+            help='Очищать кэш перед каждым запросом.'
+        )
+        parser.add_argument(
+            '--routes',
+            nargs='*',
+            help='Имена маршрутов (например, titles-list); по умолчанию все.'
+        )
+        parser.add_argument(
+            '--output',
+            help='Файл для результатов в JSON; по умолчанию stdout.'
+        )
+        parser.add_argument(
+            '--current-db',
+            action='store_true',
+            help=(
+                'Работать в текущей базе вместо временной тестовой; '
+                'синтетические данные в ней останутся.'
+            )
+        )
+        parser.add_argument(
+            '--no-seed',
+            action='store_true',
+            help='Не заполнять базу, использовать уже лежащие в ней данные.'
+        )
+
+    def handle(self, *args, **options):
+        if options['requests'] < 1:
+            raise CommandError('--requests должно быть больше нуля.')
+        with benchmark_database(options['current_db']), \
+                self.throttle_settings(options):
+            report = self.run(options)
+
+        result = json.dumps(report, ensure_ascii=False, indent=2)
+        if options['output']:
+            with open(options['output'], 'w', encoding='utf-8') as file:
+                file.write(result + '\n')
+            for name, stats in report['results'].items():
+                self.stdout.write(
+                    f'{name:<24} p50={stats["p50_ms"]:.2f} '
+                    f'p95={stats["p95_ms"]:.2f} p99={stats["p99_ms"]:.2f} '
+                    f'мс, {stats["throughput_rps"]:.0f} запр/с'
+                )
+        else:
+            self.stdout.write(result)
+
+    @staticmethod
+    @contextmanager
+    def throttle_settings(options):
+        """
+        Лимиты частоты на время прогона.
+
+        Сценарии signup и token шлют все запросы с одного IP, а token — с
+        одним username, поэтому с боевыми лимитами прогон мерил бы ответы
+        429. Лимит поднимается до числа запросов сценария, так что
+        проверка частоты остаётся в замере, но не срабатывает; счётчики —
+        в памяти процесса, свои на каждый прогон.
+        """
+        limit = f'{options["warmup"] + options["requests"]}/day'
+        rest_framework = dict(
+            settings.REST_FRAMEWORK,
+            DEFAULT_THROTTLE_RATES={
+                scope: limit
+                for scope in settings.REST_FRAMEWORK['DEFAULT_THROTTLE_RATES']
+            }
+        )
+        reset_stores()
+        try:
+            with override_settings(
+                THROTTLE_STORE='api.v1.throttling.LocalWindowStore',
+                REST_FRAMEWORK=rest_framework
+            ):
+                yield
+        finally:
+            reset_stores()
+
+    def run(self, options):
+        dataset = None
+        if not options['no_seed']:
+            started = time.monotonic()
+            dataset = seed_dataset(
+                titles=options['titles'],
+                reviews=options['reviews'],
+                comments=options['comments'],
+                users=options['users'],
+                seed=options['seed'],
+                zipf_exponent=options['zipf'],
+                batch_size=options['batch_size'],
+            )
+            dataset['seconds'] = round(time.monotonic() - started, 2)
+            if options['verbosity'] > 1:
+                self.stderr.write(
+                    f'Данные созданы за {dataset["seconds"]} с'
+                )
+        rng = random.Random(options['seed'])
+        scenarios = self.get_scenarios(rng)
+        uncovered = sorted(
+            basename for _, _, basename in router_v1.registry
+            if not any(name.startswith(f'{basename}-') for name in scenarios)
+        )
+        if uncovered:
+            self.stderr.write(
+                'Нет сценариев для маршрутов: ' + ', '.join(uncovered)
+            )
+        if options['routes']:
+            scenarios = {
+                name: scenario for name, scenario in scenarios.items()
+                if name in options['routes']
+            }
+        results = {}
+        for name, scenario in scenarios.items():
+            results[name] = self.measure(
+                scenario,
+                options['requests'],
+                options['warmup'],
+                options['cold_cache']
+            )
+        return {
+            'meta': {
+                'python': platform.python_version(),
+                'django': django.get_version(),
+                'database': connection.vendor,
+                'dataset': dataset,
+                'requests': options['requests'],
+                'warmup': options['warmup'],
+                'cold_cache': options['cold_cache'],
+                'seed': options['seed'],
+                'zipf': options['zipf'],
+                'uncovered_routes': uncovered,
+            },
+            'results': results,
+        }
+
+    def get_scenarios(self, rng):
+        """
+        Запросы для каждого маршрута router_v1 и эндпоинтов auth.
+
+        Сценарий — функция номера запроса, возвращающая ответ; объекты
+        для detail-маршрутов выбираются из первых BENCH_TARGETS записей.
+        """
+        admin, _ = User.objects.get_or_create(
+            username='bench_admin',
+            defaults={'email': 'bench_admin@yamdb.fake', 'role': 'admin'}
+        )
+        user, _ = User.objects.get_or_create(
+            username='bench_user',
+            defaults={'email': 'bench_user@yamdb.fake'}
+        )
+        anonymous = APIClient()
+        admin_client = self.get_client(admin)
+        user_client = self.get_client(user)
+        confirmation_code = default_token_generator.make_token(user)
+        run_id = time.time_ns()
+
+        comments = list(
+            Comment.objects.order_by('pk')
+            .values_list('review__title_id', 'review_id', 'pk')
+            [:BENCH_TARGETS]
+        )
+        reviews = [(title_id, review_id) for title_id, review_id, _ in (
+            comments
+        )] or list(
+            Review.objects.order_by('pk')
+            .values_list('title_id', 'pk')[:BENCH_TARGETS]
+        )
+        titles = [title_id for title_id, _ in reviews]
+        search_words = [
+            word
+            for name in Title.objects.order_by('pk').values_list(
+                'name', flat=True
+            )[:BENCH_TARGETS]
+            for word in search_tokens(name)
+            if len(word) >= BENCH_SEARCH_PREFIX
+        ]
+        usernames = list(
+            User.objects.order_by('pk')
+            .values_list('username', flat=True)[:BENCH_TARGETS]
+        )
+
+        def get(client, name, targets=None, kwargs=None):
+            def request(number):
+                url_kwargs = kwargs(rng.choice(targets)) if kwargs else {}
+                return client.get(
+                    reverse(f'{URL_NAMESPACE}:{name}', kwargs=url_kwargs)
+                )
+            return request
+
+        def search(number):
+            return anonymous.get(reverse(f'{URL_NAMESPACE}:titles-search'), {
+                'q': rng.choice(search_words)[:BENCH_SEARCH_PREFIX],
+            })
+
+        def signup(number):
+            username = f'bench_{run_id}_{number}'
+            return anonymous.post(reverse(f'{URL_NAMESPACE}:signup'), {
+                'username': username,
+                'email': f'{username}@yamdb.fake',
+            })
+
+        def token(number):
+            return anonymous.post(reverse(f'{URL_NAMESPACE}:token'), {
+                'username': user.username,
+                'confirmation_code': confirmation_code,
+            })
+
+        scenarios = {
+            'categories-list': get(anonymous, 'categories-list'),
+            'genres-list': get(anonymous, 'genres-list'),
+            'titles-list': get(anonymous, 'titles-list'),
+            'titles-detail': get(
+                anonymous, 'titles-detail', titles,
+                lambda title_id: {'pk': title_id}
+            ),
+            'titles-stats': get(
+                anonymous, 'titles-stats', titles,
+                lambda title_id: {'pk': title_id}
+            ),
+            'reviews-list': get(
+                anonymous, 'reviews-list', titles,
+                lambda title_id: {'title_id': title_id}
+            ),
+            'reviews-detail': get(
+                anonymous, 'reviews-detail', reviews,
+                lambda target: {'title_id': target[0], 'pk': target[1]}
+            ),
+            'comments-list': get(
+                anonymous, 'comments-list', reviews,
+                lambda target: {'title_id': target[0], 'review_id': target[1]}
+            ),
+            'comments-detail': get(
+                anonymous, 'comments-detail', comments,
+                lambda target: {
+                    'title_id': target[0],
+                    'review_id': target[1],
+                    'pk': target[2],
+                }
+            ),
+            'titles-search': search,
+            'users-list': get(admin_client, 'users-list'),
+            'users-user-by-username': get(
+                admin_client, 'users-user-by-username', usernames,
+                lambda username: {'username': username}
+            ),
+            'users-myself': get(user_client, 'users-myself'),
+            'signup': signup,
+            'token': token,
+        }
+        if not comments:
+            del scenarios['comments-detail']
+        if not search_words:
+            del scenarios['titles-search']
+        if not reviews:
+            for name in ('titles-detail', 'titles-stats', 'reviews-list',
+                         'reviews-detail', 'comments-list'):
+                del scenarios[name]
+        return scenarios
+
+    @staticmethod
+    def get_client(user):
+        client = APIClient()
+        client.credentials(
+            HTTP_AUTHORIZATION=f'Bearer {AccessToken.for_user(user)}'
+        )
+        return client
+
+    @staticmethod
+    def measure(request, requests, warmup, cold_cache):
+        for number in range(warmup):
+            request(number)
+        reset_request_stats()
+        timings = []
+        statuses = Counter()
+        for number in range(warmup, warmup + requests):
+            if cold_cache:
+                cache.clear()
+            started = perf_counter()
+            response = request(number)
+            timings.append(perf_counter() - started)
+            statuses[response.status_code] += 1
+        endpoints = list(get_request_stats().values())
+        result = summarize(timings)
+        result.update({
+            'queries': endpoints[0]['queries']['avg'] if endpoints else None,
+            'status_codes': {
+                str(code): count for code, count in sorted(statuses.items())
+            },
+        })
+        return result
@@ -0,0 +1,156 @@
+import json
+from time import perf_counter
+
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.test.utils import CaptureQueriesContext, override_settings
+from rest_framework.renderers import JSONRenderer
+
+from api.v1.serializers import TitleSerializer
+from api.v1.values import get_values_serializer
+from core.benchmark import benchmark_database, summarize
+from core.compression import CODECS
+from core.constants import BENCH_RENDER_PAGE_SIZE, BENCH_RENDER_REPEAT
+from core.renderers import FastJSONRenderer, orjson
+from reviews.dataset import seed_dataset
+from reviews.models import Title
+
+
+def measure(function, repeat):
+    """Длительности вызовов и результат последнего."""
+    timings = []
+    for _ in range(repeat):
+        started = perf_counter()
+        result = function()
+        timings.append(perf_counter() - started)
+    return timings, result
+
+
+class Command(BaseCommand):
+    help = (
+        'Сравнивает скорость сериализации (обычной и из values()), '
+        'рендеринга JSON (stdlib и orjson) и сжатия на странице произведений.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--page-size',
+            type=int,
+            default=BENCH_RENDER_PAGE_SIZE,
+            help='Количество произведений на странице.'
+        )
+        parser.add_argument(
+            '--repeat',
+            type=int,
+            default=BENCH_RENDER_REPEAT,
+            help='Сколько раз отрендерить и сжать страницу.'
+        )
+        parser.add_argument(
+            '--seed',
+            type=int,
+            default=0,
+            help='Зерно генератора данных.'
+        )
+        parser.add_argument(
+            '--current-db',
+            action='store_true',
+            help='Работать в текущей базе вместо временной тестовой.'
+        )
+        parser.add_argument(
+            '--no-seed',
+            action='store_true',
+            help='Не заполнять базу, использовать уже лежащие в ней данные.'
+        )
+        parser.add_argument(
+            '--output',
+            help='Файл для результатов в JSON; по умолчанию stdout.'
+        )
+
+    def handle(self, *args, **options):
+        with benchmark_database(options['current_db']):
+            if not options['no_seed']:
+                seed_dataset(
+                    titles=options['page_size'],
+                    reviews=options['page_size'] * 2,
+                    comments=0,
+                    seed=options['seed'],
+                )
+            with override_settings(DEBUG=False):
+                report = self.run(options)
+        result = json.dumps(report, ensure_ascii=False, indent=2)
+        if options['output']:
+            with open(options['output'], 'w', encoding='utf-8') as file:
+                file.write(result + '\n')
+        else:
+            self.stdout.write(result)
+
+    def serialize(self, repeat, page_size):
+        """Обычный сериалайзер против сборки из values(), с запросами."""
+        queryset = Title.objects.select_related(
+            'category'
+        ).prefetch_related('genre').order_by('pk')
+        values_serializer = get_values_serializer(
+            Title, TitleSerializer().fields
+        )
+        results = {}
+        outputs = []
+        for name, function in (
+            ('serialize', lambda: TitleSerializer(
+                queryset[:page_size], many=True
+            ).data),
+            ('serialize_values', lambda: values_serializer.to_representation(
+                list(values_serializer.get_values(queryset[:page_size]))
+            )),
+        ):
+            with CaptureQueriesContext(connection) as queries:
+                timings, data = measure(function, repeat)
+            results[name] = dict(
+                summarize(timings), queries=len(queries) // repeat
+            )
+            outputs.append(JSONRenderer().render(data))
+        if outputs[0] != outputs[1]:
+            self.stderr.write('serialize_values: вывод отличается')
+        return results, data
+
+    def run(self, options):
+        repeat = options['repeat']
+        # Сериализация на порядок медленнее рендеринга: хватает меньшего
+        # числа повторов.
+        results, data = self.serialize(
+            max(repeat // 10, 1), options['page_size']
+        )
+
+        renderers = {'json': JSONRenderer()}
+        if orjson is not None:
+            renderers['orjson'] = FastJSONRenderer()
+        body = None
+        for name, renderer in renderers.items():
+            timings, rendered = measure(
+                lambda: renderer.render(data, 'application/json'), repeat
+            )
+            if body is not None and rendered != body:
+                self.stderr.write(f'{name}: вывод отличается от json')
+            body = rendered
+            results[f'render_{name}'] = dict(
+                summarize(timings),
+                bytes=len(rendered),
+                mb_per_s=round(len(rendered) / sum(timings) * repeat / 1e6, 1)
+            )
+
+        for name, compress in CODECS.items():
+            timings, compressed = measure(lambda: compress(body), repeat)
+            results[f'compress_{name}'] = dict(
+                summarize(timings),
+                bytes=len(compressed),
+                ratio=round(len(body) / len(compressed), 2),
+            )
+        return {
+            'meta': {
+                'titles': len(data),
+                'repeat': repeat,
+                'seed': options['seed'],
+                'orjson': orjson is not None,
+                'codecs': list(CODECS),
+            },
+            'results': results,
+        }
@@ -0,0 +1,54 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.core.management.base import BaseCommand
+
+from core.constants import EMAIL_OUTBOX_BATCH_SIZE, EMAIL_OUTBOX_POLL_INTERVAL
+from core.outbox import deliver_pending_in_thread
+
+
+class Command(BaseCommand):
+    help = 'Отправляет письма из очереди исходящих писем.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=1,
+            help=(
+                'Количество потоков отправки; больше одного имеет смысл '
+                'для PostgreSQL (SELECT ... FOR UPDATE SKIP LOCKED).'
+            )
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=EMAIL_OUTBOX_BATCH_SIZE,
+            help='Писем на одно SMTP-соединение.'
+        )
+        parser.add_argument(
+            '--interval',
+            type=float,
+            default=EMAIL_OUTBOX_POLL_INTERVAL,
+            help='Пауза между опросами очереди, сек.'
+        )
+        parser.add_argument(
+            '--once',
+            action='store_true',
+            help='Разобрать очередь один раз и завершиться.'
+        )
+
+    def handle(self, *args, **options):
+        workers = options['workers']
+        batch_size = options['batch_size']
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            while True:
+                sent = sum(executor.map(
+                    deliver_pending_in_thread,
+                    (batch_size,) * workers
+                ))
+                if sent:
+                    self.stdout.write(f'Отправлено писем: {sent}')
+                if options['once']:
+                    return
+                time.sleep(options['interval'])
@@ -0,0 +1,98 @@
+import threading
+from bisect import bisect_left
+
+from core.constants import (
+    REQUEST_STATS_DURATION_BUCKETS,
+    REQUEST_STATS_QUERY_BUCKETS
+)
+
+UNRESOLVED_VIEW_NAME = '<unresolved>'
+
+_lock = threading.Lock()
+_endpoints = {}
+
+
+class Histogram:
+    """
+    Гистограмма с фиксированными границами корзин.
+
+    Хранит только счётчики корзин, сумму и максимум, поэтому память
+    не растёт с числом запросов; перцентили оцениваются по верхней
+    границе корзины.
+    """
+
+    def __init__(self, bounds):
+        self.bounds = bounds
+        self.buckets = [0] * (len(bounds) + 1)
+        self.count = 0
+        self.total = 0
+        self.max = 0
+
+    def observe(self, value):
+        self.buckets[bisect_left(self.bounds, value)] += 1
+        self.count += 1
+        self.total += value
+        self.max = max(self.max, value)
+
+    def quantile(self, q):
+        if not self.count:
+            return None
+        rank = q * self.count
+        seen = 0
+        for bound, bucket in zip(self.bounds, self.buckets):
+            seen += bucket
+            if seen >= rank:
+                return bound
+        return self.max
+
+    def as_dict(self):
+        labels = [f'le_{bound}' for bound in self.bounds] + ['inf']
+        return {
+            'count': self.count,
+            'avg': round(self.total / self.count, 3) if self.count else None,
+            'max': round(self.max, 3),
+            'p50': self.quantile(0.5),
+            'p95': self.quantile(0.95),
+            'p99': self.quantile(0.99),
+            'buckets': dict(zip(labels, self.buckets)),
+        }
+
+
+class EndpointStats:
+    """Время ответа, время в БД и число запросов одного эндпоинта."""
+
+    def __init__(self):
+        self.duration = Histogram(REQUEST_STATS_DURATION_BUCKETS)
+        self.db_duration = Histogram(REQUEST_STATS_DURATION_BUCKETS)
+        self.queries = Histogram(REQUEST_STATS_QUERY_BUCKETS)
+
+    def as_dict(self):
+        return {
+            'duration_ms': self.duration.as_dict(),
+            'db_duration_ms': self.db_duration.as_dict(),
+            'queries': self.queries.as_dict(),
+        }
+
+
+def record_request(view_name, duration, db_duration, queries):
+    """Учитывает запрос; длительности передаются в миллисекундах."""
+    with _lock:
+        stats = _endpoints.get(view_name)
+        if stats is None:
+            stats = _endpoints[view_name] = EndpointStats()
+        stats.duration.observe(duration)
+        stats.db_duration.observe(db_duration)
+        stats.queries.observe(queries)
+
+
+def get_request_stats():
+    with _lock:
+        return {
+            view_name: stats.as_dict()
+            for view_name, stats in sorted(_endpoints.items())
+        }
+
+
+def reset_request_stats():
+    with _lock:
+        _endpoints.clear()
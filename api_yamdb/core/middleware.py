@@ -0,0 +1,140 @@
+import re
+from contextlib import ExitStack, contextmanager
+from time import perf_counter
+
+from django.db import connections
+from django.utils.cache import patch_vary_headers
+from django.utils.text import compress_sequence
+
+from core.compression import CODECS, choose_encoding
+from core.constants import COMPRESSION_MIN_SIZE
+from core.metrics import UNRESOLVED_VIEW_NAME, record_request
+
+
+class QueryTimer:
+    """Обёртка `execute_wrapper`: считает запросы к БД и время на них."""
+
+    def __init__(self):
+        self.count = 0
+        self.duration = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        start = perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.duration += perf_counter() - start
+            self.count += 1
+
+
+class RequestStatsMiddleware:
+    """
+    Замеряет время ответа, число запросов к БД и время на них.
+
+    Результат копится по имени маршрута (`api:api:titles-list`) в
+    `core.metrics` и отдаётся клиенту в заголовке `Server-Timing`.
+    Потоковые ответы (выгрузки) учитываются, когда тело отдано целиком,
+    и без заголовка: к отправке заголовков замер ещё не закончен.
+    Статистика хранится в памяти процесса: у каждого воркера своя.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    @staticmethod
+    @contextmanager
+    def count_queries(timer):
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(timer))
+            yield
+
+    def __call__(self, request):
+        timer = QueryTimer()
+        start = perf_counter()
+        with self.count_queries(timer):
+            response = self.get_response(request)
+        if response.streaming:
+            response.streaming_content = self.stream(
+                request, response.streaming_content, timer, start
+            )
+            return response
+        duration, db_duration = self.record(request, timer, start)
+        response['Server-Timing'] = (
+            f'db;dur={db_duration:.1f};desc="{timer.count} queries", '
+            f'total;dur={duration:.1f}'
+        )
+        return response
+
+    def stream(self, request, content, timer, start):
+        """Отдаёт тело, считая запросы, пока оно генерируется."""
+        content = iter(content)
+        try:
+            while True:
+                with self.count_queries(timer):
+                    chunk = next(content, None)
+                if chunk is None:
+                    return
+                yield chunk
+        finally:
+            self.record(request, timer, start)
+
+    @staticmethod
+    def record(request, timer, start):
+        duration = (perf_counter() - start) * 1000
+        db_duration = timer.duration * 1000
+        match = request.resolver_match
+        record_request(
+            match.view_name if match else UNRESOLVED_VIEW_NAME,
+            duration,
+            db_duration,
+            timer.count
+        )
+        return duration, db_duration
+
+
+class CompressionMiddleware:
+    """
+    Сжимает ответы кодировкой, выбранной по Accept-Encoding.
+
+    Поддерживаются zstd и br (если установлены zstandard и brotli) и
+    gzip. Ответы короче COMPRESSION_MIN_SIZE байт не сжимаются: выигрыш
+    меньше накладных расходов. Потоковые ответы сжимаются только gzip.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        response = self.get_response(request)
+        if response.has_header('Content-Encoding'):
+            return response
+        if not response.streaming and (
+            len(response.content) < COMPRESSION_MIN_SIZE
+        ):
+            return response
+        patch_vary_headers(response, ('Accept-Encoding',))
+        accept_encoding = request.META.get('HTTP_ACCEPT_ENCODING', '')
+        if response.streaming:
+            if choose_encoding(accept_encoding, ('gzip',)) is None:
+                return response
+            response.streaming_content = compress_sequence(
+                response.streaming_content
+            )
+            del response['Content-Length']
+            encoding = 'gzip'
+        else:
+            encoding = choose_encoding(accept_encoding)
+            if encoding is None:
+                return response
+            compressed = CODECS[encoding](response.content)
+            if len(compressed) >= len(response.content):
+                return response
+            response.content = compressed
+            response['Content-Length'] = str(len(compressed))
+        etag = response.get('ETag')
+        if etag and etag.startswith('"'):
+            # Сжатое тело побайтно другое: сильный ETag стал бы неверным.
+            response['ETag'] = re.sub('^"', 'W/"', etag)
+        response['Content-Encoding'] = encoding
+        return response
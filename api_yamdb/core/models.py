@@ -0,0 +1,62 @@
+from django.db import models
+from django.utils import timezone
+
+from .constants import (
+    MAX_EMAIL_LENGTH,
+    MAX_EMAIL_STATUS_LENGTH,
+    MAX_EMAIL_SUBJECT_LENGTH
+)
+
+
+class OutgoingEmail(models.Model):
+    """Модель 'Исходящие письма' — очередь на отправку."""
+
+    class Status(models.TextChoices):
+        PENDING = 'pending'
+        SENT = 'sent'
+        FAILED = 'failed'
+
+    subject = models.CharField(
+        'Тема',
+        max_length=MAX_EMAIL_SUBJECT_LENGTH
+    )
+    body = models.TextField('Текст')
+    from_email = models.EmailField(
+        'Отправитель',
+        max_length=MAX_EMAIL_LENGTH
+    )
+    recipient = models.EmailField(
+        'Получатель',
+        max_length=MAX_EMAIL_LENGTH
+    )
+    status = models.CharField(
+        'Статус',
+        max_length=MAX_EMAIL_STATUS_LENGTH,
+        choices=Status.choices,
+        default=Status.PENDING
+    )
+    attempts = models.PositiveSmallIntegerField(
+        'Попыток отправки',
+        default=0
+    )
+    next_attempt_at = models.DateTimeField(
+        'Следующая попытка',
+        default=timezone.now
+    )
+    last_error = models.TextField('Последняя ошибка', blank=True)
+    created_at = models.DateTimeField('Дата создания', auto_now_add=True)
+    sent_at = models.DateTimeField('Дата отправки', null=True, blank=True)
+
+    class Meta:
+        verbose_name = 'Исходящее письмо'
+        verbose_name_plural = 'Исходящие письма'
+        ordering = ('id',)
+        indexes = [
+            models.Index(
+                fields=('status', 'next_attempt_at'),
+                name='outgoing_email_due_idx'
+            ),
+        ]
+
+    def __str__(self):
+        return f'{self.recipient}: {self.subject}'
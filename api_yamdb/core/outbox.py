@@ -0,0 +1,148 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.mail import EmailMessage, get_connection
+from django.db import connections, transaction
+from django.utils import timezone
+
+from .constants import (
+    EMAIL_OUTBOX_BATCH_SIZE,
+    EMAIL_OUTBOX_LEASE,
+    EMAIL_OUTBOX_MAX_ATTEMPTS,
+    EMAIL_OUTBOX_RETRY_DELAY
+)
+from .models import OutgoingEmail
+
+
+def enqueue_email(subject, message, from_email, recipient_list):
+    """
+    Ставит письма в очередь вместо отправки по SMTP в рамках запроса.
+
+    Письма рассылает команда `send_emails`; при EMAIL_OUTBOX_EAGER
+    очередь разбирается сразу после коммита транзакции.
+    """
+    emails = OutgoingEmail.objects.bulk_create(
+        OutgoingEmail(
+            subject=subject,
+            body=message,
+            from_email=from_email,
+            recipient=recipient,
+        )
+        for recipient in recipient_list
+    )
+    if getattr(settings, 'EMAIL_OUTBOX_EAGER', False):
+        transaction.on_commit(deliver_pending)
+    return emails
+
+
+def claim_batch(batch_size=EMAIL_OUTBOX_BATCH_SIZE):
+    """
+    Забирает пачку писем, которые пора отправить.
+
+    Вместо отдельного статуса письма «арендуются»: следующая попытка
+    переносится на EMAIL_OUTBOX_LEASE секунд вперёд, так что параллельные
+    воркеры их не берут, а письма упавшего воркера вернутся в очередь.
+    """
+    now = timezone.now()
+    lease_until = now + timedelta(seconds=EMAIL_OUTBOX_LEASE)
+    due = OutgoingEmail.objects.filter(
+        status=OutgoingEmail.Status.PENDING,
+        next_attempt_at__lte=now
+    ).order_by('next_attempt_at')
+    with transaction.atomic():
+        if connections[due.db].features.has_select_for_update_skip_locked:
+            due_ids = list(due.select_for_update(
+                skip_locked=True
+            ).values_list('pk', flat=True)[:batch_size])
+            if not due_ids:
+                return []
+            OutgoingEmail.objects.filter(
+                pk__in=due_ids
+            ).update(next_attempt_at=lease_until)
+            return list(OutgoingEmail.objects.filter(pk__in=due_ids))
+        # Без SKIP LOCKED (SQLite) аренда — один UPDATE с подзапросом.
+        # Чтение перед записью в транзакции SQLite не ждёт блокировку
+        # записи (busy_timeout), а сразу падает с «database is locked»,
+        # если параллельный воркер успел что-то записать.
+        if not OutgoingEmail.objects.filter(
+            pk__in=due.values('pk')[:batch_size]
+        ).update(next_attempt_at=lease_until):
+            return []
+        return list(OutgoingEmail.objects.filter(
+            status=OutgoingEmail.Status.PENDING,
+            next_attempt_at=lease_until
+        ))
+
+
+def retry_delay(attempts):
+    """Экспоненциальная задержка перед следующей попыткой."""
+    return timedelta(seconds=EMAIL_OUTBOX_RETRY_DELAY * 2 ** (attempts - 1))
+
+
+def send_batch(emails):
+    """
+    Отправляет пачку писем через одно SMTP-соединение.
+
+    Возвращает количество отправленных писем.
+    """
+    connection = get_connection(fail_silently=False)
+    try:
+        connection.open()
+    except Exception as error:
+        for email in emails:
+            mark_failed(email, error)
+        return 0
+    sent = []
+    try:
+        for email in emails:
+            message = EmailMessage(
+                subject=email.subject,
+                body=email.body,
+                from_email=email.from_email,
+                to=(email.recipient,),
+                connection=connection,
+            )
+            try:
+                connection.send_messages((message,))
+            except Exception as error:
+                mark_failed(email, error)
+            else:
+                sent.append(email.pk)
+    finally:
+        connection.close()
+    OutgoingEmail.objects.filter(pk__in=sent).update(
+        status=OutgoingEmail.Status.SENT,
+        sent_at=timezone.now(),
+        last_error=''
+    )
+    return len(sent)
+
+
+def mark_failed(email, error):
+    email.attempts += 1
+    email.last_error = repr(error)
+    if email.attempts >= EMAIL_OUTBOX_MAX_ATTEMPTS:
+        email.status = OutgoingEmail.Status.FAILED
+    else:
+        email.next_attempt_at = timezone.now() + retry_delay(email.attempts)
+    email.save(
+        update_fields=('attempts', 'last_error', 'status', 'next_attempt_at')
+    )
+
+
+def deliver_pending(batch_size=EMAIL_OUTBOX_BATCH_SIZE):
+    """Разбирает очередь пачками, пока есть письма к отправке."""
+    sent = 0
+    while True:
+        emails = claim_batch(batch_size)
+        if not emails:
+            return sent
+        sent += send_batch(emails)
+
+
+def deliver_pending_in_thread(batch_size=EMAIL_OUTBOX_BATCH_SIZE):
+    """Обёртка для пула потоков: закрывает соединения потока с БД."""
+    try:
+        return deliver_pending(batch_size)
+    finally:
+        connections.close_all()
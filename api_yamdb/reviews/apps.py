@@ -6,3 +6,6 @@ class ReviewsConfig(AppConfig):
     name = 'reviews'
     verbose_name = 'Обзор'
     verbose_name_plural = 'Обзоры'
+
+    def ready(self):
+        from . import signals  # noqa: F401
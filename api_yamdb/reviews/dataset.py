@@ -0,0 +1,246 @@
+import csv
+import random
+from collections import Counter
+from datetime import timedelta
+from itertools import accumulate, islice
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.db import transaction
+from django.utils.dateparse import parse_datetime
+
+from core.constants import (
+    IMPORT_BATCH_SIZE,
+    SYNTHETIC_PREFIX,
+    SYNTHETIC_ZIPF_EXPONENT
+)
+from core.db import bulk_insert
+from .models import Category, Comment, Genre, Review, Title
+from .signals import catalog_loaded
+
+User = get_user_model()
+TitleGenre = Title.genre.through
+
+DEFAULT_DATA_PATH = settings.BASE_DIR / 'static' / 'data'
+
+
+def read_csv(path, name):
+    with open(path / f'{name}.csv', encoding='utf-8', newline='') as file:
+        return list(csv.DictReader(file))
+
+
+class DatasetShape:
+    """
+    Форма данных, снятая с CSV-файлов static/data.
+
+    Распределения хранятся как пары «значения — накопленные веса» для
+    random.choices, средние — как множители для масштабирования.
+    """
+
+    def __init__(self, path=DEFAULT_DATA_PATH):
+        categories = read_csv(path, 'category')
+        genres = read_csv(path, 'genre')
+        titles = read_csv(path, 'titles')
+        title_genres = read_csv(path, 'genre_title')
+        reviews = read_csv(path, 'review')
+        comments = read_csv(path, 'comments')
+
+        self.categories = [(row['name'], row['slug']) for row in categories]
+        self.genres = [(row['name'], row['slug']) for row in genres]
+        category_slugs = {row['id']: row['slug'] for row in categories}
+        self.category_weights = self.weights(Counter(
+            category_slugs[row['category']] for row in titles
+            if row['category'] in category_slugs
+        ), [slug for _, slug in self.categories])
+
+        self.title_names = [row['name'] for row in titles]
+        years = [int(row['year']) for row in titles]
+        self.years = (min(years), max(years))
+        genres_per_title = Counter(row['title_id'] for row in title_genres)
+        self.genres_per_title = self.weights(Counter(
+            genres_per_title[row['id']] for row in titles
+        ))
+
+        self.reviews_per_title = len(reviews) / len(titles)
+        self.comments_per_review = len(comments) / len(reviews)
+        self.scores = self.weights(Counter(
+            int(row['score']) for row in reviews
+        ))
+        self.review_texts = [row['text'] for row in reviews]
+        self.comment_texts = [row['text'] for row in comments]
+        dates = [
+            parse_datetime(row['pub_date']) for row in reviews + comments
+        ]
+        self.first_date = min(dates)
+        self.date_span = (max(dates) - self.first_date).total_seconds()
+
+    @staticmethod
+    def weights(counter, values=None):
+        values = values or sorted(counter)
+        return values, list(accumulate(counter[value] for value in values))
+
+    @staticmethod
+    def choose(rng, distribution):
+        values, cum_weights = distribution
+        return rng.choices(values, cum_weights=cum_weights)[0]
+
+    def random_date(self, rng):
+        return self.first_date + timedelta(
+            seconds=rng.random() * self.date_span
+        )
+
+
+def zipf_allocation(total, buckets, exponent):
+    """
+    Делит `total` объектов на `buckets` корзин по закону Ципфа.
+
+    Доля корзины ранга r пропорциональна 1 / r ** exponent; при нулевом
+    показателе распределение равномерное. Возвращает количества по
+    убыванию, их сумма равна `total`.
+    """
+    if not buckets:
+        return []
+    weights = [1 / rank ** exponent for rank in range(1, buckets + 1)]
+    scale = total / sum(weights)
+    counts = [int(weight * scale) for weight in weights]
+    for rank in range(total - sum(counts)):
+        counts[rank % buckets] += 1
+    return counts
+
+
+def generate_reviews(rng, shape, review_counts, user_ids):
+    """Отзывы произведений; авторы идут подряд со случайного места."""
+    for title_id, count in review_counts:
+        first_author = rng.randrange(len(user_ids))
+        for number in range(count):
+            yield Review(
+                title_id=title_id,
+                author_id=user_ids[(first_author + number) % len(user_ids)],
+                text=rng.choice(shape.review_texts),
+                score=shape.choose(rng, shape.scores),
+                pub_date=shape.random_date(rng),
+            )
+
+
+def generate_comments(rng, shape, comment_counts, user_ids):
+    for review_id, count in comment_counts:
+        for _ in range(count):
+            date = shape.random_date(rng)
+            yield Comment(
+                review_id=review_id,
+                author_id=rng.choice(user_ids),
+                text=rng.choice(shape.comment_texts),
+                pub_date=date,
+                created_at=date,
+            )
+
+
+def bulk_insert_or_reuse(model, objects, batch_size, **lookup):
+    """
+    Вставляет объекты с уникальными полями и возвращает id всех строк
+    по `lookup`: уже существующие строки пропускаются и переиспользуются.
+    """
+    objects = iter(objects)
+    while True:
+        batch = list(islice(objects, batch_size))
+        if not batch:
+            break
+        model.objects.bulk_create(
+            batch, batch_size=batch_size, ignore_conflicts=True
+        )
+    return list(
+        model.objects.filter(**lookup)
+        .order_by('pk').values_list('pk', flat=True)
+    )
+
+
+def seed_dataset(titles, reviews=None, comments=None, users=0, seed=0,
+                 zipf_exponent=SYNTHETIC_ZIPF_EXPONENT, shape=None,
+                 batch_size=IMPORT_BATCH_SIZE):
+    """
+    Заполняет базу синтетическими данными заданного объёма.
+
+    Распределения (жанров на произведение, оценок, тексты, даты) берутся
+    из `shape`; если число отзывов или комментариев не задано, оно
+    масштабируется по средним из CSV. Отзывы по произведениям и
+    комментарии по отзывам распределяются по Ципфу: несколько «горячих»
+    произведений собирают большую часть отзывов. Одинаковый `seed` даёт
+    одинаковые данные. Пользователей создаётся не меньше, чем отзывов у
+    самого популярного произведения: пара «автор — произведение»
+    уникальна.
+    """
+    shape = shape or DatasetShape()
+    rng = random.Random(seed)
+    if reviews is None:
+        reviews = round(titles * shape.reviews_per_title)
+    if comments is None:
+        comments = round(reviews * shape.comments_per_review)
+    review_counts = zipf_allocation(reviews, titles, zipf_exponent)
+    users = max(users, review_counts[0] if review_counts else 0, 1)
+    prefix = f'{SYNTHETIC_PREFIX}{seed}_'
+    password = make_password(None)
+    with transaction.atomic():
+        user_ids = bulk_insert_or_reuse(User, (
+            User(
+                username=f'{prefix}{number}',
+                email=f'{prefix}{number}@yamdb.fake',
+                password=password,
+            )
+            for number in range(users)
+        ), batch_size, username__startswith=prefix)
+        category_ids = dict(zip(
+            [slug for _, slug in shape.categories],
+            bulk_insert_or_reuse(Category, (
+                Category(name=name, slug=f'{prefix}{slug}')
+                for name, slug in shape.categories
+            ), batch_size, slug__startswith=prefix)
+        ))
+        genre_ids = bulk_insert_or_reuse(Genre, (
+            Genre(name=name, slug=f'{prefix}{slug}')
+            for name, slug in shape.genres
+        ), batch_size, slug__startswith=prefix)
+        title_ids = bulk_insert(Title, (
+            Title(
+                name=f'{rng.choice(shape.title_names)} {number}',
+                year=rng.randint(*shape.years),
+                category_id=category_ids[
+                    shape.choose(rng, shape.category_weights)
+                ],
+            )
+            for number in range(titles)
+        ), batch_size)
+        bulk_insert(TitleGenre, (
+            TitleGenre(title_id=title_id, genre_id=genre_id)
+            for title_id in title_ids
+            for genre_id in rng.sample(
+                genre_ids,
+                min(shape.choose(rng, shape.genres_per_title), len(genre_ids))
+            )
+        ), batch_size)
+
+        hot_titles = title_ids[:]
+        rng.shuffle(hot_titles)
+        review_ids = bulk_insert(Review, generate_reviews(
+            rng, shape, zip(hot_titles, review_counts), user_ids
+        ), batch_size)
+
+        rng.shuffle(review_ids)
+        comment_counts = zipf_allocation(
+            comments, len(review_ids), zipf_exponent
+        )
+        bulk_insert(Comment, generate_comments(
+            rng, shape, zip(review_ids, comment_counts), user_ids
+        ), batch_size)
+        if title_ids:
+            Title.objects.filter(
+                pk__gte=title_ids[0]
+            ).recalculate_rating()
+        catalog_loaded.send(sender=Title)
+    return {
+        'users': users,
+        'titles': titles,
+        'reviews': reviews,
+        'comments': comments if review_ids else 0,
+        'hottest_title_reviews': review_counts[0] if review_counts else 0,
+    }
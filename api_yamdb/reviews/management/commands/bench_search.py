@@ -0,0 +1,140 @@
+import json
+import random
+from time import perf_counter
+
+from django.core.management.base import BaseCommand
+from django.db import connection
+
+from core.benchmark import benchmark_database, summarize
+from core.constants import (
+    BENCH_SEARCH_PREFIX,
+    BENCH_SEARCH_QUERIES,
+    BENCH_TARGETS,
+    SEARCH_MAX_RESULTS
+)
+from reviews.dataset import seed_dataset
+from reviews.models import Review, Title
+from reviews.search import LikeSearchBackend, get_search_backend, search_tokens
+
+
+class Command(BaseCommand):
+    help = (
+        'Сравнивает задержку полнотекстового поиска и поиска подстрокой '
+        '(LIKE) на синтетических данных.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--titles',
+            type=int,
+            default=1000,
+            help='Количество произведений в синтетических данных.'
+        )
+        parser.add_argument(
+            '--reviews',
+            type=int,
+            default=20000,
+            help='Количество отзывов.'
+        )
+        parser.add_argument(
+            '--queries',
+            type=int,
+            default=BENCH_SEARCH_QUERIES,
+            help='Количество разных поисковых запросов.'
+        )
+        parser.add_argument(
+            '--repeat',
+            type=int,
+            default=3,
+            help='Сколько раз выполнить каждый запрос.'
+        )
+        parser.add_argument(
+            '--seed',
+            type=int,
+            default=0,
+            help='Зерно генератора данных и запросов.'
+        )
+        parser.add_argument(
+            '--current-db',
+            action='store_true',
+            help='Работать в текущей базе вместо временной тестовой.'
+        )
+        parser.add_argument(
+            '--no-seed',
+            action='store_true',
+            help='Не заполнять базу, использовать уже лежащие в ней данные.'
+        )
+        parser.add_argument(
+            '--output',
+            help='Файл для результатов в JSON; по умолчанию stdout.'
+        )
+
+    def handle(self, *args, **options):
+        with benchmark_database(options['current_db']):
+            if not options['no_seed']:
+                seed_dataset(
+                    titles=options['titles'],
+                    reviews=options['reviews'],
+                    comments=0,
+                    seed=options['seed'],
+                )
+            report = self.run(options)
+        result = json.dumps(report, ensure_ascii=False, indent=2)
+        if options['output']:
+            with open(options['output'], 'w', encoding='utf-8') as file:
+                file.write(result + '\n')
+        else:
+            self.stdout.write(result)
+
+    def get_queries(self, rng, count):
+        """Целые слова и их префиксы из названий и текстов отзывов."""
+        texts = list(
+            Title.objects.order_by('pk')
+            .values_list('name', flat=True)[:BENCH_TARGETS]
+        ) + list(
+            Review.objects.order_by('pk')
+            .values_list('text', flat=True)[:BENCH_TARGETS]
+        )
+        words = sorted({
+            word for text in texts for word in search_tokens(text)
+            if len(word) > BENCH_SEARCH_PREFIX
+        })
+        words = rng.sample(words, min(count, len(words)))
+        return [
+            [word[:BENCH_SEARCH_PREFIX] if number % 2 else word]
+            for number, word in enumerate(words)
+        ]
+
+    def run(self, options):
+        rng = random.Random(options['seed'])
+        queries = self.get_queries(rng, options['queries'])
+        backends = {
+            connection.vendor: get_search_backend(),
+            'like': LikeSearchBackend(),
+        }
+        results = {}
+        for name, backend in backends.items():
+            for tokens in queries:
+                backend.search(tokens, SEARCH_MAX_RESULTS)
+            timings = []
+            found = 0
+            for _ in range(options['repeat']):
+                for tokens in queries:
+                    started = perf_counter()
+                    found += len(backend.search(tokens, SEARCH_MAX_RESULTS))
+                    timings.append(perf_counter() - started)
+            results[name] = summarize(timings) if timings else {}
+            results[name]['avg_results'] = round(
+                found / max(len(timings), 1), 1
+            )
+        return {
+            'meta': {
+                'database': connection.vendor,
+                'titles': Title.objects.count(),
+                'reviews': Review.objects.count(),
+                'queries': len(queries),
+                'repeat': options['repeat'],
+                'seed': options['seed'],
+            },
+            'results': results,
+        }
@@ -0,0 +1,105 @@
+import time
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+
+from core.constants import IMPORT_BATCH_SIZE, SYNTHETIC_ZIPF_EXPONENT
+from reviews.dataset import DEFAULT_DATA_PATH, DatasetShape, seed_dataset
+
+
+class Command(BaseCommand):
+    help = (
+        'Генерирует синтетические данные любого объёма по распределениям '
+        'из CSV-файлов (static/data) с «горячими» произведениями по Ципфу.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--titles',
+            type=int,
+            default=1000,
+            help='Количество произведений.'
+        )
+        parser.add_argument(
+            '--reviews',
+            type=int,
+            help=(
+                'Количество отзывов; по умолчанию среднее число отзывов '
+                'на произведение из CSV, умноженное на --titles.'
+            )
+        )
+        parser.add_argument(
+            '--comments',
+            type=int,
+            help=(
+                'Количество комментариев; по умолчанию по среднему числу '
+                'комментариев на отзыв из CSV.'
+            )
+        )
+        parser.add_argument(
+            '--users',
+            type=int,
+            default=0,
+            help=(
+                'Количество пользователей (не меньше числа отзывов у самого '
+                'популярного произведения).'
+            )
+        )
+        parser.add_argument(
+            '--zipf',
+            type=float,
+            default=SYNTHETIC_ZIPF_EXPONENT,
+            help=(
+                'Показатель распределения Ципфа для отзывов и комментариев; '
+                '0 — равномерно.'
+            )
+        )
+        parser.add_argument(
+            '--seed',
+            type=int,
+            default=0,
+            help='Зерно генератора: одинаковое зерно даёт одинаковые данные.'
+        )
+        parser.add_argument(
+            '--path',
+            default=DEFAULT_DATA_PATH,
+            help='Каталог с CSV-файлами, по которым снимаются распределения.'
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=IMPORT_BATCH_SIZE,
+            help='Строк в одном INSERT.'
+        )
+
+    def handle(self, *args, **options):
+        if options['titles'] < 1:
+            raise CommandError('--titles должно быть больше нуля.')
+        if options['zipf'] < 0:
+            raise CommandError('--zipf не может быть отрицательным.')
+        try:
+            shape = DatasetShape(Path(options['path']))
+        except (OSError, KeyError, ValueError, ZeroDivisionError) as error:
+            raise CommandError(f'Не удалось прочитать CSV: {error}')
+
+        started = time.monotonic()
+        counts = seed_dataset(
+            titles=options['titles'],
+            reviews=options['reviews'],
+            comments=options['comments'],
+            users=options['users'],
+            seed=options['seed'],
+            zipf_exponent=options['zipf'],
+            shape=shape,
+            batch_size=options['batch_size'],
+        )
+        self.stdout.write(
+            f'Пользователей: {counts["users"]}, '
+            f'произведений: {counts["titles"]}, '
+            f'отзывов: {counts["reviews"]} '
+            f'(у самого популярного: {counts["hottest_title_reviews"]}), '
+            f'комментариев: {counts["comments"]}'
+        )
+        self.stdout.write(self.style.SUCCESS(
+            f'Данные созданы за {time.monotonic() - started:.1f} с'
+        ))
@@ -0,0 +1,32 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from reviews.models import Title, TitleStats
+from reviews.signals import ratings_recalculated
+
+
+class Command(BaseCommand):
+    help = (
+        'Пересчитывает сохранённый рейтинг и статистику отзывов '
+        'произведений.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'title_ids',
+            nargs='*',
+            type=int,
+            help='id произведений; по умолчанию пересчитываются все.'
+        )
+
+    def handle(self, *args, **options):
+        titles = Title.objects.all()
+        if options['title_ids']:
+            titles = titles.filter(pk__in=options['title_ids'])
+        with transaction.atomic():
+            updated = titles.recalculate_rating()
+            TitleStats.objects.recalculate(titles)
+        ratings_recalculated.send(sender=Title)
+        self.stdout.write(
+            self.style.SUCCESS(f'Пересчитан рейтинг произведений: {updated}')
+        )
@@ -0,0 +1,53 @@
+# Generated by Django 3.2 on 2026-10-18 02:04
+
+from django.db import migrations, models
+from django.db.models import Count, FloatField, OuterRef, Subquery, Sum
+from django.db.models.functions import Cast, Coalesce, NullIf
+
+
+def fill_title_rating(apps, schema_editor):
+    Review = apps.get_model('reviews', 'Review')
+    Title = apps.get_model('reviews', 'Title')
+    scores = Review.objects.filter(
+        title=OuterRef('pk'),
+        score__isnull=False
+    ).order_by().values('title')
+    rating_sum = Coalesce(
+        Subquery(scores.annotate(total=Sum('score')).values('total')),
+        0
+    )
+    rating_count = Coalesce(
+        Subquery(scores.annotate(total=Count('id')).values('total')),
+        0
+    )
+    Title.objects.update(
+        rating_sum=rating_sum,
+        rating_count=rating_count,
+        rating=Cast(rating_sum, FloatField()) / NullIf(rating_count, 0),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0002_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='title',
+            name='rating',
+            field=models.FloatField(db_index=True, editable=False, null=True, verbose_name='Рейтинг'),
+        ),
+        migrations.AddField(
+            model_name='title',
+            name='rating_count',
+            field=models.IntegerField(default=0, editable=False, verbose_name='Количество оценок'),
+        ),
+        migrations.AddField(
+            model_name='title',
+            name='rating_sum',
+            field=models.IntegerField(default=0, editable=False, verbose_name='Сумма оценок'),
+        ),
+        migrations.RunPython(fill_title_rating, migrations.RunPython.noop),
+    ]
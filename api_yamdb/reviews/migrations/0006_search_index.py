@@ -0,0 +1,63 @@
+from django.db import migrations
+
+SQLITE_TOKENIZER = "tokenize='unicode61 remove_diacritics 2', prefix='2 3 4'"
+
+SQLITE_CREATE = (
+    'CREATE VIRTUAL TABLE reviews_title_fts USING fts5('
+    f'name, description, {SQLITE_TOKENIZER})',
+    'CREATE VIRTUAL TABLE reviews_review_fts USING fts5('
+    f'text, title_id UNINDEXED, {SQLITE_TOKENIZER})',
+    'INSERT INTO reviews_title_fts (rowid, name, description) '
+    'SELECT id, name, description FROM reviews_title',
+    'INSERT INTO reviews_review_fts (rowid, text, title_id) '
+    'SELECT id, text, title_id FROM reviews_review',
+)
+SQLITE_DROP = (
+    'DROP TABLE IF EXISTS reviews_title_fts',
+    'DROP TABLE IF EXISTS reviews_review_fts',
+)
+
+# Выражения совпадают с теми, что строит SearchVector в reviews.search.
+POSTGRES_CREATE = (
+    'CREATE INDEX title_search_idx ON reviews_title USING gin (('
+    "setweight(to_tsvector('russian'::regconfig, "
+    "COALESCE((name)::text, '')), 'A') || "
+    "setweight(to_tsvector('russian'::regconfig, "
+    "COALESCE((description)::text, '')), 'B')))",
+    'CREATE INDEX review_search_idx ON reviews_review USING gin ('
+    "to_tsvector('russian'::regconfig, COALESCE((text)::text, '')))",
+)
+POSTGRES_DROP = (
+    'DROP INDEX IF EXISTS title_search_idx',
+    'DROP INDEX IF EXISTS review_search_idx',
+)
+
+STATEMENTS = {
+    'sqlite': (SQLITE_CREATE, SQLITE_DROP),
+    'postgresql': (POSTGRES_CREATE, POSTGRES_DROP),
+}
+
+
+def run(schema_editor, forward):
+    create, drop = STATEMENTS.get(schema_editor.connection.vendor, ((), ()))
+    for statement in create if forward else drop:
+        schema_editor.execute(statement)
+
+
+def create_search_index(apps, schema_editor):
+    run(schema_editor, forward=True)
+
+
+def drop_search_index(apps, schema_editor):
+    run(schema_editor, forward=False)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0005_composite_indexes'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
@@ -0,0 +1,77 @@
+# Generated by Django 3.2 on 2026-10-18 02:57
+
+from django.db import migrations, models
+from django.db.models import Count, Max, Q
+import django.db.models.deletion
+import django.utils.timezone
+
+SCORES = range(1, 11)
+
+
+def fill_title_stats(apps, schema_editor):
+    Comment = apps.get_model('reviews', 'Comment')
+    Review = apps.get_model('reviews', 'Review')
+    Title = apps.get_model('reviews', 'Title')
+    TitleStats = apps.get_model('reviews', 'TitleStats')
+    reviews = Review.objects.order_by().values('title').annotate(
+        reviews_count=Count('id'),
+        last_review_at=Max('pub_date'),
+        **{
+            f'score_{score}': Count('id', filter=Q(score=score))
+            for score in SCORES
+        }
+    )
+    review_stats = {row.pop('title'): row for row in reviews}
+    comment_counts = dict(
+        Comment.objects.order_by().values('review__title').annotate(
+            total=Count('id')
+        ).values_list('review__title', 'total')
+    )
+    TitleStats.objects.bulk_create(
+        (
+            TitleStats(
+                title_id=pk,
+                comments_count=comment_counts.get(pk, 0),
+                **review_stats.get(pk, {})
+            )
+            for pk in Title.objects.values_list('pk', flat=True)
+        ),
+        batch_size=5000
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0006_search_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TitleStats',
+            fields=[
+                ('title', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='stats', serialize=False, to='reviews.title', verbose_name='Произведение')),
+                ('score_1', models.PositiveIntegerField(default=0, verbose_name='Оценок 1')),
+                ('score_2', models.PositiveIntegerField(default=0, verbose_name='Оценок 2')),
+                ('score_3', models.PositiveIntegerField(default=0, verbose_name='Оценок 3')),
+                ('score_4', models.PositiveIntegerField(default=0, verbose_name='Оценок 4')),
+                ('score_5', models.PositiveIntegerField(default=0, verbose_name='Оценок 5')),
+                ('score_6', models.PositiveIntegerField(default=0, verbose_name='Оценок 6')),
+                ('score_7', models.PositiveIntegerField(default=0, verbose_name='Оценок 7')),
+                ('score_8', models.PositiveIntegerField(default=0, verbose_name='Оценок 8')),
+                ('score_9', models.PositiveIntegerField(default=0, verbose_name='Оценок 9')),
+                ('score_10', models.PositiveIntegerField(default=0, verbose_name='Оценок 10')),
+                ('reviews_count', models.PositiveIntegerField(default=0, verbose_name='Количество отзывов')),
+                ('comments_count', models.PositiveIntegerField(default=0, verbose_name='Количество комментариев')),
+                ('last_review_at', models.DateTimeField(null=True, verbose_name='Дата последнего отзыва')),
+                ('updated_at', models.DateTimeField(default=django.utils.timezone.now, verbose_name='Дата изменения')),
+            ],
+            options={
+                'verbose_name': 'Статистика произведения',
+                'verbose_name_plural': 'Статистика произведений',
+            },
+        ),
+        migrations.RunPython(
+            fill_title_stats, migrations.RunPython.noop
+        ),
+    ]
@@ -0,0 +1,29 @@
+# Generated by Django 3.2 on 2026-10-18 03:26
+
+from django.db import migrations, models
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0007_title_stats'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='comment',
+            name='created_at',
+            field=models.DateTimeField(default=django.utils.timezone.now, editable=False, verbose_name='Дата создания'),
+        ),
+        migrations.AlterField(
+            model_name='comment',
+            name='pub_date',
+            field=models.DateTimeField(db_index=True, default=django.utils.timezone.now, editable=False, verbose_name='Дата публикации'),
+        ),
+        migrations.AlterField(
+            model_name='review',
+            name='pub_date',
+            field=models.DateTimeField(db_index=True, default=django.utils.timezone.now, editable=False, verbose_name='Дата публикации'),
+        ),
+    ]
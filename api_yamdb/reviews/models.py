@@ -1,9 +1,27 @@
 from django.contrib.auth import get_user_model
 from django.core.validators import MaxValueValidator, MinValueValidator
 from django.db import models
+from django.db.models import (
+    Count,
+    FloatField,
+    Max,
+    OuterRef,
+    Q,
+    Subquery,
+    Sum
+)
+from django.db.models.functions import Cast, Coalesce, NullIf
+from django.utils import timezone
 
 from .validators import year_validator
-from core.constants import COMMENT_LENGHT, MAX_LENGTH_NAME, MAX_LENGTH_SLUG
+from core.constants import (
+    COMMENT_LENGHT,
+    IMPORT_BATCH_SIZE,
+    MAX_LENGTH_NAME,
+    MAX_LENGTH_SLUG,
+    MAX_SCORE,
+    MIN_SCORE
+)
 
 User = get_user_model()
 
@@ -56,6 +74,31 @@ class Genre(models.Model):
         ordering = ('name',)
 
 
+class TitleQuerySet(models.QuerySet):
+    def recalculate_rating(self):
+        """Пересчёт сохранённого рейтинга по отзывам одним запросом."""
+        scores = Review.objects.filter(
+            title=OuterRef('pk'),
+            score__isnull=False
+        ).order_by().values('title')
+        rating_sum = Coalesce(
+            Subquery(scores.annotate(total=Sum('score')).values('total')),
+            0
+        )
+        rating_count = Coalesce(
+            Subquery(scores.annotate(total=Count('id')).values('total')),
+            0
+        )
+        return self.update(
+            rating_sum=rating_sum,
+            rating_count=rating_count,
+            rating=(
+                Cast(rating_sum, FloatField())
+                / NullIf(rating_count, 0)
+            ),
+        )
+
+
 class Title(models.Model):
     """Модель 'Произведения'."""
 
@@ -89,11 +132,49 @@ class Title(models.Model):
         null=True,
         related_name='titles',
     )
+    rating_sum = models.IntegerField(
+        verbose_name='Сумма оценок',
+        default=0,
+        editable=False,
+    )
+    rating_count = models.IntegerField(
+        verbose_name='Количество оценок',
+        default=0,
+        editable=False,
+    )
+    rating = models.FloatField(
+        verbose_name='Рейтинг',
+        null=True,
+        editable=False,
+        db_index=True,
+    )
+    updated_at = models.DateTimeField(
+        'Дата изменения',
+        auto_now=True,
+        db_index=True
+    )
+    reviews_updated_at = models.DateTimeField(
+        'Дата изменения отзывов',
+        default=timezone.now,
+        editable=False
+    )
+
+    objects = TitleQuerySet.as_manager()
 
     class Meta:
         verbose_name = 'Произведение'
         verbose_name_plural = 'Произведения'
         ordering = ('name',)
+        indexes = [
+            models.Index(
+                fields=['year', 'rating'],
+                name='title_year_rating_idx'
+            ),
+            models.Index(
+                fields=['category', 'rating'],
+                name='title_category_rating_idx'
+            ),
+        ]
 
 
 class Review(models.Model):
@@ -128,14 +209,30 @@ class Review(models.Model):
     )
     pub_date = models.DateTimeField(
         'Дата публикации',
-        auto_now_add=True,
+        default=timezone.now,
+        editable=False,
         db_index=True
     )
+    updated_at = models.DateTimeField(
+        'Дата изменения',
+        auto_now=True
+    )
+    comments_updated_at = models.DateTimeField(
+        'Дата изменения комментариев',
+        default=timezone.now,
+        editable=False
+    )
 
     class Meta:
         verbose_name = 'Отзыв'
         verbose_name_plural = 'Отзывы'
         ordering = ('pub_date',)
+        indexes = [
+            models.Index(
+                fields=['title', 'pub_date', 'id'],
+                name='review_title_pub_date_idx'
+            ),
+        ]
         constraints = [
             models.UniqueConstraint(
                 fields=['title', 'author'],
@@ -146,6 +243,13 @@ class Review(models.Model):
     def __str__(self):
         return f'{self.title} - {self.author}'
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        if 'score' in field_names:
+            instance._loaded_score = instance.score
+        return instance
+
 
 class Comment(models.Model):
     """Модель 'Комментарии'."""
@@ -159,7 +263,8 @@ class Comment(models.Model):
     text = models.TextField('Текст комментария')
     created_at = models.DateTimeField(
         'Дата создания',
-        auto_now_add=True
+        default=timezone.now,
+        editable=False
     )
     author = models.ForeignKey(
         User,
@@ -169,14 +274,139 @@ class Comment(models.Model):
     )
     pub_date = models.DateTimeField(
         'Дата публикации',
-        auto_now_add=True,
+        default=timezone.now,
+        editable=False,
         db_index=True
     )
+    updated_at = models.DateTimeField(
+        'Дата изменения',
+        auto_now=True
+    )
 
     class Meta:
         verbose_name = 'Комментарий'
         verbose_name_plural = 'Комментарии'
         ordering = ('created_at',)
+        indexes = [
+            models.Index(
+                fields=['review', 'created_at', 'id'],
+                name='comment_review_created_idx'
+            ),
+        ]
 
         def __str__(self):
             return self.text[:COMMENT_LENGHT]
+
+
+SCORES = range(MIN_SCORE, MAX_SCORE + 1)
+
+
+def score_field_name(score):
+    return f'score_{score}'
+
+
+class TitleStatsQuerySet(models.QuerySet):
+    def recalculate(self, titles=None):
+        """
+        Пересчёт статистики произведений по отзывам и комментариям.
+
+        Строки статистики пересоздаются; нужен после загрузки данных
+        в обход save() и для исправления расхождений.
+        """
+        if titles is None:
+            titles = Title.objects.all()
+        title_ids = titles.order_by().values('pk')
+        reviews = Review.objects.filter(
+            title__in=title_ids
+        ).order_by().values('title').annotate(
+            reviews_count=Count('id'),
+            last_review_at=Max('pub_date'),
+            **{
+                score_field_name(score): Count('id', filter=Q(score=score))
+                for score in SCORES
+            }
+        )
+        review_stats = {row.pop('title'): row for row in reviews}
+        comment_counts = dict(
+            Comment.objects.filter(
+                review__title__in=title_ids
+            ).order_by().values('review__title').annotate(
+                total=Count('id')
+            ).values_list('review__title', 'total')
+        )
+        self.filter(title__in=title_ids).delete()
+        return len(self.bulk_create(
+            (
+                self.model(
+                    title_id=pk,
+                    comments_count=comment_counts.get(pk, 0),
+                    **review_stats.get(pk, {})
+                )
+                for pk in title_ids.values_list('pk', flat=True)
+            ),
+            batch_size=IMPORT_BATCH_SIZE
+        ))
+
+
+def score_count_field(score):
+    return models.PositiveIntegerField(
+        verbose_name=f'Оценок {score}',
+        default=0,
+    )
+
+
+class TitleStats(models.Model):
+    """
+    Статистика отзывов произведения.
+
+    Обновляется инкрементально при записи отзывов и комментариев
+    (reviews.signals), чтобы странице произведения не нужно было
+    выбирать все отзывы ради распределения оценок и счётчиков.
+    """
+
+    title = models.OneToOneField(
+        Title,
+        verbose_name='Произведение',
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='stats'
+    )
+    score_1 = score_count_field(1)
+    score_2 = score_count_field(2)
+    score_3 = score_count_field(3)
+    score_4 = score_count_field(4)
+    score_5 = score_count_field(5)
+    score_6 = score_count_field(6)
+    score_7 = score_count_field(7)
+    score_8 = score_count_field(8)
+    score_9 = score_count_field(9)
+    score_10 = score_count_field(10)
+    reviews_count = models.PositiveIntegerField(
+        verbose_name='Количество отзывов',
+        default=0,
+    )
+    comments_count = models.PositiveIntegerField(
+        verbose_name='Количество комментариев',
+        default=0,
+    )
+    last_review_at = models.DateTimeField(
+        verbose_name='Дата последнего отзыва',
+        null=True,
+    )
+    updated_at = models.DateTimeField(
+        verbose_name='Дата изменения',
+        default=timezone.now,
+    )
+
+    objects = TitleStatsQuerySet.as_manager()
+
+    class Meta:
+        verbose_name = 'Статистика произведения'
+        verbose_name_plural = 'Статистика произведений'
+
+    @property
+    def scores(self):
+        """Распределение оценок: оценка -> количество отзывов."""
+        return {
+            score: getattr(self, score_field_name(score)) for score in SCORES
+        }
@@ -0,0 +1,234 @@
+import re
+
+from django.db import connection
+from django.db.models import Exists, OuterRef, Q
+
+from core.constants import (
+    SEARCH_MAX_TOKENS,
+    SEARCH_POSTGRES_CONFIG,
+    SEARCH_REVIEW_WEIGHT
+)
+from .models import Review, Title
+
+TITLE_FTS_TABLE = 'reviews_title_fts'
+REVIEW_FTS_TABLE = 'reviews_review_fts'
+
+TOKEN_RE = re.compile(r'\w+')
+
+
+def search_tokens(query):
+    """Слова поискового запроса в нижнем регистре, без синтаксиса FTS."""
+    return TOKEN_RE.findall(query.lower())[:SEARCH_MAX_TOKENS]
+
+
+class LikeSearchBackend:
+    """
+    Поиск подстрокой (LIKE) для СУБД без полнотекстового индекса.
+
+    Семантика общая для всех бэкендов: каждое слово должно встретиться
+    в названии, описании или тексте любого из отзывов произведения, но
+    не обязательно в одном и том же месте. Здесь слово ищется как
+    подстрока, в полнотекстовых бэкендах — по префиксу; результаты
+    упорядочены по рейтингу.
+    """
+
+    def search(self, tokens, limit):
+        titles = Title.objects.all()
+        for token in tokens:
+            titles = titles.filter(
+                Q(name__icontains=token)
+                | Q(description__icontains=token)
+                | Exists(Review.objects.filter(
+                    title=OuterRef('pk'),
+                    text__icontains=token
+                ))
+            )
+        return list(
+            titles.order_by('-rating', 'pk')
+            .values_list('pk', flat=True)[:limit]
+        )
+
+    def index_title(self, title):
+        pass
+
+    def index_titles(self, titles):
+        pass
+
+    def remove_title(self, title_id):
+        pass
+
+    def index_review(self, review):
+        pass
+
+    def remove_review(self, review_id):
+        pass
+
+    def rebuild(self):
+        pass
+
+
+class SQLiteSearchBackend(LikeSearchBackend):
+    """
+    Поиск по индексам SQLite FTS5.
+
+    Произведения (название, описание) и отзывы лежат в отдельных
+    FTS-таблицах с rowid, равным id строки, поэтому правка отзыва
+    переиндексирует только его. Ранг произведения — лучший bm25 среди
+    его совпадений; совпадения в отзывах весят меньше, чем в названии.
+    Таблицы создаются миграцией и обновляются сигналами reviews.signals.
+    """
+
+    token_sql = (
+        f'SELECT rowid AS title_id, %s AS token, '
+        f'bm25({TITLE_FTS_TABLE}, 10.0, 2.0) AS score '
+        f'FROM {TITLE_FTS_TABLE} WHERE {TITLE_FTS_TABLE} MATCH %s '
+        f'UNION ALL '
+        f'SELECT title_id, %s, bm25({REVIEW_FTS_TABLE}) * %s '
+        f'FROM {REVIEW_FTS_TABLE} WHERE {REVIEW_FTS_TABLE} MATCH %s'
+    )
+    # Лучшее совпадение каждого слова по произведению; остаются
+    # произведения, где нашлись все слова.
+    search_sql = (
+        'SELECT title_id FROM ('
+        'SELECT title_id, token, MIN(score) AS score FROM ({matches}) '
+        'GROUP BY title_id, token'
+        ') GROUP BY title_id HAVING COUNT(*) = %s '
+        'ORDER BY SUM(score), title_id LIMIT %s'
+    )
+
+    @staticmethod
+    def match_expression(token):
+        return f'"{token}"*'
+
+    def search(self, tokens, limit):
+        params = []
+        for number, token in enumerate(tokens):
+            expression = self.match_expression(token)
+            params += [
+                number, expression, number, SEARCH_REVIEW_WEIGHT, expression
+            ]
+        sql = self.search_sql.format(
+            matches=' UNION ALL '.join([self.token_sql] * len(tokens))
+        )
+        with connection.cursor() as cursor:
+            cursor.execute(sql, [*params, len(tokens), limit])
+            return [title_id for title_id, in cursor.fetchall()]
+
+    def index_title(self, title):
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f'DELETE FROM {TITLE_FTS_TABLE} WHERE rowid = %s', [title.pk]
+            )
+            cursor.execute(
+                f'INSERT INTO {TITLE_FTS_TABLE} (rowid, name, description) '
+                f'VALUES (%s, %s, %s)',
+                [title.pk, title.name, title.description]
+            )
+
+    def index_titles(self, titles):
+        """Индексирует новые произведения, например после bulk_create."""
+        with connection.cursor() as cursor:
+            cursor.executemany(
+                f'INSERT INTO {TITLE_FTS_TABLE} (rowid, name, description) '
+                f'VALUES (%s, %s, %s)',
+                [(title.pk, title.name, title.description) for title in titles]
+            )
+
+    def remove_title(self, title_id):
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f'DELETE FROM {TITLE_FTS_TABLE} WHERE rowid = %s', [title_id]
+            )
+
+    def index_review(self, review):
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f'DELETE FROM {REVIEW_FTS_TABLE} WHERE rowid = %s',
+                [review.pk]
+            )
+            cursor.execute(
+                f'INSERT INTO {REVIEW_FTS_TABLE} (rowid, text, title_id) '
+                f'VALUES (%s, %s, %s)',
+                [review.pk, review.text, review.title_id]
+            )
+
+    def remove_review(self, review_id):
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f'DELETE FROM {REVIEW_FTS_TABLE} WHERE rowid = %s',
+                [review_id]
+            )
+
+    def rebuild(self):
+        """Перестраивает индексы целиком, например после bulk_create."""
+        with connection.cursor() as cursor:
+            rebuild_sqlite_index(cursor)
+
+
+class PostgresSearchBackend(LikeSearchBackend):
+    """
+    Поиск через to_tsvector/tsquery PostgreSQL.
+
+    Синхронизировать нечего: миграция создаёт GIN-индексы по тем же
+    выражениям, что строит SearchVector, и планировщик использует их.
+    """
+
+    def search(self, tokens, limit):
+        from django.contrib.postgres.search import (
+            SearchQuery,
+            SearchRank,
+            SearchVector
+        )
+
+        def prefix_query(words, operator=' | '):
+            return SearchQuery(
+                operator.join(f'{word}:*' for word in words),
+                search_type='raw',
+                config=SEARCH_POSTGRES_CONFIG
+            )
+
+        vector = SearchVector(
+            'name', weight='A', config=SEARCH_POSTGRES_CONFIG
+        ) + SearchVector(
+            'description', weight='B', config=SEARCH_POSTGRES_CONFIG
+        )
+        reviews = Review.objects.annotate(
+            document=SearchVector('text', config=SEARCH_POSTGRES_CONFIG)
+        ).filter(title=OuterRef('pk'))
+        titles = Title.objects.annotate(
+            document=vector,
+            search_rank=SearchRank(vector, prefix_query(tokens)),
+        )
+        # Каждое слово — в самом произведении или в любом его отзыве.
+        for token in tokens:
+            query = prefix_query([token])
+            titles = titles.filter(
+                Q(document=query) | Exists(reviews.filter(document=query))
+            )
+        return list(
+            titles.order_by('-search_rank', '-rating', 'pk')
+            .values_list('pk', flat=True)[:limit]
+        )
+
+
+def rebuild_sqlite_index(cursor):
+    cursor.execute(f'DELETE FROM {TITLE_FTS_TABLE}')
+    cursor.execute(
+        f'INSERT INTO {TITLE_FTS_TABLE} (rowid, name, description) '
+        f'SELECT id, name, description FROM {Title._meta.db_table}'
+    )
+    cursor.execute(f'DELETE FROM {REVIEW_FTS_TABLE}')
+    cursor.execute(
+        f'INSERT INTO {REVIEW_FTS_TABLE} (rowid, text, title_id) '
+        f'SELECT id, text, title_id FROM {Review._meta.db_table}'
+    )
+
+
+BACKENDS = {
+    'sqlite': SQLiteSearchBackend,
+    'postgresql': PostgresSearchBackend,
+}
+
+
+def get_search_backend():
+    return BACKENDS.get(connection.vendor, LikeSearchBackend)()
@@ -0,0 +1,235 @@
+from django.db.models import F, FloatField, OuterRef, Subquery
+from django.db.models.functions import Cast, NullIf
+from django.db.models.signals import (
+    m2m_changed,
+    post_delete,
+    post_save,
+    pre_delete
+)
+from django.dispatch import Signal, receiver
+from django.utils import timezone
+
+from .models import (
+    Category,
+    Comment,
+    Genre,
+    Review,
+    Title,
+    TitleStats,
+    score_field_name
+)
+from .search import get_search_backend
+from users.signals import username_changed
+
+# Отправляется после массового пересчёта рейтинга в обход save().
+ratings_recalculated = Signal()
+# Отправляется после массовой загрузки данных через bulk_create.
+catalog_loaded = Signal()
+# Отправляется после bulk_create произведений; аргумент titles.
+titles_bulk_created = Signal()
+
+
+def _score_weight(score):
+    """Вклад оценки в сумму и количество оценок произведения."""
+    if score is None:
+        return 0, 0
+    return score, 1
+
+
+def _update_title_reviews(title_id, score_delta=0, count_delta=0):
+    """
+    Отмечает изменение отзывов произведения одним UPDATE.
+
+    Если изменилась оценка, там же инкрементально пересчитывается рейтинг
+    и обновляется дата изменения самого произведения.
+    """
+    now = timezone.now()
+    fields = {'reviews_updated_at': now}
+    if score_delta or count_delta:
+        rating_sum = F('rating_sum') + score_delta
+        rating_count = F('rating_count') + count_delta
+        fields.update(
+            rating_sum=rating_sum,
+            rating_count=rating_count,
+            rating=Cast(rating_sum, FloatField()) / NullIf(rating_count, 0),
+            updated_at=now,
+        )
+    Title.objects.filter(pk=title_id).update(**fields)
+
+
+def _score_deltas(old_score, new_score):
+    """Изменения корзин распределения оценок."""
+    deltas = {}
+    if old_score != new_score:
+        if old_score is not None:
+            deltas[score_field_name(old_score)] = -1
+        if new_score is not None:
+            deltas[score_field_name(new_score)] = 1
+    return deltas
+
+
+def _update_title_stats(stats, deltas, **fields):
+    """Инкрементально обновляет строки статистики одним UPDATE."""
+    stats.update(
+        updated_at=timezone.now(),
+        **{name: F(name) + delta for name, delta in deltas.items()},
+        **fields
+    )
+
+
+def _touch_titles(titles):
+    titles.update(updated_at=timezone.now())
+
+
+@receiver(post_save, sender=Review)
+def review_saved(sender, instance, created, raw=False, **kwargs):
+    if raw:
+        return
+    new_sum, new_count = _score_weight(instance.score)
+    stats = TitleStats.objects.filter(pk=instance.title_id)
+    if created:
+        _update_title_reviews(instance.title_id, new_sum, new_count)
+        _update_title_stats(
+            stats,
+            dict(_score_deltas(None, instance.score), reviews_count=1),
+            last_review_at=instance.pub_date
+        )
+    elif not hasattr(instance, '_loaded_score'):
+        titles = Title.objects.filter(pk=instance.title_id)
+        _update_title_reviews(instance.title_id)
+        titles.recalculate_rating()
+        TitleStats.objects.recalculate(titles)
+    else:
+        old_sum, old_count = _score_weight(instance._loaded_score)
+        _update_title_reviews(
+            instance.title_id,
+            new_sum - old_sum,
+            new_count - old_count
+        )
+        deltas = _score_deltas(instance._loaded_score, instance.score)
+        if deltas:
+            _update_title_stats(stats, deltas)
+    instance._loaded_score = instance.score
+    get_search_backend().index_review(instance)
+
+
+@receiver(post_delete, sender=Review)
+def review_deleted(sender, instance, **kwargs):
+    get_search_backend().remove_review(instance.pk)
+    score_sum, score_count = _score_weight(
+        getattr(instance, '_loaded_score', instance.score)
+    )
+    _update_title_reviews(instance.title_id, -score_sum, -score_count)
+    _update_title_stats(
+        TitleStats.objects.filter(pk=instance.title_id),
+        dict(
+            _score_deltas(
+                getattr(instance, '_loaded_score', instance.score), None
+            ),
+            reviews_count=-1
+        ),
+        last_review_at=Subquery(
+            Review.objects.filter(
+                title=OuterRef('pk')
+            ).order_by('-pub_date').values('pub_date')[:1]
+        )
+    )
+
+
+@receiver(post_save, sender=Comment)
+@receiver(post_delete, sender=Comment)
+def comment_changed(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    Review.objects.filter(pk=instance.review_id).update(
+        comments_updated_at=timezone.now()
+    )
+
+
+@receiver(post_save, sender=Comment)
+def comment_saved(sender, instance, created, raw=False, **kwargs):
+    if created and not raw:
+        _update_title_stats(
+            TitleStats.objects.filter(title__reviews=instance.review_id),
+            {'comments_count': 1}
+        )
+
+
+@receiver(post_delete, sender=Comment)
+def comment_deleted(sender, instance, **kwargs):
+    _update_title_stats(
+        TitleStats.objects.filter(title__reviews=instance.review_id),
+        {'comments_count': -1}
+    )
+
+
+@receiver(post_save, sender=Category)
+@receiver(pre_delete, sender=Category)
+def category_changed(sender, instance, raw=False, created=False, **kwargs):
+    if not (raw or created):
+        _touch_titles(Title.objects.filter(category=instance))
+
+
+@receiver(post_save, sender=Genre)
+@receiver(pre_delete, sender=Genre)
+def genre_changed(sender, instance, raw=False, created=False, **kwargs):
+    if not (raw or created):
+        _touch_titles(Title.objects.filter(genre=instance))
+
+
+@receiver(m2m_changed, sender=Title.genre.through)
+def title_genres_changed(sender, instance, action, reverse, pk_set,
+                         **kwargs):
+    if action not in ('pre_clear', 'post_add', 'post_remove'):
+        return
+    if not reverse:
+        _touch_titles(Title.objects.filter(pk=instance.pk))
+    elif action == 'pre_clear':
+        _touch_titles(Title.objects.filter(genre=instance))
+    else:
+        _touch_titles(Title.objects.filter(pk__in=pk_set))
+
+
+@receiver(post_save, sender=Title)
+def title_saved(sender, instance, created, raw=False, **kwargs):
+    if raw:
+        return
+    if created:
+        TitleStats.objects.create(title=instance)
+    get_search_backend().index_title(instance)
+
+
+@receiver(post_delete, sender=Title)
+def title_deleted(sender, instance, **kwargs):
+    get_search_backend().remove_title(instance.pk)
+
+
+@receiver(catalog_loaded)
+def catalog_reindexed(sender, **kwargs):
+    TitleStats.objects.recalculate()
+    get_search_backend().rebuild()
+
+
+@receiver(titles_bulk_created)
+def titles_indexed(sender, titles, **kwargs):
+    TitleStats.objects.bulk_create(
+        TitleStats(title_id=title.pk) for title in titles
+    )
+    get_search_backend().index_titles(titles)
+
+
+@receiver(username_changed)
+def author_renamed(sender, user, **kwargs):
+    """
+    Имя автора встроено в отзывы и комментарии: меняем их даты
+    изменения, чтобы ETag списков и объектов стали другими.
+    """
+    now = timezone.now()
+    Review.objects.filter(author=user).update(updated_at=now)
+    Comment.objects.filter(author=user).update(updated_at=now)
+    Title.objects.filter(reviews__author=user).update(
+        reviews_updated_at=now
+    )
+    Review.objects.filter(comments__author=user).update(
+        comments_updated_at=now
+    )
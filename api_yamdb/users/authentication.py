@@ -0,0 +1,118 @@
+import time
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import caches
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import (
+    AuthenticationFailed,
+    InvalidToken
+)
+from rest_framework_simplejwt.settings import api_settings
+
+from core.constants import (
+    AUTH_CACHE_ALIAS,
+    AUTH_CACHE_TIMEOUT,
+    LOCAL_CACHE_BACKENDS
+)
+
+User = get_user_model()
+
+USER_KEY_TEMPLATE = 'users:auth:user:{user_id}:{issued_at}'
+STAMP_KEY_TEMPLATE = 'users:auth:stamp:{user_id}'
+
+
+def get_cache():
+    return caches[AUTH_CACHE_ALIAS]
+
+
+def auth_cache_enabled():
+    """
+    Кэшировать ли пользователей при аутентификации.
+
+    Смена метки в invalidate_user() видна всем воркерам только через
+    общий кэш (Redis, Memcached). С кэшем в памяти процесса другие
+    воркеры до AUTH_CACHE_TIMEOUT пускали бы заблокированного или
+    разжалованного пользователя, поэтому там кэш включается только при
+    DEBUG (один процесс runserver). AUTH_CACHE_ENABLED задаёт явно.
+    """
+    enabled = getattr(settings, 'AUTH_CACHE_ENABLED', None)
+    if enabled is not None:
+        return enabled
+    backend = settings.CACHES[AUTH_CACHE_ALIAS]['BACKEND']
+    return settings.DEBUG or backend not in LOCAL_CACHE_BACKENDS
+
+
+def invalidate_user(user_id):
+    """
+    Сбрасывает закэшированные данные пользователя для всех его токенов.
+
+    Записи не удаляются по одной: меняется метка пользователя, и записи
+    со старой меткой перестают приниматься.
+    """
+    get_cache().set(
+        STAMP_KEY_TEMPLATE.format(user_id=user_id),
+        time.time_ns(),
+        timeout=None
+    )
+
+
+class CachedJWTAuthentication(JWTAuthentication):
+    """
+    JWT-аутентификация без запроса к БД на каждый запрос.
+
+    В кэше хранится только то, что нужно для проверки прав (AUTH_FIELDS),
+    по ключу из id пользователя и времени выпуска токена. Запись и метка
+    пользователя читаются одним get_many; при изменении роли или
+    активности пользователя метка меняется в signals.py. Без общего
+    кэша (см. auth_cache_enabled) данные читаются из БД каждый раз.
+    Возвращаемый объект загружен с отложенными остальными полями.
+    """
+
+    def get_user(self, validated_token):
+        try:
+            user_id = validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError:
+            raise InvalidToken(
+                _('Token contained no recognizable user identification')
+            )
+        if auth_cache_enabled():
+            values = self.get_cached_values(user_id, validated_token)
+        else:
+            values = self.load_values(user_id)
+        if values is None:
+            raise AuthenticationFailed(
+                _('User not found'), code='user_not_found'
+            )
+        user = User.from_db(User.objects.db, User.AUTH_FIELDS, values)
+        if not user.is_active:
+            raise AuthenticationFailed(
+                _('User is inactive'), code='user_inactive'
+            )
+        return user
+
+    def get_cached_values(self, user_id, validated_token):
+        cache = get_cache()
+        user_key = USER_KEY_TEMPLATE.format(
+            user_id=user_id,
+            issued_at=validated_token.get('iat', ''),
+        )
+        stamp_key = STAMP_KEY_TEMPLATE.format(user_id=user_id)
+        cached = cache.get_many((user_key, stamp_key))
+        stamp = cached.get(stamp_key)
+        entry = cached.get(user_key)
+        if stamp is None:
+            stamp = time.time_ns()
+            if not cache.add(stamp_key, stamp, timeout=None):
+                stamp = cache.get(stamp_key)
+        if entry is not None and entry[0] == stamp:
+            return entry[1]
+        values = self.load_values(user_id)
+        cache.set(user_key, (stamp, values), AUTH_CACHE_TIMEOUT)
+        return values
+
+    def load_values(self, user_id):
+        return User.objects.filter(
+            **{api_settings.USER_ID_FIELD: user_id}
+        ).values_list(*User.AUTH_FIELDS).first()
@@ -11,6 +11,17 @@ class CustomUserModel(AbstractUser):
         MODERATOR = 'moderator'
         ADMIN = 'admin'
 
+    # Поля, которых достаточно для аутентификации и проверки прав.
+    # Порядок совпадает с порядком полей модели, как того требует from_db.
+    AUTH_FIELDS = (
+        'id',
+        'is_superuser',
+        'username',
+        'is_staff',
+        'is_active',
+        'role',
+    )
+
     email = models.EmailField(
         max_length=MAX_EMAIL_LENGTH,
         unique=True,
@@ -32,6 +43,16 @@ class CustomUserModel(AbstractUser):
     def __str__(self):
         return self.username
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        if set(cls.AUTH_FIELDS).issubset(field_names):
+            instance._loaded_auth_state = instance.get_auth_state()
+        return instance
+
+    def get_auth_state(self):
+        return tuple(getattr(self, field) for field in self.AUTH_FIELDS)
+
     def clean(self):
         super().clean()
         if self.username and self.username.lower() == 'me':
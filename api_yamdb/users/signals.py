@@ -0,0 +1,34 @@
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import Signal, receiver
+
+from .authentication import invalidate_user
+
+User = get_user_model()
+
+USERNAME_INDEX = User.AUTH_FIELDS.index('username')
+
+# Отправляется после смены username сохранённого пользователя; аргумент
+# user. Если прежнее имя неизвестно, тоже отправляется.
+username_changed = Signal()
+
+
+@receiver(post_save, sender=User)
+def user_saved(sender, instance, created, raw=False, **kwargs):
+    if raw or created:
+        return
+    state = instance.get_auth_state()
+    loaded = getattr(instance, '_loaded_auth_state', None)
+    if loaded != state:
+        user_id = instance.pk
+        transaction.on_commit(lambda: invalidate_user(user_id))
+        if loaded is None or loaded[USERNAME_INDEX] != instance.username:
+            username_changed.send(sender=sender, user=instance)
+    instance._loaded_auth_state = state
+
+
+@receiver(post_delete, sender=User)
+def user_deleted(sender, instance, **kwargs):
+    user_id = instance.pk
+    transaction.on_commit(lambda: invalidate_user(user_id))
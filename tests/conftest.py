@@ -1,6 +1,7 @@
 import os
 import sys
 
+import pytest
 from django.utils.version import get_version
 
 BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
@@ -33,3 +34,21 @@ assert get_version() < '4.0.0', 'Пожалуйста, используйте в
 pytest_plugins = [
     'tests.fixtures.fixture_user',
 ]
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    from django.core.cache import cache
+    cache.clear()
+
+
+@pytest.fixture(autouse=True)
+def eager_email_outbox(settings):
+    settings.EMAIL_OUTBOX_EAGER = True
+
+
+@pytest.fixture(autouse=True)
+def local_throttle_store(settings):
+    from api.v1.throttling import reset_stores
+    settings.THROTTLE_STORE = 'api.v1.throttling.LocalWindowStore'
+    reset_stores()
@@ -0,0 +1,89 @@
+from http import HTTPStatus
+
+import pytest
+from django.core.management import call_command
+
+from reviews.models import Review, Title
+from tests.utils import create_single_review, create_titles
+
+
+@pytest.mark.django_db(transaction=True)
+class Test08TitleRating:
+
+    TITLE_DETAIL_URL_TEMPLATE = '/api/v1/titles/{title_id}/'
+    REVIEW_DETAIL_URL_TEMPLATE = (
+        '/api/v1/titles/{title_id}/reviews/{review_id}/'
+    )
+
+    def get_rating(self, client, title_id):
+        response = client.get(
+            self.TITLE_DETAIL_URL_TEMPLATE.format(title_id=title_id)
+        )
+        assert response.status_code == HTTPStatus.OK
+        return response.json()['rating']
+
+    def test_01_rating_follows_review_writes(self, admin_client, user_client,
+                                             moderator_client, client):
+        titles, _, _ = create_titles(admin_client)
+        title_id = titles[0]['id']
+        assert self.get_rating(client, title_id) is None, (
+            'Если отзывов о произведении нет - значением поля `rating` '
+            'должно быть `None`.'
+        )
+
+        review = create_single_review(user_client, title_id, 'text', 2)
+        create_single_review(moderator_client, title_id, 'text', 6)
+        assert self.get_rating(client, title_id) == 4, (
+            'Проверьте, что рейтинг пересчитывается при создании отзыва.'
+        )
+
+        response = user_client.patch(
+            self.REVIEW_DETAIL_URL_TEMPLATE.format(
+                title_id=title_id, review_id=review.json()['id']
+            ),
+            data={'score': 10}
+        )
+        assert response.status_code == HTTPStatus.OK
+        assert self.get_rating(client, title_id) == 8, (
+            'Проверьте, что рейтинг пересчитывается при изменении оценки.'
+        )
+
+        response = user_client.delete(
+            self.REVIEW_DETAIL_URL_TEMPLATE.format(
+                title_id=title_id, review_id=review.json()['id']
+            )
+        )
+        assert response.status_code == HTTPStatus.NO_CONTENT
+        assert self.get_rating(client, title_id) == 6, (
+            'Проверьте, что рейтинг пересчитывается при удалении отзыва.'
+        )
+
+    def test_02_rating_follows_author_deletion(self, admin_client, user,
+                                               user_client, moderator_client,
+                                               client):
+        titles, _, _ = create_titles(admin_client)
+        title_id = titles[0]['id']
+        create_single_review(user_client, title_id, 'text', 1)
+        create_single_review(moderator_client, title_id, 'text', 7)
+
+        user.delete()
+        title = Title.objects.get(pk=title_id)
+        assert (title.rating_sum, title.rating_count) == (7, 1), (
+            'Проверьте, что рейтинг пересчитывается при каскадном удалении '
+            'отзывов вместе с автором.'
+        )
+        assert self.get_rating(client, title_id) == 7
+
+    def test_03_recalculate_ratings_command(self, admin_client, user_client,
+                                            client):
+        titles, _, _ = create_titles(admin_client)
+        title_id = titles[0]['id']
+        create_single_review(user_client, title_id, 'text', 3)
+        Review.objects.update(score=9)
+        assert self.get_rating(client, title_id) == 3
+
+        call_command('recalculate_ratings')
+        assert self.get_rating(client, title_id) == 9, (
+            'Проверьте, что команда `recalculate_ratings` исправляет '
+            'расхождения сохранённого рейтинга.'
+        )
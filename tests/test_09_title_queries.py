@@ -0,0 +1,105 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.pagination import PageNumberPagination
+
+from api.v1.slugs import category_slugs, genre_slugs
+from reviews.models import Category, Genre, Title
+
+TITLES_URL = '/api/v1/titles/'
+TITLE_DETAIL_URL_TEMPLATE = '/api/v1/titles/{title_id}/'
+
+# COUNT для пагинации, произведения вместе с категорией, жанры.
+TITLES_LIST_QUERIES = 3
+# Дата изменения для ETag, произведение вместе с категорией, жанры.
+TITLE_DETAIL_QUERIES = 3
+
+
+def clear_slug_caches():
+    category_slugs.clear()
+    genre_slugs.clear()
+
+
+def create_catalog(size):
+    category = Category.objects.create(name='Фильм', slug='films')
+    Genre.objects.bulk_create(
+        Genre(name=f'Жанр {idx}', slug=f'genre-{idx}') for idx in range(3)
+    )
+    Title.objects.bulk_create(
+        Title(name=f'Произведение {idx}', year=2000, category=category)
+        for idx in range(size)
+    )
+    genres = list(Genre.objects.order_by('slug'))
+    titles = list(Title.objects.order_by('id'))
+    Title.genre.through.objects.bulk_create(
+        Title.genre.through(title_id=title.id, genre_id=genre.id)
+        for title in titles
+        for genre in genres[:2]
+    )
+    return titles, category, genres
+
+
+@pytest.mark.django_db(transaction=True)
+class Test09TitleQueries:
+
+    @pytest.mark.parametrize('page_size', (10, 100, 1000))
+    def test_01_titles_list_queries(self, client, monkeypatch,
+                                    django_assert_num_queries, page_size):
+        create_catalog(page_size)
+        monkeypatch.setattr(PageNumberPagination, 'page_size', page_size)
+        with django_assert_num_queries(TITLES_LIST_QUERIES):
+            response = client.get(TITLES_URL)
+        assert response.status_code == HTTPStatus.OK
+        results = response.json()['results']
+        assert len(results) == page_size
+        assert all(
+            len(title['genre']) == 2 and title['category']
+            for title in results
+        ), (
+            f'Проверьте, что `{TITLES_URL}` возвращает жанры и категорию '
+            'каждого произведения.'
+        )
+
+    @pytest.mark.parametrize('catalog_size', (10, 1000))
+    def test_02_title_detail_queries(self, client, django_assert_num_queries,
+                                     catalog_size):
+        titles, _, _ = create_catalog(catalog_size)
+        url = TITLE_DETAIL_URL_TEMPLATE.format(title_id=titles[-1].id)
+        with django_assert_num_queries(TITLE_DETAIL_QUERIES):
+            response = client.get(url)
+        assert response.status_code == HTTPStatus.OK
+
+    def test_03_title_patch_queries(self, admin_client):
+        titles, category, genres = create_catalog(10)
+        data = {
+            'name': 'Новое название',
+            'category': category.slug,
+            'genre': [genres[2].slug],
+        }
+        url = TITLE_DETAIL_URL_TEMPLATE.format(title_id=titles[0].id)
+        # Прогревает кэш аутентификации, чтобы оба замера были в равных
+        # условиях.
+        admin_client.get(url)
+        clear_slug_caches()
+        with CaptureQueriesContext(connection) as small_catalog:
+            response = admin_client.patch(url, data=data)
+        assert response.status_code == HTTPStatus.OK
+        assert response.json()['genre'] == [
+            {'name': genres[2].name, 'slug': genres[2].slug}
+        ]
+
+        Title.objects.bulk_create(
+            Title(name=f'Ещё {idx}', year=2000, category=category)
+            for idx in range(1000)
+        )
+        data['genre'] = [genres[0].slug, genres[1].slug]
+        clear_slug_caches()
+        with CaptureQueriesContext(connection) as large_catalog:
+            response = admin_client.patch(url, data=data)
+        assert response.status_code == HTTPStatus.OK
+        assert len(large_catalog) == len(small_catalog), (
+            'Проверьте, что количество запросов при PATCH-запросе к '
+            f'`{TITLE_DETAIL_URL_TEMPLATE}` не зависит от размера каталога.'
+        )
@@ -0,0 +1,90 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from reviews.models import Category, Review, Title
+
+
+def fetch_all_pages(client, url, **extra):
+    """Проходит по ссылкам `next` и возвращает результаты и SQL-запросы."""
+    results = []
+    with CaptureQueriesContext(connection) as queries:
+        while url:
+            response = client.get(url, **extra)
+            assert response.status_code == HTTPStatus.OK
+            data = response.json()
+            assert 'count' not in data, (
+                'Проверьте, что в курсорном режиме пагинации ответ не '
+                'содержит ключ `count`.'
+            )
+            results.extend(data['results'])
+            url = data['next']
+    return results, queries
+
+
+@pytest.mark.django_db(transaction=True)
+class Test10CursorPagination:
+
+    TITLES_URL = '/api/v1/titles/'
+    REVIEWS_URL_TEMPLATE = '/api/v1/titles/{title_id}/reviews/'
+
+    def create_titles(self, count):
+        category = Category.objects.create(name='Фильм', slug='films')
+        Title.objects.bulk_create(
+            Title(name=f'Произведение {idx}', year=2000, category=category)
+            for idx in range(count)
+        )
+        return list(Title.objects.order_by('id'))
+
+    def test_01_page_number_is_default(self, client):
+        self.create_titles(3)
+        data = client.get(self.TITLES_URL).json()
+        assert data['count'] == 3, (
+            f'Проверьте, что `{self.TITLES_URL}` по умолчанию использует '
+            'постраничную пагинацию.'
+        )
+
+    @pytest.mark.parametrize('query, extra', (
+        ('?pagination=cursor', {}),
+        ('', {'HTTP_ACCEPT': 'application/json; pagination=cursor'}),
+    ))
+    def test_02_titles_cursor_mode(self, client, query, extra):
+        titles = self.create_titles(25)
+        results, queries = fetch_all_pages(
+            client, self.TITLES_URL + query, **extra
+        )
+        assert [title['id'] for title in results] == [
+            title.id for title in titles
+        ], (
+            f'Проверьте, что курсорная пагинация `{self.TITLES_URL}` '
+            'возвращает все произведения по одному разу.'
+        )
+        assert not any(
+            'COUNT(' in query['sql'] for query in queries.captured_queries
+        ), 'В курсорном режиме пагинации не должно быть запросов COUNT.'
+
+    def test_03_reviews_cursor_mode(self, client, django_user_model):
+        title = self.create_titles(1)[0]
+        django_user_model.objects.bulk_create(
+            django_user_model(username=f'user{idx}', email=f'{idx}@yamdb.fake')
+            for idx in range(23)
+        )
+        for author in django_user_model.objects.all():
+            Review.objects.create(
+                title=title, author=author, text='text', score=5
+            )
+        results, _ = fetch_all_pages(
+            client,
+            self.REVIEWS_URL_TEMPLATE.format(title_id=title.id)
+            + '?pagination=cursor'
+        )
+        assert [review['id'] for review in results] == list(
+            Review.objects.order_by('pub_date', 'id').values_list(
+                'id', flat=True
+            )
+        ), (
+            'Проверьте, что курсорная пагинация отзывов возвращает все '
+            'отзывы в порядке публикации.'
+        )
@@ -0,0 +1,76 @@
+from http import HTTPStatus
+
+import pytest
+
+from tests.utils import create_single_review, create_titles
+
+
+@pytest.mark.django_db(transaction=True)
+class Test11ResponseCache:
+
+    CATEGORIES_URL = '/api/v1/categories/'
+    TITLES_URL = '/api/v1/titles/'
+    TITLE_DETAIL_URL_TEMPLATE = '/api/v1/titles/{title_id}/'
+    STATS_URL = '/api/v1/cache/stats/'
+
+    def test_01_repeated_reads_hit_cache(self, admin_client, client):
+        create_titles(admin_client)
+        first = client.get(self.TITLES_URL)
+        second = client.get(self.TITLES_URL)
+        assert first['X-Cache'] == 'MISS'
+        assert second['X-Cache'] == 'HIT', (
+            f'Проверьте, что повторный GET-запрос к `{self.TITLES_URL}` '
+            'обслуживается из кэша.'
+        )
+        assert first.json() == second.json()
+        assert client.get(self.TITLES_URL + '?page=1')['X-Cache'] == 'MISS', (
+            'Проверьте, что параметры запроса входят в ключ кэша.'
+        )
+
+    def test_02_writes_invalidate_cache(self, admin_client, user_client,
+                                        client):
+        titles, categories, _ = create_titles(admin_client)
+        detail_url = self.TITLE_DETAIL_URL_TEMPLATE.format(
+            title_id=titles[0]['id']
+        )
+        other_detail_url = self.TITLE_DETAIL_URL_TEMPLATE.format(
+            title_id=titles[1]['id']
+        )
+        client.get(self.CATEGORIES_URL)
+        client.get(detail_url)
+        client.get(other_detail_url)
+
+        create_single_review(user_client, titles[0]['id'], 'text', 7)
+        response = client.get(detail_url)
+        assert response['X-Cache'] == 'MISS'
+        assert response.json()['rating'] == 7, (
+            'Проверьте, что новый отзыв сбрасывает кэш произведения.'
+        )
+        assert client.get(other_detail_url)['X-Cache'] == 'HIT', (
+            'Проверьте, что отзыв сбрасывает кэш только своего произведения.'
+        )
+
+        response = admin_client.delete(
+            f'{self.CATEGORIES_URL}{categories[0]["slug"]}/'
+        )
+        assert response.status_code == HTTPStatus.NO_CONTENT
+        assert categories[0] not in client.get(
+            self.CATEGORIES_URL
+        ).json()['results']
+        assert client.get(detail_url).json()['category'] is None, (
+            'Проверьте, что удаление категории сбрасывает кэш произведений.'
+        )
+
+    def test_03_cache_stats(self, admin_client, user_client, client):
+        client.get(self.CATEGORIES_URL)
+        client.get(self.CATEGORIES_URL)
+        assert user_client.get(self.STATS_URL).status_code == (
+            HTTPStatus.FORBIDDEN
+        )
+        response = admin_client.get(self.STATS_URL)
+        assert response.status_code == HTTPStatus.OK
+        stats = response.json()['categories']
+        assert stats['hits'] >= 1 and stats['misses'] >= 1, (
+            f'Проверьте, что `{self.STATS_URL}` возвращает счётчики '
+            'попаданий и промахов кэша.'
+        )
@@ -0,0 +1,113 @@
+from http import HTTPStatus
+
+import pytest
+
+from tests.utils import (
+    create_reviews, create_single_comment, create_single_review,
+    create_titles
+)
+
+
+@pytest.mark.django_db(transaction=True)
+class Test12ConditionalGet:
+
+    TITLE_DETAIL_URL_TEMPLATE = '/api/v1/titles/{title_id}/'
+    REVIEWS_URL_TEMPLATE = '/api/v1/titles/{title_id}/reviews/'
+    COMMENTS_URL_TEMPLATE = (
+        '/api/v1/titles/{title_id}/reviews/{review_id}/comments/'
+    )
+
+    def test_01_reviews_not_modified(self, admin_client, user_client,
+                                     moderator_client, client,
+                                     django_assert_num_queries):
+        titles, _, _ = create_titles(admin_client)
+        url = self.REVIEWS_URL_TEMPLATE.format(title_id=titles[0]['id'])
+        create_single_review(user_client, titles[0]['id'], 'text', 5)
+
+        response = client.get(url)
+        etag = response['ETag']
+        assert response.has_header('Last-Modified')
+        with django_assert_num_queries(1):
+            response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == HTTPStatus.NOT_MODIFIED, (
+            f'Проверьте, что GET-запрос к `{url}` с актуальным '
+            '`If-None-Match` возвращает ответ со статусом 304 без выборки '
+            'отзывов.'
+        )
+        assert response['ETag'] == etag
+
+        create_single_review(moderator_client, titles[0]['id'], 'text', 1)
+        response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == HTTPStatus.OK, (
+            'Проверьте, что новый отзыв меняет ETag списка отзывов.'
+        )
+        assert response['ETag'] != etag
+        assert client.get(
+            url + '?page=1', HTTP_IF_NONE_MATCH=response['ETag']
+        ).status_code == HTTPStatus.OK, (
+            'Проверьте, что ETag зависит от параметров запроса.'
+        )
+
+    def test_02_comments_not_modified(self, admin_client, user,
+                                      user_client, client):
+        reviews, titles = create_reviews(admin_client, {user: user_client})
+        url = self.COMMENTS_URL_TEMPLATE.format(
+            title_id=titles[0]['id'], review_id=reviews[0]['id']
+        )
+        etag = client.get(url)['ETag']
+        assert client.get(
+            url, HTTP_IF_NONE_MATCH=etag
+        ).status_code == HTTPStatus.NOT_MODIFIED
+
+        create_single_comment(
+            user_client, titles[0]['id'], reviews[0]['id'], 'text'
+        )
+        assert client.get(
+            url, HTTP_IF_NONE_MATCH=etag
+        ).status_code == HTTPStatus.OK, (
+            'Проверьте, что новый комментарий меняет ETag списка '
+            'комментариев.'
+        )
+
+    def test_03_title_detail_not_modified(self, admin_client, user_client,
+                                          client):
+        titles, _, _ = create_titles(admin_client)
+        url = self.TITLE_DETAIL_URL_TEMPLATE.format(title_id=titles[0]['id'])
+        response = client.get(url)
+        last_modified = response['Last-Modified']
+        assert client.get(
+            url, HTTP_IF_MODIFIED_SINCE=last_modified
+        ).status_code == HTTPStatus.NOT_MODIFIED
+
+        etag = response['ETag']
+        create_single_review(user_client, titles[0]['id'], 'text', 5)
+        response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == HTTPStatus.OK, (
+            'Проверьте, что изменение рейтинга меняет ETag произведения.'
+        )
+        assert response.json()['rating'] == 5
+
+    def test_04_author_rename_changes_etag(self, admin_client, user,
+                                           user_client, client):
+        reviews, titles = create_reviews(admin_client, {user: user_client})
+        create_single_comment(
+            user_client, titles[0]['id'], reviews[0]['id'], 'text'
+        )
+        urls = (
+            self.REVIEWS_URL_TEMPLATE.format(title_id=titles[0]['id']),
+            self.COMMENTS_URL_TEMPLATE.format(
+                title_id=titles[0]['id'], review_id=reviews[0]['id']
+            ),
+        )
+        etags = {url: client.get(url)['ETag'] for url in urls}
+        response = admin_client.patch(
+            f'/api/v1/users/{user.username}/', data={'username': 'renamed'}
+        )
+        assert response.status_code == HTTPStatus.OK
+        for url in urls:
+            response = client.get(url, HTTP_IF_NONE_MATCH=etags[url])
+            assert response.status_code == HTTPStatus.OK, (
+                'Проверьте, что смена username автора меняет ETag отзывов '
+                'и комментариев.'
+            )
+            assert response.json()['results'][0]['author'] == 'renamed'
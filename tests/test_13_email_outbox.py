@@ -0,0 +1,75 @@
+from datetime import timedelta
+
+import pytest
+from django.core import mail
+from django.core.mail.backends.locmem import EmailBackend
+from django.core.management import call_command
+from django.utils import timezone
+
+from core.models import OutgoingEmail
+
+
+class BrokenEmailBackend(EmailBackend):
+    def send_messages(self, messages):
+        raise ConnectionError('SMTP недоступен')
+
+
+@pytest.mark.django_db(transaction=True)
+class Test13EmailOutbox:
+
+    URL_SIGNUP = '/api/v1/auth/signup/'
+
+    def signup(self, client, idx=0):
+        response = client.post(self.URL_SIGNUP, data={
+            'email': f'user{idx}@yamdb.fake',
+            'username': f'user{idx}',
+        })
+        assert response.status_code == 200
+        return response
+
+    def test_01_signup_enqueues_email(self, client, settings):
+        settings.EMAIL_OUTBOX_EAGER = False
+        for idx in range(3):
+            self.signup(client, idx)
+        assert not mail.outbox, (
+            'Проверьте, что при регистрации письмо не отправляется '
+            'в рамках запроса.'
+        )
+        assert OutgoingEmail.objects.filter(
+            status=OutgoingEmail.Status.PENDING
+        ).count() == 3
+
+        call_command('send_emails', '--once')
+        assert sorted(message.to[0] for message in mail.outbox) == [
+            f'user{idx}@yamdb.fake' for idx in range(3)
+        ]
+        assert not OutgoingEmail.objects.exclude(
+            status=OutgoingEmail.Status.SENT
+        ).exists()
+
+    def test_02_failed_email_is_retried(self, client, settings):
+        settings.EMAIL_OUTBOX_EAGER = False
+        settings.EMAIL_BACKEND = (
+            'tests.test_13_email_outbox.BrokenEmailBackend'
+        )
+        self.signup(client)
+        call_command('send_emails', '--once')
+        email = OutgoingEmail.objects.get()
+        assert email.status == OutgoingEmail.Status.PENDING
+        assert email.attempts == 1
+        assert email.next_attempt_at > timezone.now(), (
+            'Проверьте, что повторная отправка откладывается.'
+        )
+
+        settings.EMAIL_BACKEND = 'django.core.mail.backends.locmem.EmailBackend'
+        call_command('send_emails', '--once')
+        assert not mail.outbox
+
+        OutgoingEmail.objects.update(
+            next_attempt_at=timezone.now() - timedelta(seconds=1)
+        )
+        call_command('send_emails', '--once')
+        assert len(mail.outbox) == 1
+        assert OutgoingEmail.objects.get().status == (
+            OutgoingEmail.Status.SENT
+        )
@@ -0,0 +1,113 @@
+import csv
+import os
+from http import HTTPStatus
+
+import pytest
+from django.core.management import call_command
+from django.db.models import Avg
+
+from reviews.models import Category, Comment, Genre, Review, Title
+from tests.conftest import MANAGE_PATH
+
+DATA_PATH = os.path.join(MANAGE_PATH, 'static', 'data')
+
+
+def count_rows(name):
+    with open(os.path.join(DATA_PATH, name), encoding='utf-8') as csv_file:
+        return sum(1 for _ in csv.DictReader(csv_file))
+
+
+@pytest.mark.django_db(transaction=True)
+class Test14ImportCsv:
+
+    def test_01_import_bundled_data(self, django_user_model):
+        call_command('import_csv')
+        for name, model in (
+            ('users.csv', django_user_model),
+            ('category.csv', Category),
+            ('genre.csv', Genre),
+            ('titles.csv', Title),
+            ('genre_title.csv', Title.genre.through),
+            ('review.csv', Review),
+            ('comments.csv', Comment),
+        ):
+            assert model.objects.count() == count_rows(name), (
+                f'Проверьте, что команда `import_csv` загружает все строки '
+                f'файла `{name}`.'
+            )
+        title = Title.objects.annotate(
+            average=Avg('reviews__score')
+        ).filter(rating_count__gt=0).first()
+        assert title.rating == title.average, (
+            'Проверьте, что после импорта рейтинг произведений пересчитан.'
+        )
+        review = Review.objects.get(pk=1)
+        assert review.pub_date.isoformat().startswith('2019-09-24T21:08'), (
+            'Проверьте, что импорт сохраняет даты публикации из файла.'
+        )
+
+    def test_02_invalid_rows_are_skipped(self, tmp_path):
+        (tmp_path / 'category.csv').write_text(
+            'id,name,slug\n'
+            '1,Фильм,movie\n'
+            '2,Дубль,movie\n'
+            'x,Книга,book\n'
+            '3,Музыка,music\n',
+            encoding='utf-8'
+        )
+        (tmp_path / 'titles.csv').write_text(
+            'id,name,year,category\n'
+            '1,Произведение,1994,1\n'
+            '2,Сирота,1994,42\n'
+            '3,Будущее,3000,1\n',
+            encoding='utf-8'
+        )
+        call_command(
+            'import_csv', 'category', 'titles',
+            path=str(tmp_path), batch_size=2
+        )
+        assert sorted(
+            Category.objects.values_list('slug', flat=True)
+        ) == ['movie', 'music']
+        assert list(Title.objects.values_list('id', flat=True)) == [1], (
+            'Проверьте, что строки с несуществующими связями или '
+            'некорректными значениями пропускаются.'
+        )
+
+    def test_03_import_changes_etags(self, client, tmp_path,
+                                     django_user_model):
+        author = django_user_model.objects.create(
+            username='author', email='author@yamdb.fake'
+        )
+        title = Title.objects.create(name='Произведение', year=2000)
+        review = Review.objects.create(
+            title=title, author=author, text='Отзыв', score=5
+        )
+        urls = (
+            f'/api/v1/titles/{title.id}/reviews/',
+            f'/api/v1/titles/{title.id}/reviews/{review.id}/comments/',
+        )
+        etags = {url: client.get(url)['ETag'] for url in urls}
+        other = django_user_model.objects.create(
+            username='other', email='other@yamdb.fake'
+        )
+        (tmp_path / 'review.csv').write_text(
+            'id,title_id,text,author,score,pub_date\n'
+            f'{review.id + 1},{title.id},Ещё отзыв,{other.id},7,'
+            '2019-09-24T21:08:21.567Z\n',
+            encoding='utf-8'
+        )
+        (tmp_path / 'comments.csv').write_text(
+            'id,review_id,text,author,pub_date\n'
+            f'1,{review.id},Комментарий,{other.id},2019-09-24T21:08:21.567Z\n',
+            encoding='utf-8'
+        )
+        call_command('import_csv', 'review', 'comments', path=str(tmp_path))
+        for url in urls:
+            assert client.get(
+                url, HTTP_IF_NONE_MATCH=etags[url]
+            ).status_code == HTTPStatus.OK, (
+                'Проверьте, что импорт отзывов и комментариев меняет ETag '
+                'уже существующих произведений и отзывов.'
+            )
+        assert Comment.objects.get().pub_date.year == 2019
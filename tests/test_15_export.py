@@ -0,0 +1,98 @@
+import csv
+import io
+import json
+from http import HTTPStatus
+
+import pytest
+
+from tests.utils import create_comments
+
+
+@pytest.mark.django_db(transaction=True)
+class Test15Export:
+
+    EXPORT_URL_TEMPLATE = '/api/v1/export/{resource}.{file_format}'
+
+    def get_export(self, client, resource, file_format):
+        response = client.get(self.EXPORT_URL_TEMPLATE.format(
+            resource=resource, file_format=file_format
+        ))
+        assert response.status_code == HTTPStatus.OK
+        assert response.streaming, (
+            'Проверьте, что выгрузка отдаётся потоком '
+            '(StreamingHttpResponse).'
+        )
+        return b''.join(response.streaming_content).decode()
+
+    def test_01_export_ndjson(self, admin_client, user, user_client,
+                              moderator, moderator_client):
+        comments, reviews, titles = create_comments(
+            admin_client, {user: user_client, moderator: moderator_client}
+        )
+        exported = [
+            json.loads(line) for line in self.get_export(
+                admin_client, 'titles', 'ndjson'
+            ).splitlines()
+        ]
+        assert [title['id'] for title in exported] == [
+            title['id'] for title in titles
+        ]
+        terminator = exported[0]
+        assert {genre['slug'] for genre in terminator['genre']} == set(
+            titles[0]['genre']
+        )
+        assert terminator['category']['slug'] == titles[0]['category']
+        assert terminator['rating'] == 5
+
+        exported = [
+            json.loads(line) for line in self.get_export(
+                admin_client, 'reviews', 'ndjson'
+            ).splitlines()
+        ]
+        assert [
+            (review['id'], review['author']) for review in exported
+        ] == [(review['id'], review['author']) for review in reviews]
+        api_reviews = admin_client.get(
+            f'/api/v1/titles/{titles[0]["id"]}/reviews/'
+        ).json()['results']
+        assert {
+            review['id']: review['pub_date'] for review in exported
+        } == {
+            review['id']: review['pub_date'] for review in api_reviews
+        }, (
+            'Проверьте, что даты в выгрузке в том же формате, что и в '
+            'ответах API.'
+        )
+
+    def test_02_export_csv(self, admin_client, user, user_client):
+        comments, reviews, titles = create_comments(
+            admin_client, {user: user_client}
+        )
+        rows = list(csv.DictReader(io.StringIO(
+            self.get_export(admin_client, 'comments', 'csv')
+        )))
+        assert [row['text'] for row in rows] == [
+            comment['text'] for comment in comments
+        ]
+        assert rows[0]['title_id'] == str(titles[0]['id'])
+        api_comments = admin_client.get(
+            f'/api/v1/titles/{titles[0]["id"]}/reviews/'
+            f'{reviews[0]["id"]}/comments/'
+        ).json()['results']
+        assert {
+            int(row['id']): row['pub_date'] for row in rows
+        } == {
+            comment['id']: comment['pub_date'] for comment in api_comments
+        }, 'Проверьте, что даты в CSV в том же формате, что и в API.'
+
+        rows = list(csv.DictReader(io.StringIO(
+            self.get_export(admin_client, 'titles', 'csv')
+        )))
+        assert set(rows[0]['genre'].split(',')) == set(titles[0]['genre'])
+
+    def test_03_export_admin_only(self, user_client, client):
+        url = self.EXPORT_URL_TEMPLATE.format(
+            resource='titles', file_format='csv'
+        )
+        assert client.get(url).status_code == HTTPStatus.UNAUTHORIZED
+        assert user_client.get(url).status_code == HTTPStatus.FORBIDDEN
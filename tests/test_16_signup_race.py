@@ -0,0 +1,100 @@
+from concurrent.futures import ThreadPoolExecutor
+from http import HTTPStatus
+from threading import Barrier
+
+import pytest
+from django.db import connection, connections
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+from api.v1 import serializers
+
+
+@pytest.mark.django_db(transaction=True)
+class Test16SignupRace:
+
+    URL_SIGNUP = '/api/v1/auth/signup/'
+    DATA = {'username': 'racer', 'email': 'racer@yamdb.fake'}
+
+    def signup_statements(self, client):
+        with CaptureQueriesContext(connection) as queries:
+            response = client.post(self.URL_SIGNUP, data=self.DATA)
+        assert response.status_code == HTTPStatus.OK
+        return [
+            query['sql'].split()[0] for query in queries.captured_queries
+            if query['sql'].split()[0] in ('SELECT', 'INSERT', 'UPDATE')
+        ]
+
+    def test_01_signup_lookup_is_single_query(self, client, settings,
+                                              django_user_model):
+        settings.EMAIL_OUTBOX_EAGER = False
+        # Поиск по username/email, создание пользователя, письмо в очередь.
+        assert self.signup_statements(client) == [
+            'SELECT', 'INSERT', 'INSERT'
+        ]
+        # Повторная отправка кода: поиск пользователя, письмо в очередь.
+        assert self.signup_statements(client) == ['SELECT', 'INSERT']
+        assert django_user_model.objects.count() == 1
+
+    def test_02_lost_race_reuses_created_user(self, client, monkeypatch,
+                                              django_user_model):
+        django_user_model.objects.create(**self.DATA)
+        original = serializers.username_and_email_are_unique
+        calls = []
+
+        def stale_check(username, email):
+            calls.append(username)
+            # Первая проверка не видит пользователя, созданного
+            # параллельным запросом.
+            if len(calls) == 1:
+                return None
+            return original(username, email)
+
+        monkeypatch.setattr(
+            serializers, 'username_and_email_are_unique', stale_check
+        )
+        response = client.post(self.URL_SIGNUP, data=self.DATA)
+        assert len(calls) == 2, (
+            'Проверьте, что после IntegrityError при создании пользователя '
+            'проверка уникальности повторяется.'
+        )
+        assert response.status_code == HTTPStatus.OK, (
+            'Проверьте, что при гонке регистраций с одинаковыми username и '
+            'email запрос завершается успешно.'
+        )
+        assert django_user_model.objects.count() == 1
+
+        calls.clear()
+        response = client.post(self.URL_SIGNUP, data={
+            'username': self.DATA['username'],
+            'email': 'other@yamdb.fake',
+        })
+        assert len(calls) == 2
+        assert response.status_code == HTTPStatus.BAD_REQUEST, (
+            'Проверьте, что проигранная гонка за занятый username '
+            'возвращает ответ со статусом 400.'
+        )
+        assert response.json() == {'non_field_errors': [
+            'Пользователь с таким именем уже существует'
+        ]}, (
+            'Проверьте, что ошибка проигранной гонки совпадает с ошибкой '
+            'обычной проверки уникальности.'
+        )
+
+    def test_03_concurrent_signups(self, django_user_model):
+        workers = 8
+        barrier = Barrier(workers)
+
+        def signup(_):
+            barrier.wait()
+            try:
+                return APIClient().post(
+                    self.URL_SIGNUP, data=self.DATA
+                ).status_code
+            finally:
+                connections.close_all()
+
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            statuses = list(executor.map(signup, range(workers)))
+        assert statuses == [HTTPStatus.OK] * workers
+        assert django_user_model.objects.count() == 1
@@ -0,0 +1,84 @@
+from http import HTTPStatus
+
+import pytest
+
+from core.metrics import reset_request_stats
+from tests.utils import create_titles
+
+
+@pytest.fixture(autouse=True)
+def clean_request_stats():
+    reset_request_stats()
+    yield
+    reset_request_stats()
+
+
+@pytest.mark.django_db(transaction=True)
+class Test17RequestStats:
+
+    TITLES_URL = '/api/v1/titles/'
+    STATS_URL = '/api/v1/stats/'
+    TITLES_VIEW_NAME = 'api:api:titles-list'
+
+    def test_01_server_timing_header(self, client):
+        response = client.get(self.TITLES_URL)
+        assert response.status_code == HTTPStatus.OK
+        assert 'Server-Timing' in response, (
+            'Проверьте, что ответ содержит заголовок `Server-Timing`.'
+        )
+        header = response['Server-Timing']
+        assert 'db;dur=' in header and 'total;dur=' in header, (
+            'Проверьте, что `Server-Timing` содержит время в БД и общее время.'
+        )
+
+    def test_02_stats_per_endpoint(self, admin_client, client):
+        create_titles(admin_client)
+        reset_request_stats()
+        for _ in range(3):
+            client.get(self.TITLES_URL + '?page=1')
+        client.get('/api/v1/missing/')
+
+        response = admin_client.get(self.STATS_URL)
+        assert response.status_code == HTTPStatus.OK
+        stats = response.json()
+        assert self.TITLES_VIEW_NAME in stats, (
+            'Проверьте, что статистика группируется по имени маршрута.'
+        )
+        assert '<unresolved>' in stats, (
+            'Проверьте, что запросы без маршрута учитываются отдельно.'
+        )
+        titles = stats[self.TITLES_VIEW_NAME]
+        assert titles['duration_ms']['count'] == 3
+        assert titles['queries']['count'] == 3
+        assert sum(titles['queries']['buckets'].values()) == 3
+        assert titles['queries']['max'] >= 1, (
+            'Проверьте, что учитываются запросы к БД.'
+        )
+        assert titles['duration_ms']['p50'] is not None
+
+    def test_03_stats_only_for_superuser(self, user_client, client):
+        assert client.get(self.STATS_URL).status_code == (
+            HTTPStatus.UNAUTHORIZED
+        )
+        assert user_client.get(self.STATS_URL).status_code == (
+            HTTPStatus.FORBIDDEN
+        )
+
+    def test_04_streaming_response_stats(self, admin_client):
+        create_titles(admin_client)
+        reset_request_stats()
+        response = admin_client.get('/api/v1/export/titles.ndjson')
+        assert response.status_code == HTTPStatus.OK
+        assert 'api:api:export' not in admin_client.get(
+            self.STATS_URL
+        ).json(), (
+            'Проверьте, что потоковый ответ учитывается только после '
+            'отдачи тела.'
+        )
+        b''.join(response.streaming_content)
+        export = admin_client.get(self.STATS_URL).json()['api:api:export']
+        assert export['queries']['count'] == 1
+        assert export['queries']['max'] >= 1, (
+            'Проверьте, что запросы к БД во время отдачи потокового ответа '
+            'учитываются в статистике.'
+        )
@@ -0,0 +1,77 @@
+import json
+
+import pytest
+from django.core.management import call_command
+from django.db.models import Count, Max
+
+from api.v1.urls import router_v1
+from reviews.dataset import seed_dataset
+from reviews.models import Comment, Review, Title
+
+
+@pytest.mark.django_db(transaction=True)
+class Test18Bench:
+
+    def test_01_seed_is_deterministic(self):
+        counts = seed_dataset(titles=5, reviews=20, comments=30, seed=1)
+        hottest = Review.objects.order_by().values('title').annotate(
+            total=Count('id')
+        ).aggregate(hottest=Max('total'))['hottest']
+        assert counts['users'] >= hottest, (
+            'Проверьте, что пользователей хватает на уникальные отзывы.'
+        )
+        assert Title.objects.count() == 5
+        assert Review.objects.count() == 20
+        assert Comment.objects.count() == 30
+        assert not Title.objects.filter(rating__isnull=True).exists(), (
+            'Проверьте, что после заполнения рейтинг пересчитан.'
+        )
+        first = list(Review.objects.order_by('pk').values_list('score'))
+        Title.objects.all().delete()
+        seed_dataset(titles=5, reviews=20, comments=30, seed=1)
+        assert first == list(
+            Review.objects.order_by('pk').values_list('score')
+        ), 'Проверьте, что одинаковое зерно даёт одинаковые данные.'
+
+    def test_02_bench_covers_all_routes(self, tmp_path):
+        output = tmp_path / 'bench.json'
+        call_command(
+            'bench', '--current-db', '--titles=5', '--reviews=20',
+            '--comments=30', '--requests=3', '--warmup=1',
+            f'--output={output}'
+        )
+        report = json.loads(output.read_text(encoding='utf-8'))
+        results = report['results']
+        assert report['meta']['uncovered_routes'] == []
+        for _, _, basename in router_v1.registry:
+            assert any(
+                name.startswith(f'{basename}-') for name in results
+            ), f'Проверьте, что бенчмарк покрывает маршрут `{basename}`.'
+        assert {'signup', 'token'} <= set(results)
+        for name, stats in results.items():
+            assert stats['p50_ms'] <= stats['p95_ms'] <= stats['p99_ms']
+            assert stats['throughput_rps'] > 0
+            assert set(stats['status_codes']) == {'200'}, (
+                f'Проверьте, что сценарий `{name}` получает успешные ответы.'
+            )
+
+    def test_03_bench_not_throttled(self, tmp_path, settings):
+        settings.REST_FRAMEWORK = dict(
+            settings.REST_FRAMEWORK,
+            DEFAULT_THROTTLE_RATES={
+                scope: '1/day'
+                for scope in settings.REST_FRAMEWORK['DEFAULT_THROTTLE_RATES']
+            }
+        )
+        output = tmp_path / 'bench.json'
+        call_command(
+            'bench', '--current-db', '--titles=5', '--reviews=20',
+            '--comments=30', '--requests=3', '--warmup=1',
+            '--routes', 'signup', 'token', f'--output={output}'
+        )
+        results = json.loads(output.read_text(encoding='utf-8'))['results']
+        for name in ('signup', 'token'):
+            assert results[name]['status_codes'] == {'200': 3}, (
+                f'Проверьте, что сценарий `{name}` не упирается в '
+                'ограничение частоты.'
+            )
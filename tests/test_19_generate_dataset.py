@@ -0,0 +1,95 @@
+import csv
+from io import StringIO
+
+import pytest
+from django.conf import settings
+from django.core.management import call_command
+from django.db.models import Count
+
+from reviews.dataset import zipf_allocation
+from reviews.models import Comment, Review, Title
+
+DATA_PATH = settings.BASE_DIR / 'static' / 'data'
+
+
+def csv_scores():
+    with open(DATA_PATH / 'review.csv', encoding='utf-8', newline='') as file:
+        return {int(row['score']) for row in csv.DictReader(file)}
+
+
+def generate(*args):
+    out = StringIO()
+    call_command('generate_dataset', *args, stdout=out)
+    return out.getvalue()
+
+
+def snapshot():
+    return (
+        list(Title.objects.order_by('pk').values_list(
+            'name', 'year', 'category__name'
+        )),
+        list(Review.objects.order_by('pk').values_list(
+            'title__name', 'score', 'pub_date'
+        )),
+        list(Comment.objects.order_by('pk').values_list(
+            'review__title__name', 'text'
+        )),
+    )
+
+
+@pytest.mark.django_db(transaction=True)
+class Test19GenerateDataset:
+
+    def test_01_zipf_allocation(self):
+        counts = zipf_allocation(1000, 50, 1.1)
+        assert sum(counts) == 1000
+        assert counts == sorted(counts, reverse=True)
+        assert counts[0] > 10 * counts[-1], (
+            'Проверьте, что распределение Ципфа даёт «горячие» корзины.'
+        )
+        assert set(zipf_allocation(100, 10, 0)) == {10}, (
+            'Проверьте, что нулевой показатель даёт равномерное распределение.'
+        )
+
+    def test_02_generated_shape(self):
+        output = generate(
+            '--titles=40', '--reviews=2000', '--comments=500', '--seed=3'
+        )
+        assert 'отзывов: 2000' in output
+        assert Title.objects.count() == 40
+        assert Review.objects.count() == 2000
+        assert Comment.objects.count() == 500
+        assert set(
+            Review.objects.values_list('score', flat=True)
+        ) <= csv_scores(), (
+            'Проверьте, что оценки берутся из распределения в CSV.'
+        )
+        per_title = sorted(
+            Review.objects.order_by().values('title').annotate(
+                total=Count('id')
+            ).values_list('total', flat=True),
+            reverse=True
+        )
+        assert per_title[0] > 5 * per_title[len(per_title) // 2], (
+            'Проверьте, что отзывы распределены по произведениям неравномерно.'
+        )
+        assert not Title.objects.filter(genre__isnull=True).exists(), (
+            'Проверьте, что у каждого произведения есть жанры, как в CSV.'
+        )
+        assert not Title.objects.filter(rating__isnull=True).exists()
+
+    def test_03_scaled_from_csv_and_deterministic(self):
+        generate('--titles=60', '--seed=5')
+        assert Review.objects.count() > Title.objects.count(), (
+            'Проверьте, что число отзывов по умолчанию масштабируется '
+            'по CSV.'
+        )
+        first = snapshot()
+        Title.objects.all().delete()
+        generate('--titles=60', '--seed=5')
+        assert snapshot() == first, (
+            'Проверьте, что одинаковое зерно даёт одинаковые данные.'
+        )
+        Title.objects.all().delete()
+        generate('--titles=60', '--seed=6')
+        assert snapshot() != first
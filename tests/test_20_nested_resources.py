@@ -0,0 +1,111 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from reviews.models import Comment, Review, Title
+
+REVIEWS_URL_TEMPLATE = '/api/v1/titles/{title_id}/reviews/'
+COMMENTS_URL_TEMPLATE = (
+    '/api/v1/titles/{title_id}/reviews/{review_id}/comments/'
+)
+
+
+def parent_selects(context, table):
+    """Запросы, которые выбирают строки родителя по его первичному ключу."""
+    return [
+        query['sql'] for query in context.captured_queries
+        if query['sql'].startswith('SELECT')
+        and f'FROM "{table}" WHERE' in query['sql']
+        and f'"{table}"."id" =' in query['sql']
+    ]
+
+
+@pytest.fixture
+def titles_with_review(user):
+    titles = [
+        Title.objects.create(name=f'Произведение {idx}', year=2000)
+        for idx in range(2)
+    ]
+    review = Review.objects.create(
+        title=titles[0], author=user, text='Отзыв', score=5
+    )
+    Comment.objects.create(review=review, author=user, text='Комментарий')
+    return titles, review
+
+
+@pytest.mark.django_db(transaction=True)
+class Test20NestedResources:
+
+    def test_01_comments_scoped_by_title(self, client, user_client,
+                                         titles_with_review):
+        titles, review = titles_with_review
+        comment = review.comments.get()
+        wrong_url = COMMENTS_URL_TEMPLATE.format(
+            title_id=titles[1].id, review_id=review.id
+        )
+        assert client.get(wrong_url).status_code == HTTPStatus.NOT_FOUND, (
+            'Проверьте, что комментарии отзыва недоступны по адресу '
+            'чужого произведения.'
+        )
+        assert client.get(
+            f'{wrong_url}{comment.id}/'
+        ).status_code == HTTPStatus.NOT_FOUND
+        response = user_client.post(wrong_url, data={'text': 'Текст'})
+        assert response.status_code == HTTPStatus.NOT_FOUND, (
+            'Проверьте, что нельзя оставить комментарий к отзыву по адресу '
+            'чужого произведения.'
+        )
+        assert Comment.objects.count() == 1
+
+    def test_02_missing_and_empty_parent(self, client, titles_with_review):
+        titles, _ = titles_with_review
+        response = client.get(REVIEWS_URL_TEMPLATE.format(title_id=0))
+        assert response.status_code == HTTPStatus.NOT_FOUND
+        response = client.get(
+            REVIEWS_URL_TEMPLATE.format(title_id=titles[1].id)
+        )
+        assert response.status_code == HTTPStatus.OK, (
+            'Проверьте, что у существующего произведения без отзывов '
+            'возвращается пустой список.'
+        )
+        assert response.json()['results'] == []
+        response = client.get(
+            REVIEWS_URL_TEMPLATE.format(title_id=titles[1].id)
+            + '?pagination=cursor'
+        )
+        assert response.status_code == HTTPStatus.OK
+        assert response.json()['results'] == []
+
+    def test_03_parent_is_not_fetched_for_reads(self, client,
+                                                titles_with_review):
+        titles, review = titles_with_review
+        reviews_url = REVIEWS_URL_TEMPLATE.format(title_id=titles[0].id)
+        comments_url = COMMENTS_URL_TEMPLATE.format(
+            title_id=titles[0].id, review_id=review.id
+        )
+        for url, table in (
+            (reviews_url, 'reviews_title'),
+            (f'{reviews_url}{review.id}/', 'reviews_title'),
+            (comments_url, 'reviews_review'),
+        ):
+            with CaptureQueriesContext(connection) as context:
+                assert client.get(url).status_code == HTTPStatus.OK
+            assert len(parent_selects(context, table)) <= 1, (
+                f'Проверьте, что `{url}` не загружает родителя отдельно от '
+                'проверки даты изменения.'
+            )
+
+    def test_04_parent_fetched_once_on_create(self, user_client,
+                                              titles_with_review):
+        titles, review = titles_with_review
+        url = COMMENTS_URL_TEMPLATE.format(
+            title_id=titles[0].id, review_id=review.id
+        )
+        with CaptureQueriesContext(connection) as context:
+            response = user_client.post(url, data={'text': 'Текст'})
+        assert response.status_code == HTTPStatus.CREATED
+        assert len(parent_selects(context, 'reviews_review')) == 1, (
+            'Проверьте, что отзыв загружается один раз за запрос.'
+        )
@@ -0,0 +1,98 @@
+from http import HTTPStatus
+
+import pytest
+from rest_framework.pagination import PageNumberPagination
+
+from reviews.models import Comment, Review, Title
+
+REVIEWS_URL_TEMPLATE = '/api/v1/titles/{title_id}/reviews/'
+COMMENTS_URL_TEMPLATE = (
+    '/api/v1/titles/{title_id}/reviews/{review_id}/comments/'
+)
+
+# Дата изменения для ETag, COUNT для пагинации, объекты вместе с авторами.
+LIST_QUERIES = 3
+# Дата изменения для ETag, объект вместе с автором.
+DETAIL_QUERIES = 2
+
+
+def create_thread(django_user_model, size):
+    django_user_model.objects.bulk_create(
+        django_user_model(
+            username=f'author{idx}', email=f'author{idx}@yamdb.fake'
+        )
+        for idx in range(size)
+    )
+    authors = list(django_user_model.objects.order_by('id'))
+    title = Title.objects.create(name='Произведение', year=2000)
+    Review.objects.bulk_create(
+        Review(title=title, author=author, text='Отзыв', score=5)
+        for author in authors
+    )
+    review = Review.objects.order_by('id').first()
+    Comment.objects.bulk_create(
+        Comment(review=review, author=author, text='Комментарий')
+        for author in authors
+    )
+    return title, review
+
+
+@pytest.mark.django_db(transaction=True)
+class Test21ReviewQueries:
+
+    @pytest.mark.parametrize('page_size', (10, 100))
+    def test_01_list_queries(self, client, monkeypatch, django_user_model,
+                             django_assert_num_queries, page_size):
+        title, review = create_thread(django_user_model, page_size)
+        monkeypatch.setattr(PageNumberPagination, 'page_size', page_size)
+        for url in (
+            REVIEWS_URL_TEMPLATE.format(title_id=title.id),
+            COMMENTS_URL_TEMPLATE.format(
+                title_id=title.id, review_id=review.id
+            ),
+        ):
+            with django_assert_num_queries(LIST_QUERIES):
+                response = client.get(url)
+            assert response.status_code == HTTPStatus.OK
+            results = response.json()['results']
+            assert len(results) == page_size
+            assert {item['author'] for item in results} == {
+                f'author{idx}' for idx in range(page_size)
+            }, f'Проверьте, что `{url}` возвращает имена авторов.'
+
+    def test_02_detail_queries(self, client, django_user_model,
+                               django_assert_num_queries):
+        title, review = create_thread(django_user_model, 3)
+        comment = review.comments.order_by('id').first()
+        for url, author in (
+            (
+                f'{REVIEWS_URL_TEMPLATE.format(title_id=title.id)}'
+                f'{review.id}/',
+                review.author.username
+            ),
+            (
+                COMMENTS_URL_TEMPLATE.format(
+                    title_id=title.id, review_id=review.id
+                ) + f'{comment.id}/',
+                comment.author.username
+            ),
+        ):
+            with django_assert_num_queries(DETAIL_QUERIES):
+                response = client.get(url)
+            assert response.status_code == HTTPStatus.OK
+            assert response.json()['author'] == author
+
+    def test_03_update_keeps_modification_date(self, user_client, user):
+        title = Title.objects.create(name='Произведение', year=2000)
+        review = Review.objects.create(
+            title=title, author=user, text='Отзыв', score=5
+        )
+        url = f'{REVIEWS_URL_TEMPLATE.format(title_id=title.id)}{review.id}/'
+        response = user_client.patch(url, data={'text': 'Новый текст'})
+        assert response.status_code == HTTPStatus.OK
+        assert response.json()['author'] == user.username
+        updated = Review.objects.get(pk=review.pk)
+        assert updated.text == 'Новый текст'
+        assert updated.updated_at > review.updated_at, (
+            'Проверьте, что изменение отзыва обновляет дату изменения.'
+        )
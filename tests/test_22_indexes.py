@@ -0,0 +1,92 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from reviews.models import Category, Comment, Review, Title
+
+REVIEWS_URL_TEMPLATE = '/api/v1/titles/{title_id}/reviews/'
+COMMENTS_URL_TEMPLATE = (
+    '/api/v1/titles/{title_id}/reviews/{review_id}/comments/'
+)
+TITLES_URL = '/api/v1/titles/'
+
+
+def query_plans(client, url, table):
+    """Планы выполнения SELECT-запросов к таблице, выполненных по url."""
+    with CaptureQueriesContext(connection) as context:
+        response = client.get(url)
+    assert response.status_code == HTTPStatus.OK
+    plans = []
+    with connection.cursor() as cursor:
+        for query in context.captured_queries:
+            sql = query['sql']
+            if not sql.startswith('SELECT') or 'ORDER BY' not in sql:
+                continue
+            if f'FROM "{table}"' not in sql:
+                continue
+            cursor.execute(f'EXPLAIN QUERY PLAN {sql}')
+            plans.append(' '.join(row[-1] for row in cursor.fetchall()))
+    assert plans, f'Проверьте, что `{url}` выбирает строки из `{table}`.'
+    return plans
+
+
+@pytest.fixture
+def catalog(user):
+    category = Category.objects.create(name='Фильм', slug='films')
+    title = Title.objects.create(name='Фильм', year=2000, category=category)
+    review = Review.objects.create(
+        title=title, author=user, text='Отзыв', score=5
+    )
+    Comment.objects.create(review=review, author=user, text='Комментарий')
+    return category, title, review
+
+
+@pytest.mark.skipif(
+    connection.vendor != 'sqlite',
+    reason='Проверяется план запроса SQLite.'
+)
+@pytest.mark.django_db(transaction=True)
+class Test22Indexes:
+
+    @pytest.mark.parametrize('pagination', ('', '?pagination=cursor'))
+    def test_01_nested_lists_use_indexes(self, client, catalog, pagination):
+        _, title, review = catalog
+        cases = (
+            (
+                REVIEWS_URL_TEMPLATE.format(title_id=title.id),
+                'reviews_review',
+                'review_title_pub_date_idx'
+            ),
+            (
+                COMMENTS_URL_TEMPLATE.format(
+                    title_id=title.id, review_id=review.id
+                ),
+                'reviews_comment',
+                'comment_review_created_idx'
+            ),
+        )
+        for url, table, index in cases:
+            for plan in query_plans(client, url + pagination, table):
+                assert index in plan, (
+                    f'Проверьте, что список `{url}` выбирается по индексу '
+                    f'`{index}`, а не {plan!r}.'
+                )
+                assert 'TEMP B-TREE' not in plan, (
+                    f'Проверьте, что список `{url}` не сортируется отдельно.'
+                )
+
+    @pytest.mark.parametrize('query, index', (
+        ('?year=2000', 'title_year_rating_idx'),
+        ('?category=films', 'title_category_rating_idx'),
+    ))
+    def test_02_title_filters_use_indexes(self, client, catalog, query,
+                                          index):
+        for plan in query_plans(
+            client, TITLES_URL + query, 'reviews_title'
+        ):
+            assert index in plan, (
+                f'Проверьте, что фильтр `{query}` использует индекс '
+                f'`{index}`, а не {plan!r}.'
+            )
@@ -0,0 +1,142 @@
+import json
+from http import HTTPStatus
+
+import pytest
+from django.core.management import call_command
+from django.db import connection
+
+from reviews.models import Review, Title
+from reviews.search import LikeSearchBackend, get_search_backend
+from reviews.signals import catalog_loaded
+
+SEARCH_URL = '/api/v1/titles/search/'
+
+
+@pytest.fixture(autouse=True)
+def empty_search_index(transactional_db):
+    # Очистка таблиц между тестами не затрагивает FTS-индекс.
+    get_search_backend().rebuild()
+
+
+def search(client, query):
+    response = client.get(SEARCH_URL, {'q': query})
+    assert response.status_code == HTTPStatus.OK, response.content
+    return [title['id'] for title in response.json()['results']]
+
+
+@pytest.mark.django_db(transaction=True)
+class Test23Search:
+
+    def test_01_search_fields_and_prefix(self, client, user):
+        shawshank = Title.objects.create(
+            name='Побег из Шоушенка', year=1994,
+            description='Тюремная драма'
+        )
+        godfather = Title.objects.create(name='Крестный отец', year=1972)
+        Review.objects.create(
+            title=godfather, author=user, score=9,
+            text='Лучшая гангстерская сага'
+        )
+        assert search(client, 'шоушенка') == [shawshank.id]
+        assert search(client, 'Шоушен') == [shawshank.id], (
+            'Проверьте, что поиск работает по префиксу слова.'
+        )
+        assert search(client, 'тюремн') == [shawshank.id], (
+            'Проверьте, что поиск идёт по описанию произведения.'
+        )
+        assert search(client, 'гангстерская') == [godfather.id], (
+            'Проверьте, что поиск идёт по текстам отзывов.'
+        )
+        assert search(client, 'побег отец') == [], (
+            'Проверьте, что в результатах есть все слова запроса.'
+        )
+
+    def test_02_ranking(self, client, user):
+        by_review = Title.objects.create(name='Сталкер', year=1979)
+        Review.objects.create(
+            title=by_review, author=user, score=10, text='Почти как Солярис'
+        )
+        by_name = Title.objects.create(name='Солярис', year=1972)
+        assert search(client, 'солярис') == [by_name.id, by_review.id], (
+            'Проверьте, что совпадение в названии важнее совпадения в отзыве.'
+        )
+
+    def test_03_index_follows_changes(self, client, user):
+        title = Title.objects.create(name='Сталкер', year=1979)
+        review = Review.objects.create(
+            title=title, author=user, score=10, text='Зона'
+        )
+        title.name = 'Солярис'
+        title.save()
+        assert search(client, 'сталкер') == []
+        assert search(client, 'солярис') == [title.id]
+        review.delete()
+        assert search(client, 'зона') == []
+        title.delete()
+        assert search(client, 'солярис') == []
+
+        Title.objects.bulk_create([Title(name='Зеркало', year=1975)])
+        catalog_loaded.send(sender=Title)
+        assert len(search(client, 'зеркало')) == 1, (
+            'Проверьте, что индекс перестраивается после массовой загрузки.'
+        )
+
+    def test_04_pagination_and_validation(self, client):
+        Title.objects.bulk_create(
+            Title(name=f'Фильм {idx}', year=2000) for idx in range(15)
+        )
+        catalog_loaded.send(sender=Title)
+        response = client.get(SEARCH_URL, {'q': 'фильм'})
+        data = response.json()
+        assert data['count'] == 15
+        assert len(data['results']) == 10
+        assert {'id', 'name', 'genre', 'category'} <= set(data['results'][0])
+        assert len(client.get(
+            SEARCH_URL, {'q': 'фильм', 'page': 2}
+        ).json()['results']) == 5
+        response = client.get(SEARCH_URL, {'q': ' ,. '})
+        assert response.status_code == HTTPStatus.BAD_REQUEST, (
+            'Проверьте, что пустой запрос отклоняется.'
+        )
+
+    @pytest.mark.parametrize(
+        'backend', (get_search_backend, LikeSearchBackend)
+    )
+    def test_05_same_semantics_for_backends(self, backend, user):
+        matrix = Title.objects.create(name='Matrix', year=1999)
+        Review.objects.create(
+            title=matrix, author=user, score=8, text='red pill'
+        )
+        reloaded = Title.objects.create(
+            name='Matrix Reloaded', year=2003, description='sequel'
+        )
+        Review.objects.create(
+            title=reloaded, author=user, score=6, text='blue pill'
+        )
+        backend = backend()
+        for tokens, expected in (
+            (['matrix'], {matrix.id, reloaded.id}),
+            (['pill'], {matrix.id, reloaded.id}),
+            (['matrix', 'reloaded'], {reloaded.id}),
+            (['matrix', 'red'], {matrix.id}),
+            (['sequel', 'blue'], {reloaded.id}),
+            (['red', 'blue'], set()),
+        ):
+            assert set(backend.search(tokens, 10)) == expected, (
+                'Проверьте, что во всех бэкендах поиска каждое слово ищется '
+                'в названии, описании или любом отзыве произведения, '
+                f'запрос: {tokens}.'
+            )
+
+    def test_06_bench_search(self, tmp_path):
+        output = tmp_path / 'search.json'
+        call_command(
+            'bench_search', '--current-db', '--titles=20', '--reviews=60',
+            '--queries=5', '--repeat=1', f'--output={output}'
+        )
+        results = json.loads(output.read_text(encoding='utf-8'))['results']
+        assert set(results) == {connection.vendor, 'like'}, (
+            'Проверьте, что бенчмарк сравнивает FTS и LIKE.'
+        )
+        for stats in results.values():
+            assert stats['p50_ms'] <= stats['p99_ms']
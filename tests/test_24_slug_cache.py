@@ -0,0 +1,159 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from api.v1.cache import bump_versions
+from api.v1.slugs import (
+    SlugCache,
+    category_slugs,
+    genre_slugs,
+    slug_cache_enabled
+)
+from reviews.models import Category, Genre, Title
+
+TITLES_URL = '/api/v1/titles/'
+
+
+def slug_queries(context):
+    return [
+        query['sql'] for query in context.captured_queries
+        if '"slug" IN' in query['sql'] or '"slug" =' in query['sql']
+    ]
+
+
+@pytest.fixture(autouse=True)
+def slug_cache(settings):
+    settings.SLUG_CACHE_ENABLED = True
+
+
+@pytest.fixture
+def catalog():
+    category_slugs.clear()
+    genre_slugs.clear()
+    category = Category.objects.create(name='Фильм', slug='movie')
+    genre = Genre.objects.create(name='Драма', slug='drama')
+    title = Title.objects.create(name='Сталкер', year=1979, category=category)
+    title.genre.set([genre])
+    return category, genre, title
+
+
+@pytest.mark.django_db(transaction=True)
+class Test24SlugCache:
+
+    def test_01_filters_use_cache(self, client, catalog):
+        _, _, title = catalog
+        client.get(TITLES_URL, {'genre': 'drama', 'category': 'movie'})
+        with CaptureQueriesContext(connection) as context:
+            response = client.get(
+                TITLES_URL, {'genre': 'drama', 'category': 'movie', 'page': 1}
+            )
+        assert response.status_code == HTTPStatus.OK
+        assert [item['id'] for item in response.json()['results']] == [
+            title.id
+        ]
+        assert not slug_queries(context), (
+            'Проверьте, что фильтр по slug не обращается к базе за id.'
+        )
+        assert not any(
+            'JOIN "reviews_genre"' in query['sql']
+            for query in context.captured_queries
+            if query['sql'].startswith('SELECT COUNT')
+        ), 'Проверьте, что фильтр по жанру не соединяет таблицу жанров.'
+        response = client.get(TITLES_URL, {'genre': 'unknown'})
+        assert response.json()['results'] == []
+
+    def test_02_writes_use_cache(self, admin_client, catalog):
+        data = {
+            'name': 'Солярис',
+            'year': 1972,
+            'category': 'movie',
+            'genre': ['drama'],
+        }
+        assert admin_client.post(
+            TITLES_URL, data=data
+        ).status_code == HTTPStatus.CREATED
+        with CaptureQueriesContext(connection) as context:
+            response = admin_client.post(TITLES_URL, data=data)
+        assert response.status_code == HTTPStatus.CREATED
+        assert response.json()['category'] == {
+            'name': 'Фильм', 'slug': 'movie'
+        }
+        assert response.json()['genre'] == [{'name': 'Драма', 'slug': 'drama'}]
+        assert not slug_queries(context), (
+            'Проверьте, что запись произведения берёт id по slug из кэша.'
+        )
+        data['category'] = 'unknown'
+        assert admin_client.post(
+            TITLES_URL, data=data
+        ).status_code == HTTPStatus.NOT_FOUND
+
+    def test_03_invalidation(self, admin_client, catalog):
+        category, genre, _ = catalog
+        assert category_slugs.get('movie').pk == category.pk
+        admin_client.delete('/api/v1/categories/movie/')
+        assert category_slugs.get('movie') is None, (
+            'Проверьте, что удаление категории сбрасывает кэш slug.'
+        )
+
+        assert genre_slugs.get('drama').name == 'Драма'
+        # Изменение в другом процессе: сигналов здесь нет, только версия.
+        Genre.objects.filter(pk=genre.pk).update(name='Комедия')
+        assert genre_slugs.get('drama').name == 'Драма'
+        bump_versions('genres')
+        assert genre_slugs.get('drama').name == 'Комедия', (
+            'Проверьте, что кэш slug сбрасывается по версии в общем кэше.'
+        )
+
+    def test_04_size_is_bounded(self, catalog):
+        Genre.objects.bulk_create(
+            Genre(name=f'Жанр {idx}', slug=f'genre-{idx}') for idx in range(3)
+        )
+        slugs = SlugCache(Genre, 'genres', maxsize=2)
+        found = slugs.resolve(['genre-0', 'genre-1', 'genre-2'])
+        assert len(found) == 3
+        assert list(slugs.items) == ['genre-1', 'genre-2'], (
+            'Проверьте, что кэш вытесняет давно не использованные slug.'
+        )
+
+    def test_05_local_cache_reads_db(self, settings, admin_client, catalog):
+        category, _, _ = catalog
+        settings.SLUG_CACHE_ENABLED = None
+        settings.CACHES = {
+            'default': {
+                'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+            }
+        }
+        assert not slug_cache_enabled(), (
+            'Проверьте, что с кэшем в памяти процесса кэш slug выключен.'
+        )
+        assert category_slugs.get('movie').name == 'Фильм'
+        # Изменение в другом воркере: ни сигналов, ни общей версии.
+        Category.objects.filter(pk=category.pk).update(name='Кино')
+        assert category_slugs.get('movie').name == 'Кино', (
+            'Проверьте, что без общего кэша slug читаются из базы.'
+        )
+        assert not category_slugs.items
+
+    def test_06_deleted_category_on_write(self, admin_client, catalog):
+        Category.objects.create(name='Книга', slug='book')
+        assert category_slugs.get('book') is not None
+        with connection.cursor() as cursor:
+            cursor.execute(
+                'DELETE FROM reviews_category WHERE slug = %s', ['book']
+            )
+        response = admin_client.post(TITLES_URL, data={
+            'name': 'Пикник на обочине',
+            'year': 1972,
+            'category': 'book',
+            'genre': ['drama'],
+        })
+        assert response.status_code == HTTPStatus.BAD_REQUEST, (
+            'Проверьте, что запись с удалённой в другом процессе категорией '
+            'возвращает статус 400, а не 500.'
+        )
+        assert not Title.objects.filter(name='Пикник на обочине').exists()
+        assert category_slugs.get('book') is None, (
+            'Проверьте, что после ошибки кэш slug сбрасывается.'
+        )
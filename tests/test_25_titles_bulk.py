@@ -0,0 +1,144 @@
+import json
+from http import HTTPStatus
+from time import perf_counter
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from reviews.models import Category, Genre, Title
+from reviews.search import get_search_backend
+
+BULK_URL = '/api/v1/titles/bulk/'
+TITLES_URL = '/api/v1/titles/'
+# Категории по slug, жанры по slug, id вставленных строк (SQLite) —
+# не считая самих INSERT.
+BULK_SELECTS = 3
+
+
+@pytest.fixture
+def catalog():
+    get_search_backend().rebuild()
+    Category.objects.create(name='Фильм', slug='movie')
+    Genre.objects.create(name='Драма', slug='drama')
+    Genre.objects.create(name='Комедия', slug='comedy')
+
+
+def titles(count, **extra):
+    return [
+        {
+            'name': f'Произведение {idx}',
+            'year': 2000,
+            'category': 'movie',
+            'genre': ['drama', 'comedy'],
+            **extra,
+        }
+        for idx in range(count)
+    ]
+
+
+@pytest.mark.django_db(transaction=True)
+class Test25TitlesBulk:
+
+    def test_01_only_admin(self, client, user_client, catalog):
+        assert client.post(
+            BULK_URL, data=json.dumps(titles(1)),
+            content_type='application/json'
+        ).status_code == HTTPStatus.UNAUTHORIZED
+        assert user_client.post(
+            BULK_URL, data=titles(1), format='json'
+        ).status_code == HTTPStatus.FORBIDDEN
+
+    def test_02_json_array(self, admin_client, client, catalog):
+        client.get(TITLES_URL)
+        with CaptureQueriesContext(connection) as context:
+            response = admin_client.post(
+                BULK_URL, data=titles(50), format='json'
+            )
+        assert response.status_code == HTTPStatus.CREATED
+        data = response.json()
+        assert data['created'] == 50 and data['failed'] == 0
+        ids = [result['id'] for result in data['results']]
+        assert ids == sorted(ids)
+        assert set(Title.objects.values_list('id', flat=True)) == set(ids)
+        assert Title.genre.through.objects.count() == 100
+        selects = [
+            query for query in context.captured_queries
+            if query['sql'].startswith('SELECT')
+            and 'users_' not in query['sql']
+        ]
+        assert len(selects) <= BULK_SELECTS, (
+            'Проверьте, что slug разрешаются одним запросом на модель.'
+        )
+
+        title = Title.objects.get(pk=ids[7])
+        assert title.name == 'Произведение 7'
+        assert sorted(title.genre.values_list('slug', flat=True)) == [
+            'comedy', 'drama'
+        ]
+        listing = client.get(TITLES_URL).json()
+        assert listing['count'] == 50, (
+            'Проверьте, что массовая загрузка сбрасывает кэш списка.'
+        )
+        found = client.get(TITLES_URL + 'search/', {'q': 'произведение'})
+        assert found.json()['count'] == 50, (
+            'Проверьте, что новые произведения попадают в поиск.'
+        )
+
+    def test_03_ndjson_and_item_errors(self, admin_client, catalog):
+        items = titles(2) + [
+            {'name': 'Без года', 'category': 'movie'},
+            {'name': 'Чужая категория', 'year': 2000, 'category': 'book'},
+            {'name': 'Чужой жанр', 'year': 2000, 'category': 'movie',
+             'genre': ['drama', 'horror']},
+            {'name': 'Из будущего', 'year': 3000, 'category': 'movie'},
+            'не объект',
+        ]
+        body = '\n'.join(json.dumps(item, ensure_ascii=False) for item in items)
+        response = admin_client.post(
+            BULK_URL,
+            data=body.encode(),
+            content_type='application/x-ndjson'
+        )
+        assert response.status_code == HTTPStatus.MULTI_STATUS
+        data = response.json()
+        assert data['created'] == 2 and data['failed'] == 5
+        results = data['results']
+        assert [result['index'] for result in results] == list(range(7))
+        assert 'id' in results[0] and 'id' in results[1]
+        assert 'year' in results[2]['errors']
+        assert 'category' in results[3]['errors']
+        assert 'genre' in results[4]['errors']
+        assert 'year' in results[5]['errors']
+        assert results[6]['errors']
+        assert Title.objects.count() == 2
+
+    def test_04_bad_payloads(self, admin_client, catalog):
+        response = admin_client.post(
+            BULK_URL, data=titles(1)[0], format='json'
+        )
+        assert response.status_code == HTTPStatus.BAD_REQUEST
+        response = admin_client.post(
+            BULK_URL, data=b'{"name": "ok"}\n{oops',
+            content_type='application/x-ndjson'
+        )
+        assert response.status_code == HTTPStatus.BAD_REQUEST
+        assert 'Строка 2' in response.json()['detail']
+        response = admin_client.post(
+            BULK_URL, data=titles(1, category='book'), format='json'
+        )
+        assert response.status_code == HTTPStatus.BAD_REQUEST
+        assert response.json()['created'] == 0
+
+    def test_05_large_batch_is_fast(self, admin_client, catalog):
+        started = perf_counter()
+        response = admin_client.post(
+            BULK_URL, data=titles(5000), format='json'
+        )
+        elapsed = perf_counter() - started
+        assert response.status_code == HTTPStatus.CREATED
+        assert Title.objects.count() == 5000
+        assert elapsed < 10, (
+            'Проверьте, что массовая загрузка не создаёт произведения '
+            f'по одному: 5000 произведений за {elapsed:.1f} с.'
+        )
@@ -0,0 +1,98 @@
+from http import HTTPStatus
+
+import pytest
+
+ME_URL = '/api/v1/users/me/'
+USERS_URL = '/api/v1/users/'
+USER_DETAIL_URL_TEMPLATE = '/api/v1/users/{username}/'
+
+# Пользователь из кэша, полная запись пользователя для ответа.
+ME_QUERIES = 1
+# Без кэша: ещё запрос поля для аутентификации.
+ME_UNCACHED_QUERIES = 2
+
+
+@pytest.fixture(autouse=True)
+def auth_cache_enabled(settings):
+    settings.AUTH_CACHE_ENABLED = True
+
+
+@pytest.mark.django_db(transaction=True)
+class Test26AuthCache:
+
+    def test_01_cached_user_skips_db(self, user, user_client,
+                                     django_assert_num_queries):
+        assert user_client.get(ME_URL).status_code == HTTPStatus.OK
+        with django_assert_num_queries(ME_QUERIES):
+            response = user_client.get(ME_URL)
+        assert response.status_code == HTTPStatus.OK, (
+            f'Проверьте, что GET-запрос к `{ME_URL}` с токеном возвращает '
+            'статус 200.'
+        )
+        data = response.json()
+        assert data['email'] == user.email and data['bio'] == user.bio, (
+            f'Проверьте, что ответ на GET-запрос к `{ME_URL}` содержит все '
+            'поля пользователя, а не только закэшированные.'
+        )
+
+    def test_02_role_change_via_api(self, user, user_client, admin_client):
+        assert user_client.get(USERS_URL).status_code == HTTPStatus.FORBIDDEN
+        response = admin_client.patch(
+            USER_DETAIL_URL_TEMPLATE.format(username=user.username),
+            data={'role': 'admin'}
+        )
+        assert response.status_code == HTTPStatus.OK
+        assert user_client.get(USERS_URL).status_code == HTTPStatus.OK, (
+            'Проверьте, что после смены роли пользователя через API его '
+            'закэшированные права сбрасываются.'
+        )
+
+    def test_03_deactivation_via_save(self, user, user_client):
+        assert user_client.get(ME_URL).status_code == HTTPStatus.OK
+        user.is_active = False
+        user.save()
+        assert user_client.get(ME_URL).status_code == (
+            HTTPStatus.UNAUTHORIZED
+        ), (
+            'Проверьте, что после деактивации пользователя его токен '
+            'перестаёт приниматься, несмотря на кэш.'
+        )
+
+    def test_04_deleted_user(self, user, user_client):
+        assert user_client.get(ME_URL).status_code == HTTPStatus.OK
+        user.delete()
+        assert user_client.get(ME_URL).status_code == (
+            HTTPStatus.UNAUTHORIZED
+        ), (
+            'Проверьте, что токен удалённого пользователя перестаёт '
+            'приниматься, несмотря на кэш.'
+        )
+
+    def test_05_update_myself_keeps_role(self, user, user_client):
+        response = user_client.patch(
+            ME_URL, data={'bio': 'Новая биография', 'role': 'admin'}
+        )
+        assert response.status_code == HTTPStatus.OK
+        user.refresh_from_db()
+        assert user.bio == 'Новая биография'
+        assert user.role == 'user', (
+            f'Проверьте, что PATCH-запрос к `{ME_URL}` не меняет роль '
+            'пользователя.'
+        )
+
+    def test_06_local_cache_disabled_in_production(
+            self, settings, user_client, django_assert_num_queries):
+        settings.AUTH_CACHE_ENABLED = None
+        settings.DEBUG = False
+        settings.CACHES = {
+            'default': {
+                'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+            }
+        }
+        assert user_client.get(ME_URL).status_code == HTTPStatus.OK
+        with django_assert_num_queries(ME_UNCACHED_QUERIES):
+            response = user_client.get(ME_URL)
+        assert response.status_code == HTTPStatus.OK, (
+            f'Проверьте, что GET-запрос к `{ME_URL}` с токеном возвращает '
+            'статус 200.'
+        )
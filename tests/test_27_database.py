@@ -0,0 +1,128 @@
+import django
+import pytest
+from django.core.signals import request_started
+from django.db import OperationalError, connection, connections, transaction
+from django.db.backends.sqlite3.base import DatabaseWrapper
+
+from core.constants import SQLITE_BUSY_TIMEOUT, SQLITE_MMAP_SIZE
+from core.db import bulk_insert, close_if_unhealthy, lock_for_insert
+from reviews.models import Title
+
+# Значение PRAGMA synchronous для NORMAL.
+SYNCHRONOUS_NORMAL = 1
+
+
+@pytest.fixture
+def sqlite_file(tmp_path):
+    wrapper = DatabaseWrapper(
+        {
+            **connection.settings_dict,
+            'NAME': str(tmp_path / 'db.sqlite3'),
+            'CONN_HEALTH_CHECKS': True,
+        },
+        alias='sqlite_file'
+    )
+    yield wrapper
+    wrapper.close()
+
+
+def pragma(wrapper, name):
+    with wrapper.cursor() as cursor:
+        cursor.execute(f'PRAGMA {name}')
+        return cursor.fetchone()[0]
+
+
+@pytest.mark.django_db(transaction=True)
+@pytest.mark.skipif(
+    connection.vendor != 'sqlite', reason='Проверка настроек SQLite'
+)
+class Test27Database:
+
+    def test_01_sqlite_pragmas(self, sqlite_file):
+        assert pragma(sqlite_file, 'journal_mode') == 'wal', (
+            'Проверьте, что соединения с SQLite работают в режиме WAL.'
+        )
+        assert pragma(sqlite_file, 'synchronous') == SYNCHRONOUS_NORMAL, (
+            'Проверьте, что для SQLite установлен synchronous=NORMAL.'
+        )
+        assert pragma(sqlite_file, 'busy_timeout') == SQLITE_BUSY_TIMEOUT
+        assert pragma(sqlite_file, 'mmap_size') == SQLITE_MMAP_SIZE
+
+    def test_02_unhealthy_connection_closed(self, sqlite_file, monkeypatch):
+        sqlite_file.ensure_connection()
+        close_if_unhealthy(sqlite_file)
+        assert sqlite_file.connection is not None, (
+            'Проверьте, что рабочее постоянное соединение не закрывается.'
+        )
+        monkeypatch.setattr(sqlite_file, 'is_usable', lambda: False)
+        close_if_unhealthy(sqlite_file)
+        assert sqlite_file.connection is None, (
+            'Проверьте, что неотвечающее постоянное соединение закрывается '
+            'перед обработкой запроса.'
+        )
+
+    def test_03_health_checks_disabled(self, sqlite_file, monkeypatch):
+        sqlite_file.settings_dict['CONN_HEALTH_CHECKS'] = False
+        sqlite_file.ensure_connection()
+        monkeypatch.setattr(sqlite_file, 'is_usable', lambda: False)
+        close_if_unhealthy(sqlite_file)
+        assert sqlite_file.connection is not None
+
+    def test_04_lock_for_insert(self):
+        other = DatabaseWrapper(
+            {**connection.settings_dict}, alias='other'
+        )
+        try:
+            with transaction.atomic():
+                lock_for_insert(connection, Title)
+                with other.cursor() as cursor:
+                    cursor.execute('PRAGMA busy_timeout = 0')
+                    with pytest.raises(OperationalError):
+                        cursor.execute('BEGIN IMMEDIATE')
+        finally:
+            other.close()
+
+    def test_05_bulk_insert_ids(self):
+        Title.objects.create(name='Раньше', year=2000)
+        ids = bulk_insert(Title, (
+            Title(name=f'Новое {number}', year=2000) for number in range(5)
+        ), 2)
+        assert [
+            Title.objects.get(pk=pk).name for pk in ids
+        ] == [f'Новое {number}' for number in range(5)], (
+            'Проверьте, что bulk_insert возвращает id вставленных строк '
+            'в порядке объектов.'
+        )
+
+    @pytest.mark.skipif(
+        django.VERSION >= (4, 1), reason='Проверка встроена в Django 4.1'
+    )
+    def test_06_health_check_on_first_use(self, sqlite_file, monkeypatch):
+        sqlite_file.ensure_connection()
+        checks = []
+
+        def is_usable():
+            checks.append(True)
+            return False
+
+        monkeypatch.setattr(sqlite_file, 'is_usable', is_usable)
+        monkeypatch.setattr(
+            connections, 'all', lambda: [sqlite_file]
+        )
+        request_started.send(sender=None)
+        assert not checks, (
+            'Проверьте, что соединение не проверяется в начале запроса, '
+            'пока к базе не обратились.'
+        )
+        first = sqlite_file.connection
+        with sqlite_file.cursor() as cursor:
+            cursor.execute('SELECT 1')
+        with sqlite_file.cursor() as cursor:
+            cursor.execute('SELECT 1')
+        assert len(checks) == 1, (
+            'Проверьте, что соединение проверяется один раз, при первом '
+            'обращении к базе.'
+        )
+        assert sqlite_file.connection is not first, (
+            'Проверьте, что неотвечающее соединение открывается заново.'
+        )
@@ -0,0 +1,208 @@
+import random
+from http import HTTPStatus
+
+import pytest
+
+from reviews.models import Comment, Review, Title, TitleStats
+
+TITLE_DETAIL_URL_TEMPLATE = '/api/v1/titles/{title_id}/'
+TITLE_STATS_URL_TEMPLATE = '/api/v1/titles/{title_id}/stats/'
+TITLES_URL = '/api/v1/titles/'
+REVIEWS_URL_TEMPLATE = '/api/v1/titles/{title_id}/reviews/'
+COMMENTS_URL_TEMPLATE = (
+    '/api/v1/titles/{title_id}/reviews/{review_id}/comments/'
+)
+
+# Дата изменения для ETag, строка статистики.
+STATS_QUERIES = 2
+# COUNT для пагинации, произведения вместе с категорией и статистикой,
+# жанры.
+TITLES_LIST_QUERIES = 3
+
+STATS_FIELDS = ('reviews_count', 'comments_count', 'last_review_at')
+
+
+def stats_snapshot(title_id):
+    stats = TitleStats.objects.get(pk=title_id)
+    return {
+        field: getattr(stats, field) for field in STATS_FIELDS
+    }, stats.scores
+
+
+@pytest.mark.django_db(transaction=True)
+class Test28TitleStats:
+
+    def test_01_stats_follow_writes(self, user_client, moderator_client):
+        title = Title.objects.create(name='Произведение', year=2000)
+        stats_url = TITLE_STATS_URL_TEMPLATE.format(title_id=title.id)
+        response = user_client.get(stats_url)
+        assert response.status_code == HTTPStatus.OK, (
+            f'Проверьте, что GET-запрос к `{TITLE_STATS_URL_TEMPLATE}` '
+            'возвращает статус 200.'
+        )
+        assert response.json() == {
+            'reviews_count': 0,
+            'comments_count': 0,
+            'last_review_at': None,
+            'scores': {str(score): 0 for score in range(1, 11)},
+        }
+
+        response = user_client.post(
+            REVIEWS_URL_TEMPLATE.format(title_id=title.id),
+            data={'text': 'Отзыв', 'score': 7}
+        )
+        assert response.status_code == HTTPStatus.CREATED
+        review_id = response.json()['id']
+        comments_url = COMMENTS_URL_TEMPLATE.format(
+            title_id=title.id, review_id=review_id
+        )
+        response = moderator_client.post(comments_url, data={'text': 'Да'})
+        assert response.status_code == HTTPStatus.CREATED
+        comment_id = response.json()['id']
+
+        data = user_client.get(stats_url).json()
+        assert data['reviews_count'] == 1 and data['comments_count'] == 1, (
+            'Проверьте, что статистика произведения учитывает новые отзывы '
+            'и комментарии.'
+        )
+        assert data['scores']['7'] == 1
+        assert data['last_review_at'] is not None
+
+        response = user_client.patch(
+            f'{REVIEWS_URL_TEMPLATE.format(title_id=title.id)}{review_id}/',
+            data={'score': 3}
+        )
+        assert response.status_code == HTTPStatus.OK
+        data = user_client.get(stats_url).json()
+        assert data['scores']['7'] == 0 and data['scores']['3'] == 1, (
+            'Проверьте, что при изменении оценки распределение оценок '
+            'обновляется.'
+        )
+
+        assert moderator_client.delete(
+            f'{comments_url}{comment_id}/'
+        ).status_code == HTTPStatus.NO_CONTENT
+        assert user_client.delete(
+            f'{REVIEWS_URL_TEMPLATE.format(title_id=title.id)}{review_id}/'
+        ).status_code == HTTPStatus.NO_CONTENT
+        data = user_client.get(stats_url).json()
+        assert data == {
+            'reviews_count': 0,
+            'comments_count': 0,
+            'last_review_at': None,
+            'scores': {str(score): 0 for score in range(1, 11)},
+        }, (
+            'Проверьте, что удаление отзывов и комментариев уменьшает '
+            'статистику произведения.'
+        )
+
+    def test_02_incremental_matches_recalculation(self, django_user_model):
+        rng = random.Random(0)
+        authors = [
+            django_user_model.objects.create(
+                username=f'author{idx}', email=f'author{idx}@yamdb.fake'
+            )
+            for idx in range(8)
+        ]
+        titles = [
+            Title.objects.create(name=f'Произведение {idx}', year=2000)
+            for idx in range(3)
+        ]
+        reviews = []
+        for title in titles:
+            for author in rng.sample(authors, 5):
+                reviews.append(Review.objects.create(
+                    title=title, author=author, text='Отзыв',
+                    score=rng.choice((None, *range(1, 11)))
+                ))
+        for _ in range(20):
+            Comment.objects.create(
+                review=rng.choice(reviews),
+                author=rng.choice(authors),
+                text='Комментарий'
+            )
+        for review in rng.sample(reviews, 4):
+            review.score = rng.randint(1, 10)
+            review.save()
+        for review in rng.sample(reviews, 3):
+            Review.objects.get(pk=review.pk).delete()
+        Comment.objects.order_by('?').first().delete()
+
+        incremental = {title.id: stats_snapshot(title.id) for title in titles}
+        TitleStats.objects.recalculate()
+        for title in titles:
+            assert stats_snapshot(title.id) == incremental[title.id], (
+                'Проверьте, что инкрементально обновляемая статистика '
+                'совпадает с пересчитанной по отзывам и комментариям.'
+            )
+
+    def test_03_expand(self, client, user_client, moderator_client,
+                       django_assert_num_queries):
+        title = Title.objects.create(name='Произведение', year=2000)
+        Title.objects.create(name='Другое произведение', year=2000)
+        url = TITLE_DETAIL_URL_TEMPLATE.format(title_id=title.id)
+        assert 'stats' not in client.get(url).json(), (
+            'Проверьте, что статистика добавляется только по запросу.'
+        )
+        response = user_client.post(
+            REVIEWS_URL_TEMPLATE.format(title_id=title.id),
+            data={'text': 'Отзыв', 'score': 9}
+        )
+        review_id = response.json()['id']
+        stats = client.get(url, {'expand': 'stats'}).json()['stats']
+        assert stats['reviews_count'] == 1 and stats['scores']['9'] == 1, (
+            'Проверьте, что параметр expand=stats добавляет статистику '
+            'к произведению.'
+        )
+
+        moderator_client.post(
+            COMMENTS_URL_TEMPLATE.format(
+                title_id=title.id, review_id=review_id
+            ),
+            data={'text': 'Комментарий'}
+        )
+        stats = client.get(url, {'expand': 'stats'}).json()['stats']
+        assert stats['comments_count'] == 1, (
+            'Проверьте, что новый комментарий сбрасывает закэшированную '
+            'статистику произведения.'
+        )
+
+        with django_assert_num_queries(TITLES_LIST_QUERIES):
+            response = client.get(TITLES_URL, {'expand': 'stats'})
+        results = response.json()['results']
+        assert all('stats' in result for result in results), (
+            'Проверьте, что статистика добавляется к списку произведений '
+            'без дополнительных запросов.'
+        )
+
+    def test_04_stats_endpoint_queries(self, client,
+                                       django_assert_num_queries):
+        title = Title.objects.create(name='Произведение', year=2000)
+        url = TITLE_STATS_URL_TEMPLATE.format(title_id=title.id)
+        with django_assert_num_queries(STATS_QUERIES):
+            response = client.get(url)
+        assert response.status_code == HTTPStatus.OK
+        response = client.get(url, HTTP_IF_NONE_MATCH=response['ETag'])
+        assert response.status_code == HTTPStatus.NOT_MODIFIED, (
+            f'Проверьте, что `{TITLE_STATS_URL_TEMPLATE}` поддерживает '
+            'условные GET-запросы.'
+        )
+
+    def test_05_missing_stats(self, client, user):
+        Title.objects.bulk_create([Title(name='Без статистики', year=2000)])
+        title = Title.objects.get()
+        Review.objects.bulk_create([
+            Review(title=title, author=user, text='Отзыв', score=4)
+        ])
+        response = client.get(TITLE_STATS_URL_TEMPLATE.format(
+            title_id=title.id
+        ))
+        assert response.status_code == HTTPStatus.OK
+        assert response.json()['reviews_count'] == 1, (
+            'Проверьте, что для произведения, загруженного в обход save(), '
+            'статистика считается при первом запросе.'
+        )
+        response = client.get(TITLE_STATS_URL_TEMPLATE.format(
+            title_id=title.id + 1
+        ))
+        assert response.status_code == HTTPStatus.NOT_FOUND
@@ -0,0 +1,144 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from reviews.models import Category, Comment, Genre, Review, Title
+
+TITLES_URL = '/api/v1/titles/'
+TITLE_DETAIL_URL_TEMPLATE = '/api/v1/titles/{title_id}/'
+REVIEWS_URL_TEMPLATE = '/api/v1/titles/{title_id}/reviews/'
+COMMENTS_URL_TEMPLATE = (
+    '/api/v1/titles/{title_id}/reviews/{review_id}/comments/'
+)
+USERS_URL = '/api/v1/users/'
+ME_URL = '/api/v1/users/me/'
+
+# COUNT для пагинации и сами произведения: без жанров и категорий.
+SPARSE_TITLES_LIST_QUERIES = 2
+
+
+def create_title():
+    category = Category.objects.create(name='Фильм', slug='films')
+    genre = Genre.objects.create(name='Драма', slug='drama')
+    title = Title.objects.create(
+        name='Произведение',
+        year=2000,
+        description='Длинное описание',
+        category=category
+    )
+    title.genre.set([genre])
+    return title
+
+
+def select_sql(queries):
+    return ' '.join(
+        query['sql'] for query in queries.captured_queries
+        if query['sql'].startswith('SELECT')
+    )
+
+
+@pytest.mark.django_db(transaction=True)
+class Test29SparseFields:
+
+    def test_01_titles_fields(self, client, django_assert_num_queries):
+        create_title()
+        with CaptureQueriesContext(connection) as queries:
+            with django_assert_num_queries(SPARSE_TITLES_LIST_QUERIES):
+                response = client.get(
+                    TITLES_URL, {'fields': 'id,name,rating'}
+                )
+        assert response.status_code == HTTPStatus.OK
+        assert set(response.json()['results'][0]) == {
+            'id', 'name', 'rating'
+        }, (
+            f'Проверьте, что GET-запрос к `{TITLES_URL}` с параметром fields '
+            'возвращает только запрошенные поля.'
+        )
+        sql = select_sql(queries)
+        assert 'description' not in sql and 'category' not in sql, (
+            'Проверьте, что незапрошенные колонки и связи не выбираются '
+            'из базы.'
+        )
+
+    def test_02_titles_omit(self, client):
+        title = create_title()
+        url = TITLE_DETAIL_URL_TEMPLATE.format(title_id=title.id)
+        with CaptureQueriesContext(connection) as queries:
+            response = client.get(url, {'omit': 'description,genre'})
+        assert response.status_code == HTTPStatus.OK
+        data = response.json()
+        assert set(data) == {'id', 'name', 'year', 'category', 'rating'}, (
+            f'Проверьте, что GET-запрос к `{TITLE_DETAIL_URL_TEMPLATE}` с '
+            'параметром omit не возвращает исключённые поля.'
+        )
+        assert data['category'] == {'name': 'Фильм', 'slug': 'films'}
+        sql = select_sql(queries)
+        assert 'description' not in sql and 'reviews_genre' not in sql
+
+        response = client.get(url, {'expand': 'stats', 'fields': 'id,stats'})
+        assert set(response.json()) == {'id', 'stats'}
+
+    def test_03_unknown_field(self, client):
+        create_title()
+        response = client.get(TITLES_URL, {'fields': 'id,unknown'})
+        assert response.status_code == HTTPStatus.BAD_REQUEST, (
+            'Проверьте, что запрос неизвестного поля возвращает статус 400.'
+        )
+
+    def test_04_reviews_and_comments(self, client, user):
+        title = create_title()
+        review = Review.objects.create(
+            title=title, author=user, text='Отзыв', score=5
+        )
+        Comment.objects.create(review=review, author=user, text='Да')
+        for url, fields in (
+            (REVIEWS_URL_TEMPLATE.format(title_id=title.id), 'id,score'),
+            (
+                COMMENTS_URL_TEMPLATE.format(
+                    title_id=title.id, review_id=review.id
+                ),
+                'id,text'
+            ),
+        ):
+            with CaptureQueriesContext(connection) as queries:
+                response = client.get(url, {'fields': fields})
+            assert response.status_code == HTTPStatus.OK
+            assert set(response.json()['results'][0]) == set(
+                fields.split(',')
+            )
+            assert 'users_customusermodel' not in select_sql(queries), (
+                'Проверьте, что автор не подключается к выборке, если поле '
+                'author не запрошено.'
+            )
+
+    def test_05_users(self, admin_client, user_client):
+        response = admin_client.get(USERS_URL, {'fields': 'username,role'})
+        assert response.status_code == HTTPStatus.OK
+        assert all(
+            set(item) == {'username', 'role'}
+            for item in response.json()['results']
+        )
+        response = user_client.get(ME_URL, {'omit': 'bio,email'})
+        assert set(response.json()) == {
+            'username', 'first_name', 'last_name', 'role'
+        }
+
+    def test_06_writes_ignore_fields(self, admin_client):
+        title = create_title()
+        response = admin_client.patch(
+            TITLE_DETAIL_URL_TEMPLATE.format(title_id=title.id)
+            + '?fields=id',
+            data={
+                'name': 'Новое название',
+                'category': 'films',
+                'genre': ['drama'],
+            }
+        )
+        assert response.status_code == HTTPStatus.OK
+        assert response.json()['name'] == 'Новое название'
+        title.refresh_from_db()
+        assert title.description == 'Длинное описание', (
+            'Проверьте, что параметр fields не влияет на запросы на запись.'
+        )
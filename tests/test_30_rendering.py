@@ -0,0 +1,130 @@
+import gzip
+import json
+from datetime import datetime, timezone
+from http import HTTPStatus
+
+import pytest
+from django.core.management import call_command
+from rest_framework.renderers import JSONRenderer
+
+from core import renderers
+from core.compression import choose_encoding, parse_accept_encoding
+from core.constants import COMPRESSION_MIN_SIZE
+from core.renderers import FastJSONRenderer
+from reviews.models import Title
+
+TITLES_URL = '/api/v1/titles/'
+CATEGORIES_URL = '/api/v1/categories/'
+
+SAMPLE = {
+    'id': 1,
+    'name': 'Произведение «Ёж»',
+    'rating': 7.25,
+    'description': 'Строка с разделителем',
+    'genre': [{'name': 'Драма', 'slug': 'drama'}],
+    'category': None,
+    'pub_date': datetime(2024, 1, 2, 3, 4, 5, 600000, tzinfo=timezone.utc),
+    'scores': {1: 0, 10: 2},
+    'empty': {},
+}
+
+
+class Test30Rendering:
+
+    @pytest.mark.parametrize('accepted_media_type', (
+        'application/json',
+        'application/json; indent=2',
+        'application/json; indent=4',
+    ))
+    def test_01_same_output(self, settings, accepted_media_type):
+        settings.DEBUG = False
+        assert FastJSONRenderer().render(
+            SAMPLE, accepted_media_type
+        ) == JSONRenderer().render(SAMPLE, accepted_media_type), (
+            'Проверьте, что быстрый рендерер выдаёт те же байты, что и '
+            'JSONRenderer.'
+        )
+
+    def test_02_no_debug_indent(self, settings):
+        settings.DEBUG = True
+        assert FastJSONRenderer().render(
+            SAMPLE, 'application/json'
+        ) == JSONRenderer().render(SAMPLE, 'application/json'), (
+            'Проверьте, что JSON компактный и в режиме DEBUG, как у '
+            'JSONRenderer.'
+        )
+
+    def test_03_stdlib_fallback(self, settings, monkeypatch):
+        settings.DEBUG = False
+        monkeypatch.setattr(renderers, 'orjson', None)
+        assert FastJSONRenderer().render(SAMPLE) == JSONRenderer().render(
+            SAMPLE
+        ), 'Проверьте, что без orjson используется stdlib json.'
+
+    @pytest.mark.parametrize('header, expected', (
+        ('gzip, deflate', 'gzip'),
+        ('gzip;q=0', None),
+        ('identity', None),
+        ('', None),
+        ('*', 'gzip'),
+        ('br;q=0.5, gzip;q=0.8', 'gzip'),
+    ))
+    def test_04_negotiation(self, header, expected):
+        assert choose_encoding(header, ('gzip',)) == expected
+
+    def test_05_server_preference(self):
+        codecs = ('zstd', 'br', 'gzip')
+        assert choose_encoding('gzip, br, zstd', codecs) == 'zstd', (
+            'Проверьте, что при равных весах выбирается кодировка, '
+            'предпочтительная для сервера.'
+        )
+        assert choose_encoding('gzip, br;q=0.9', codecs) == 'gzip'
+        assert parse_accept_encoding('GZIP ; q=0.5') == {'gzip': 0.5}
+
+    @pytest.mark.django_db(transaction=True)
+    def test_06_compressed_response(self, client):
+        Title.objects.bulk_create(
+            Title(name=f'Произведение {idx}', year=2000, description='а' * 200)
+            for idx in range(20)
+        )
+        plain = client.get(TITLES_URL)
+        assert len(plain.content) > COMPRESSION_MIN_SIZE
+        assert not plain.has_header('Content-Encoding')
+        response = client.get(TITLES_URL, HTTP_ACCEPT_ENCODING='gzip')
+        assert response.status_code == HTTPStatus.OK
+        assert response['Content-Encoding'] == 'gzip', (
+            'Проверьте, что большие ответы сжимаются, если клиент '
+            'принимает gzip.'
+        )
+        assert 'Accept-Encoding' in response['Vary']
+        assert json.loads(gzip.decompress(response.content)) == plain.json()
+        assert int(response['Content-Length']) == len(response.content)
+
+        small = client.get(CATEGORIES_URL, HTTP_ACCEPT_ENCODING='gzip')
+        assert not small.has_header('Content-Encoding'), (
+            'Проверьте, что короткие ответы не сжимаются.'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_07_bench_render(self, tmp_path):
+        output = tmp_path / 'render.json'
+        call_command(
+            'bench_render', '--current-db', '--page-size=10', '--repeat=2',
+            f'--output={output}'
+        )
+        report = json.loads(output.read_text(encoding='utf-8'))
+        assert report['meta']['titles'] == 10
+        assert {'serialize', 'render_json', 'compress_gzip'} <= set(
+            report['results']
+        ), 'Проверьте, что бенчмарк замеряет рендеринг и сжатие.'
+
+    @pytest.mark.skipif(renderers.orjson is None, reason='нет orjson')
+    @pytest.mark.parametrize('value', (
+        float('nan'), float('inf'), float('-inf')
+    ))
+    def test_08_non_finite_floats(self, value):
+        with pytest.raises(ValueError):
+            JSONRenderer().render({'rating': value})
+        assert FastJSONRenderer().render({'rating': value}) == (
+            b'{"rating":null}'
+        ), 'Проверьте, что orjson пишет NaN и бесконечности как null.'
@@ -0,0 +1,118 @@
+import json
+from http import HTTPStatus
+
+import pytest
+from django.core.cache import cache
+from django.core.management import call_command
+
+from api.v1.mixins import ValuesListMixin
+from api.v1.serializers import TitleStatsSerializer
+from api.v1.values import get_values_serializer
+from reviews.models import Category, Comment, Genre, Review, Title, TitleStats
+
+TITLES_URL = '/api/v1/titles/'
+CATEGORIES_URL = '/api/v1/categories/'
+GENRES_URL = '/api/v1/genres/'
+REVIEWS_URL_TEMPLATE = '/api/v1/titles/{title_id}/reviews/'
+COMMENTS_URL_TEMPLATE = (
+    '/api/v1/titles/{title_id}/reviews/{review_id}/comments/'
+)
+
+
+def create_catalog(django_user_model):
+    categories = [
+        Category.objects.create(name=f'Категория {idx}', slug=f'cat-{idx}')
+        for idx in range(2)
+    ]
+    genres = [
+        Genre.objects.create(name=f'Жанр {idx}', slug=f'genre-{idx}')
+        for idx in range(3)
+    ]
+    titles = []
+    for idx in range(12):
+        title = Title.objects.create(
+            name=f'Произведение «{idx}»',
+            year=1990 + idx,
+            description='Описание ' * idx,
+            category=categories[idx % 2] if idx % 3 else None,
+        )
+        title.genre.set(genres[:idx % 4])
+        titles.append(title)
+    authors = [
+        django_user_model.objects.create(
+            username=f'author{idx}', email=f'author{idx}@yamdb.fake'
+        )
+        for idx in range(4)
+    ]
+    title = titles[0]
+    for idx, author in enumerate(authors):
+        review = Review.objects.create(
+            title=title,
+            author=author,
+            text=f'Отзыв {idx}',
+            score=idx * 3 or None
+        )
+        for other in authors[:idx]:
+            Comment.objects.create(
+                review=review, author=other, text=f'Комментарий {idx}'
+            )
+    for idx, other in enumerate(titles):
+        Title.objects.filter(pk=other.pk).update(rating=idx / 4 or None)
+    return title, review
+
+
+@pytest.mark.django_db(transaction=True)
+class Test31ValuesSerializers:
+
+    def test_01_same_bytes(self, client, monkeypatch, django_user_model):
+        title, review = create_catalog(django_user_model)
+        urls = (
+            TITLES_URL,
+            f'{TITLES_URL}?page=2',
+            f'{TITLES_URL}?pagination=cursor',
+            f'{TITLES_URL}?genre=genre-1',
+            f'{TITLES_URL}?fields=id,genre,category',
+            f'{TITLES_URL}?omit=description',
+            CATEGORIES_URL,
+            GENRES_URL,
+            REVIEWS_URL_TEMPLATE.format(title_id=title.id),
+            f'{REVIEWS_URL_TEMPLATE.format(title_id=title.id)}'
+            '?pagination=cursor',
+            COMMENTS_URL_TEMPLATE.format(
+                title_id=title.id, review_id=review.id
+            ),
+        )
+        fast = {url: client.get(url) for url in urls}
+        monkeypatch.setattr(ValuesListMixin, 'use_values_serializer', False)
+        cache.clear()
+        for url in urls:
+            response = client.get(url)
+            assert fast[url].status_code == HTTPStatus.OK
+            assert fast[url].content == response.content, (
+                f'Проверьте, что быстрый список `{url}` побайтно совпадает '
+                'с ответом обычного сериалайзера.'
+            )
+
+    def test_02_fallback(self, client, django_user_model):
+        create_catalog(django_user_model)
+        assert get_values_serializer(
+            TitleStats, TitleStatsSerializer().fields
+        ) is None, (
+            'Проверьте, что поля SerializerMethodField переводят список на '
+            'обычный сериалайзер.'
+        )
+        response = client.get(TITLES_URL, {'expand': 'stats'})
+        assert response.status_code == HTTPStatus.OK
+        assert all('stats' in item for item in response.json()['results'])
+
+    def test_03_bench_render(self, tmp_path):
+        output = tmp_path / 'render.json'
+        call_command(
+            'bench_render', '--current-db', '--page-size=10', '--repeat=2',
+            f'--output={output}'
+        )
+        results = json.loads(output.read_text(encoding='utf-8'))['results']
+        assert {'serialize', 'serialize_values'} <= set(results), (
+            'Проверьте, что бенчмарк сравнивает обычный и быстрый '
+            'сериалайзеры.'
+        )
@@ -0,0 +1,161 @@
+from http import HTTPStatus
+
+import pytest
+from django.core.cache import cache
+
+from api.v1.throttling import (
+    CacheWindowStore,
+    LocalWindowStore,
+    SlidingWindowThrottle
+)
+from core.constants import THROTTLE_LOCAL_MAX_ENTRIES
+
+SIGNUP_URL = '/api/v1/auth/signup/'
+TOKEN_URL = '/api/v1/auth/token/'
+LIMIT = 3
+
+
+@pytest.fixture
+def low_rates(settings):
+    settings.REST_FRAMEWORK = dict(
+        settings.REST_FRAMEWORK,
+        DEFAULT_THROTTLE_RATES={
+            scope: f'{LIMIT}/min' for scope in (
+                'signup', 'signup_username', 'signup_email',
+                'token', 'token_username',
+            )
+        }
+    )
+
+
+def signup(client, idx, ip='10.0.0.1', **data):
+    return client.post(
+        SIGNUP_URL,
+        data={
+            'username': f'user{idx}',
+            'email': f'user{idx}@yamdb.fake',
+            **data,
+        },
+        REMOTE_ADDR=ip
+    )
+
+
+@pytest.mark.django_db(transaction=True)
+class Test32Throttling:
+
+    def test_01_signup_per_ip(self, client, low_rates,
+                              django_assert_num_queries):
+        for idx in range(LIMIT):
+            assert signup(client, idx).status_code == HTTPStatus.OK
+        with django_assert_num_queries(0):
+            response = signup(client, LIMIT)
+        assert response.status_code == HTTPStatus.TOO_MANY_REQUESTS, (
+            f'Проверьте, что частые POST-запросы к `{SIGNUP_URL}` с одного '
+            'IP отклоняются со статусом 429 без запросов к базе.'
+        )
+        assert int(response['Retry-After']) > 0
+        assert signup(
+            client, LIMIT, ip='10.0.0.2'
+        ).status_code == HTTPStatus.OK
+
+    def test_02_signup_per_username_and_email(self, client, low_rates):
+        for idx in range(LIMIT):
+            signup(client, idx, ip=f'10.0.1.{idx}', username='bot')
+        response = signup(client, LIMIT, ip='10.0.1.99', username=' BOT ')
+        assert response.status_code == HTTPStatus.TOO_MANY_REQUESTS, (
+            'Проверьте, что регистрация ограничена по username независимо '
+            'от IP.'
+        )
+        for idx in range(LIMIT):
+            signup(client, idx, ip=f'10.0.2.{idx}', email='bot@yamdb.fake')
+        response = signup(
+            client, LIMIT, ip='10.0.2.99', email='Bot@yamdb.fake'
+        )
+        assert response.status_code == HTTPStatus.TOO_MANY_REQUESTS, (
+            'Проверьте, что регистрация ограничена по email независимо '
+            'от IP.'
+        )
+
+    def test_03_token_per_username(self, client, user, low_rates,
+                                   user_client, django_assert_num_queries):
+        data = {'username': user.username, 'confirmation_code': 'wrong'}
+        for idx in range(LIMIT):
+            response = client.post(
+                TOKEN_URL, data=data, REMOTE_ADDR=f'10.0.3.{idx}'
+            )
+            assert response.status_code == HTTPStatus.BAD_REQUEST
+        with django_assert_num_queries(0):
+            response = client.post(TOKEN_URL, data=data)
+        assert response.status_code == HTTPStatus.TOO_MANY_REQUESTS, (
+            f'Проверьте, что подбор кода подтверждения через `{TOKEN_URL}` '
+            'ограничен по username.'
+        )
+        # С токеном в заголовке пользователь тоже не загружается.
+        with django_assert_num_queries(0):
+            response = user_client.post(TOKEN_URL, data=data)
+        assert response.status_code == HTTPStatus.TOO_MANY_REQUESTS, (
+            f'Проверьте, что запрос к `{TOKEN_URL}` с JWT-токеном '
+            'отклоняется без запросов к базе.'
+        )
+
+    def test_04_sliding_window(self, client, low_rates, monkeypatch):
+        now = [600.0]
+        monkeypatch.setattr(SlidingWindowThrottle, 'timer', lambda _: now[0])
+        for idx in range(LIMIT):
+            assert signup(client, idx).status_code == HTTPStatus.OK
+        now[0] += 60
+        assert signup(client, 10).status_code == (
+            HTTPStatus.TOO_MANY_REQUESTS
+        ), (
+            'Проверьте, что запросы прошлого окна учитываются в начале '
+            'следующего.'
+        )
+        now[0] += 45
+        assert signup(client, 11).status_code == HTTPStatus.OK, (
+            'Проверьте, что вес прошлого окна убывает со временем.'
+        )
+
+    @pytest.mark.parametrize('store', (CacheWindowStore, LocalWindowStore))
+    def test_05_stores(self, store):
+        cache.clear()
+        store = store()
+        hits = [store.hit('key', 5, 60) for _ in range(3)]
+        assert hits == [(0, 1), (0, 2), (0, 3)]
+        assert store.hit('key', 6, 60) == (3, 1)
+        assert store.hit('other', 6, 60) == (0, 1)
+
+    def test_06_local_store_is_bounded(self):
+        store = LocalWindowStore()
+        for idx in range(3):
+            store.hit(f'key{idx}', 5, 60)
+        store.hit('key0', 6, 60)
+        store.hit('slow', 5, 3600)
+        store.hit('key1', 7, 60)
+        assert set(store.counters) == {
+            ('key0', 60, 6), ('key1', 60, 7), ('slow', 3600, 5)
+        }, 'Проверьте, что устаревшие окна удаляются для всех ключей.'
+        for idx in range(THROTTLE_LOCAL_MAX_ENTRIES + 1):
+            store.hit(f'flood{idx}', 7, 60)
+        assert len(store.counters) <= THROTTLE_LOCAL_MAX_ENTRIES, (
+            'Проверьте, что число счётчиков в памяти ограничено.'
+        )
+
+    @pytest.mark.parametrize('url', (SIGNUP_URL, TOKEN_URL))
+    @pytest.mark.parametrize('body', ('[]', '["username"]', '"username"'))
+    def test_07_non_object_body(self, client, url, body):
+        response = client.post(url, data=body, content_type='application/json')
+        assert response.status_code == HTTPStatus.BAD_REQUEST, (
+            f'Проверьте, что POST-запрос к `{url}` с JSON-телом, которое не '
+            'является объектом, возвращает статус 400.'
+        )
+
+    def test_08_cache_key_evicted(self, monkeypatch):
+        cache.clear()
+        store = CacheWindowStore()
+        # Ключ пропадает сразу после add: incr не находит его.
+        monkeypatch.setattr(store.cache, 'add', lambda *args, **kwargs: True)
+        assert store.hit('key', 5, 60) == (0, 1), (
+            'Проверьте, что исчезнувший между add и incr ключ не приводит '
+            'к ошибке.'
+        )
+        assert store.hit('key', 5, 60) == (0, 2)